@@ -0,0 +1,59 @@
+# auth_app/authentication.py
+"""
+JWT authentication that also carries the caller's profile id.
+
+Tokens issued by CustomTokenObtainPairSerializer hold a `profile_id` claim:
+the DonorProfile id for donors, the OrphanageProfile id for orphanages. Views
+read it through `get_profile_id()` instead of looking the profile up by user
+on every request. The claim is signed with the token, so it can be trusted
+like the user id next to it.
+
+Tokens issued before the claim existed, or before the user created their
+profile (the claim is then null), fall back to a single-column lookup.
+"""
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from donor.models import DonorProfile
+from orphanage.models import OrphanageProfile
+
+PROFILE_CLAIM = "profile_id"
+PROFILE_MODELS = {
+    "donor": DonorProfile,
+    "orphanage": OrphanageProfile,
+}
+
+
+def profile_id_for_user(user):
+    """The id of the user's donor/orphanage profile, or None."""
+    model = PROFILE_MODELS.get(getattr(user, "role", None))
+    if model is None:
+        return None
+    return model.objects.filter(user=user).values_list("id", flat=True).first()
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that sets `request.profile_id` from the token (or None)."""
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            _, token = result
+            request.profile_id = token.get(PROFILE_CLAIM)
+            request.profile_role = token.get("role")
+        return result
+
+
+def get_profile_id(request, model):
+    """
+    Id of the requesting user's `model` profile. Raises model.DoesNotExist
+    when there is none, like `model.objects.get(user=...)` would.
+    """
+    profile_id = getattr(request, "profile_id", None)
+    if profile_id is not None and PROFILE_MODELS.get(getattr(request, "profile_role", None)) is model:
+        return profile_id
+
+    # old token, profile created after login, or session/forced auth
+    profile_id = model.objects.filter(user=request.user).values_list("id", flat=True).first()
+    if profile_id is None:
+        raise model.DoesNotExist(f"{model.__name__} matching query does not exist.")
+    return profile_id
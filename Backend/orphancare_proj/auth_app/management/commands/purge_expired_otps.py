@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from auth_app.models import OTP
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired OTPs in small batches (one short transaction each). "
+        "Schedule it, e.g. hourly from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows deleted per transaction.")
+        parser.add_argument("--pause", type=float, default=0.0,
+                            help="Seconds to sleep between batches to give other writers room.")
+
+    def handle(self, *args, **options):
+        deleted = OTP.purge_expired(batch_size=max(1, options["batch_size"]), pause=max(0.0, options["pause"]))
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired OTPs"))
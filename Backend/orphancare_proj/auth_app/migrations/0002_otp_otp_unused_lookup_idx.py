@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='otp',
+            index=models.Index(condition=models.Q(('used', False)), fields=['user', 'code', '-created_at'], name='otp_unused_lookup_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def hash_pending_codes(apps, schema_editor):
+    """Hash codes that can still be used; expired ones are simply dropped."""
+    OTP = apps.get_model("auth_app", "OTP")
+    key = getattr(settings, "OTP_HASH_KEY", settings.SECRET_KEY).encode()
+    OTP.objects.filter(expires_at__lte=timezone.now()).delete()
+    pending = list(OTP.objects.select_related("user"))
+    for otp in pending:
+        otp.code_hash = hmac.new(key, f"{otp.user.email}:{otp.code}".encode(), hashlib.sha256).hexdigest()
+    OTP.objects.bulk_update(pending, ["code_hash"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0002_otp_otp_unused_lookup_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='otp',
+            name='code_hash',
+            field=models.CharField(default='', max_length=64),
+            preserve_default=False,
+        ),
+        migrations.RunPython(hash_pending_codes, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='otp',
+            name='otp_unused_lookup_idx',
+        ),
+        migrations.RemoveField(
+            model_name='otp',
+            name='code',
+        ),
+        migrations.AddIndex(
+            model_name='otp',
+            index=models.Index(condition=models.Q(('used', False)), fields=['user', 'code_hash', '-created_at'], name='otp_unused_hash_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='otp',
+            index=models.Index(fields=['expires_at'], name='otp_expires_idx'),
+        ),
+    ]
@@ -1,5 +1,12 @@
 # auth_app/models.py
-from django.db import models
+import hashlib
+import hmac
+import secrets
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
 from django.contrib.auth.models import (
     AbstractBaseUser,
     PermissionsMixin,
@@ -7,7 +14,6 @@ from django.contrib.auth.models import (
 )
 from django.utils import timezone
 import uuid
-import random
 
 class UserManager(BaseUserManager):
     use_in_migrations = True
@@ -73,21 +79,82 @@ class User(AbstractBaseUser, PermissionsMixin):
 
 class OTP(models.Model):
     """
-    Simple OTP model for verification.
+    One-time code for email verification.
+
+    Only an HMAC of (email, code) is stored, keyed with OTP_HASH_KEY, so a
+    leaked table doesn't hand out working codes and verification is a single
+    indexed equality lookup. The plain code exists only on the instance
+    returned by `create_otp_for_user` (`otp.code`), long enough to email it.
+    Issuing a code drops the user's older unused codes; expired rows are
+    removed in batches by `manage.py purge_expired_otps`.
     """
     user = models.ForeignKey(User, related_name="otps", on_delete=models.CASCADE)
-    code = models.CharField(max_length=8)  # store as string for leading zeros
+    code_hash = models.CharField(max_length=64)
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
     used = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # VerifyOTPSerializer.validate: newest unused OTP for (user, code)
+            models.Index(
+                fields=["user", "code_hash", "-created_at"],
+                condition=models.Q(used=False),
+                name="otp_unused_hash_idx",
+            ),
+            # purge_expired_otps walks expired rows oldest first
+            models.Index(fields=["expires_at"], name="otp_expires_idx"),
+        ]
+
     def is_expired(self):
         return timezone.now() > self.expires_at
 
+    @staticmethod
+    def hash_code(email, code):
+        key = getattr(settings, "OTP_HASH_KEY", settings.SECRET_KEY)
+        return hmac.new(key.encode(), f"{email}:{code}".encode(), hashlib.sha256).hexdigest()
+
     @classmethod
     def create_otp_for_user(cls, user, minutes_valid=10):
-        import datetime
-        code = f"{random.randint(0, 999999):06d}"
-        expires_at = timezone.now() + datetime.timedelta(minutes=minutes_valid)
-        otp = cls.objects.create(user=user, code=code, expires_at=expires_at)
+        code = f"{secrets.randbelow(1000000):06d}"
+        expires_at = timezone.now() + timedelta(minutes=minutes_valid)
+        with transaction.atomic():
+            # a new code replaces any the user hasn't used yet
+            cls.objects.filter(user=user, used=False).delete()
+            otp = cls.objects.create(user=user, code_hash=cls.hash_code(user.email, code), expires_at=expires_at)
+        otp.code = code
         return otp
+
+    @classmethod
+    def find_for_verification(cls, email, code):
+        """Newest unused OTP matching (email, code), with its user, in one query."""
+        return (
+            cls.objects.select_related("user")
+            .filter(user__email=email, code_hash=cls.hash_code(email, code), used=False)
+            .order_by("-created_at")
+            .first()
+        )
+
+    @classmethod
+    def purge_expired(cls, batch_size=5000, pause=0, now=None):
+        """
+        Delete expired OTPs `batch_size` rows at a time, each batch in its own
+        short transaction so writers never wait long on the table lock.
+        Returns the number of rows deleted.
+        """
+        now = now or timezone.now()
+        deleted = 0
+        while True:
+            ids = list(
+                cls.objects.filter(expires_at__lt=now)
+                .order_by("expires_at")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                return deleted
+            with transaction.atomic():
+                deleted += cls.objects.filter(id__in=ids).delete()[0]
+            if len(ids) < batch_size:
+                return deleted
+            if pause:
+                time.sleep(pause)
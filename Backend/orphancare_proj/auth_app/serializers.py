@@ -4,6 +4,7 @@ from django.utils import timezone
 from .models import User, OTP
 from django.contrib.auth.password_validation import validate_password
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .authentication import PROFILE_CLAIM, profile_id_for_user
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
@@ -12,6 +13,8 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
         # Add custom claims
         token['role'] = user.role  # adds role inside JWT itself
+        # saves views a profile lookup per request (see auth_app.authentication)
+        token[PROFILE_CLAIM] = profile_id_for_user(user)
         return token
 
     def validate(self, attrs):
@@ -54,18 +57,16 @@ class VerifyOTPSerializer(serializers.Serializer):
     def validate(self, attrs):
         email = attrs.get("email")
         code = attrs.get("code")
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            raise serializers.ValidationError("User not found")
-
-        # find OTP
-        otp_qs = OTP.objects.filter(user=user, code=code, used=False).order_by("-created_at")
-        if not otp_qs.exists():
+
+        # one indexed query on the success path
+        otp = OTP.find_for_verification(email, code)
+        if otp is None:
+            if not User.objects.filter(email=email).exists():
+                raise serializers.ValidationError("User not found")
             raise serializers.ValidationError("Invalid code")
-        otp = otp_qs.first()
         if otp.is_expired():
             raise serializers.ValidationError("OTP expired")
+        user = otp.user
         attrs["user"] = user
         attrs["otp"] = otp
         return attrs
@@ -1,3 +1,135 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from orphancare_proj.testing import QueryPlanMixin, make_donor, make_orphanage
+from .models import User, OTP
+
+
+class OTPQueryPlanTests(QueryPlanMixin, TestCase):
+    def test_verify_lookup_uses_index(self):
+        user = User.objects.create_user(email="a@example.com", password="pass")
+        for _ in range(5):
+            OTP.create_otp_for_user(user)
+
+        # same shape as OTP.find_for_verification
+        otp_qs = OTP.objects.select_related("user").filter(
+            user__email=user.email, code_hash=OTP.hash_code(user.email, "123456"), used=False
+        ).order_by("-created_at")
+        self.assert_queryset_is_indexed(otp_qs[:1])
+
+    def test_purge_walks_expiry_index(self):
+        self.assert_queryset_is_indexed(
+            OTP.objects.filter(expires_at__lt=timezone.now()).order_by("expires_at").values_list("id")[:100]
+        )
+
+
+class OTPLifecycleTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="new@example.com", password="pass")
+        self.client = APIClient()
+
+    def verify(self, code, email="new@example.com"):
+        return self.client.post(reverse("auth_app:verify-otp"), {"email": email, "code": code})
+
+    def test_code_is_stored_hashed(self):
+        otp = OTP.create_otp_for_user(self.user)
+        stored = OTP.objects.get(pk=otp.pk)
+        self.assertNotIn(otp.code, stored.code_hash)
+        self.assertEqual(stored.code_hash, OTP.hash_code(self.user.email, otp.code))
+        self.assertFalse(hasattr(stored, "code"))
+
+    def test_verify_is_one_query(self):
+        otp = OTP.create_otp_for_user(self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual(OTP.find_for_verification(self.user.email, otp.code).user, self.user)
+
+        response = self.verify(otp.code)
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_verified and self.user.is_active)
+        self.assertEqual(self.verify(otp.code).data["non_field_errors"], ["Invalid code"])
+
+    def test_new_code_invalidates_older_ones(self):
+        old = OTP.create_otp_for_user(self.user)
+        new = OTP.create_otp_for_user(self.user)
+        if old.code != new.code:
+            self.assertEqual(self.verify(old.code).status_code, 400)
+        self.assertEqual(OTP.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(self.verify(new.code).status_code, 200)
+
+    def test_errors(self):
+        otp = OTP.create_otp_for_user(self.user)
+        self.assertEqual(self.verify(otp.code, email="nobody@example.com").data["non_field_errors"], ["User not found"])
+        OTP.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.verify(otp.code).data["non_field_errors"], ["OTP expired"])
+
+    def test_purge_deletes_only_expired_rows_in_batches(self):
+        now = timezone.now()
+        live = OTP.create_otp_for_user(self.user)
+        OTP.objects.bulk_create(
+            OTP(user=self.user, code_hash=str(i), expires_at=now - timedelta(minutes=i + 1), used=True)
+            for i in range(7)
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            out = StringIO()
+            call_command("purge_expired_otps", "--batch-size", "3", stdout=out)
+        self.assertIn("Deleted 7 expired OTPs", out.getvalue())
+        self.assertEqual(list(OTP.objects.values_list("pk", flat=True)), [live.pk])
+        deletes = [q for q in queries.captured_queries if q["sql"].startswith("DELETE")]
+        self.assertEqual(len(deletes), 3)
+
+
+class ProfileClaimTests(TestCase):
+    def setUp(self):
+        self.user, self.orphanage = make_orphanage()
+        self.user.set_password("pass")
+        self.user.save()
+        self.client = APIClient()
+        self.url = reverse("requirement-list")
+
+    def login(self):
+        response = self.client.post(
+            reverse("auth_app:token_obtain_pair"), {"email": self.user.email, "password": "pass"}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data["access"]
+
+    def list_queries(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_token_carries_profile_id(self):
+        token = AccessToken(self.login())
+        self.assertEqual(token["profile_id"], self.orphanage.id)
+        self.assertEqual(token["role"], "orphanage")
+
+    def test_claim_saves_profile_lookup(self):
+        legacy = AccessToken.for_user(self.user)  # issued before the claim existed
+        # user fetch + page, vs. user fetch + profile lookup + page
+        self.assertEqual(self.list_queries(self.login()), 2)
+        self.assertEqual(self.list_queries(str(legacy)), 3)
+
+    def test_profile_created_after_login_falls_back(self):
+        user = User.objects.create_user(email="new@example.com", password="pass", role="donor", is_active=True)
+        token = AccessToken.for_user(user)
+        token["profile_id"] = None
+        _, donor = make_donor("late@example.com")
+        donor.user = user
+        donor.save()
 
-# Create your tests here.
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = self.client.get(reverse("donor-donations"))
+        self.assertEqual(response.status_code, 200)
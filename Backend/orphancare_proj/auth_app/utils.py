@@ -1,10 +1,12 @@
 # auth_app/utils.py
-from django.core.mail import send_mail
-from django.conf import settings
+from outbox.utils import enqueue_email
 import logging
 
 
 def send_otp_email(to_email, otp_code):
+    """
+    Queues the OTP email in the outbox; the `send_outbox` worker delivers it.
+    """
     subject = "Your OrphanCare Verification OTP"
     message = f"""
     Welcome to OrphanCare! 
@@ -14,13 +16,7 @@ def send_otp_email(to_email, otp_code):
 
     If you did not request this, please ignore this email.
     """
-    send_mail(
-        subject=subject,
-        message=message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[to_email],
-        fail_silently=False,
-    )
+    enqueue_email(to_email, subject, message)
 
 
 
@@ -40,7 +36,7 @@ def send_donation_created_email(
     donation,
 ):
     """
-    Best-effort email sender.
+    Best-effort: queues the email in the outbox.
     Never raises.
     """
 
@@ -82,12 +78,6 @@ Please log in to OrphanCare to review this donation.
 """
 
     try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[orphanage_email],
-            fail_silently=False,
-        )
+        enqueue_email(orphanage_email, subject, message)
     except Exception as e:
         logger.error("Donation email failed: %s", str(e))
@@ -2,6 +2,7 @@
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from django.utils import timezone
+from django.db import transaction
 from .models import User, OTP
 from .serializers import RegisterSerializer, VerifyOTPSerializer, UserProfileSerializer
 from rest_framework.views import APIView
@@ -18,17 +19,20 @@ from .serializers import CustomTokenObtainPairSerializer
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_scope = "token"
 
 
 class RegisterAPIView(generics.CreateAPIView):
     permission_classes = (AllowAny,)
+    throttle_scope = "register"
     serializer_class = RegisterSerializer
 
     def perform_create(self, serializer):
-        user = serializer.save()
-        otp = OTP.create_otp_for_user(user)
-        # send OTP email
-        send_otp_email(user.email, otp.code)
+        # user, OTP and queued email commit together; the outbox worker sends it
+        with transaction.atomic():
+            user = serializer.save()
+            otp = OTP.create_otp_for_user(user)
+            send_otp_email(user.email, otp.code)
 
     def create(self, request, *args, **kwargs):
         response = super().create(request, *args, **kwargs)
@@ -41,6 +45,7 @@ class RegisterAPIView(generics.CreateAPIView):
 
 class VerifyOTPAPIView(APIView):
     permission_classes = (AllowAny,)
+    throttle_scope = "verify_otp"
 
     def post(self, request):
         serializer = VerifyOTPSerializer(data=request.data)
@@ -49,7 +54,7 @@ class VerifyOTPAPIView(APIView):
         otp = serializer.validated_data["otp"]
         # mark otp used and activate user
         otp.used = True
-        otp.save()
+        otp.save(update_fields=["used"])
         user.is_verified = True
         user.is_active = True
         user.save()
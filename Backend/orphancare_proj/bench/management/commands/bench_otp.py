@@ -0,0 +1,41 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from bench import otp
+
+
+class Command(BaseCommand):
+    help = (
+        "Time OTP verification lookups against a large synthetic OTP history "
+        "(default 10M rows). Runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000_000, help="Historical OTP rows to insert.")
+        parser.add_argument("--users", type=int, default=10_000, help="Users the history is spread over.")
+        parser.add_argument("--iterations", type=int, default=200, help="Timed verification lookups.")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--purge", action="store_true", help="Also time purge_expired over the history.")
+        parser.add_argument("--output", help="Write the result as JSON here.")
+
+    def handle(self, *args, **options):
+        result = otp.run(
+            rows=max(0, options["rows"]),
+            users=max(1, options["users"]),
+            iterations=max(1, options["iterations"]),
+            batch_size=max(1, options["batch_size"]),
+            purge=options["purge"],
+            log=self.stdout.write,
+        )
+        self.stdout.write(
+            f"verify lookup over {result['rows']} rows: p50 {result['p50_ms']} ms, "
+            f"p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms, {result['queries']} queries"
+        )
+        for line in result["plan"]:
+            self.stdout.write(f"  plan: {line}")
+        if options["purge"]:
+            self.stdout.write(f"purged {result['purged']} expired rows in {result['purge_seconds']}s")
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(result, f, indent=2)
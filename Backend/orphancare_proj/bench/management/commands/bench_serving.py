@@ -0,0 +1,48 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bench import serving
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare concurrent-connection throughput of the public read endpoints "
+        "under gunicorn WSGI (sync workers) and gunicorn + uvicorn ASGI (async views). "
+        "Seed data first with seed_bench."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2, help="Worker processes per server.")
+        parser.add_argument("--connections", type=int, default=64, help="Concurrent client connections.")
+        parser.add_argument("--seconds", type=float, default=10.0, help="Duration per endpoint.")
+        parser.add_argument(
+            "--server", action="append", choices=sorted(serving.SERVERS),
+            help="Only benchmark this server (repeatable). Default: all.",
+        )
+        parser.add_argument("--output", help="Write the result as JSON here.")
+
+    def handle(self, *args, **options):
+        try:
+            result = serving.run(
+                workers=max(1, options["workers"]),
+                connections=max(1, options["connections"]),
+                seconds=max(0.5, options["seconds"]),
+                servers=options["server"] or serving.DEFAULT_SERVERS,
+                log=self.stdout.write,
+            )
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        for name, endpoints in result["servers"].items():
+            for endpoint, stats in endpoints.items():
+                self.stdout.write(
+                    f"{name:>9} {endpoint:>25}: {stats['rps']} req/s, p50 {stats['p50_ms']} ms, "
+                    f"p95 {stats['p95_ms']} ms, p99 {stats['p99_ms']} ms, {stats['errors']} errors"
+                )
+        for name, endpoints in result.get("vs_wsgi", {}).items():
+            for endpoint, ratio in endpoints.items():
+                self.stdout.write(f"{name}/wsgi {endpoint:>25}: {ratio}x")
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(result, f, indent=2)
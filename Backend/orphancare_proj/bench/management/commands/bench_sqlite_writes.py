@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bench import sqlite_writes
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare concurrent donation write throughput on SQLite with Django's "
+        "default settings and with the production profile (WAL, BEGIN IMMEDIATE, "
+        "busy timeout). Bench rows are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=8, help="Concurrent writer processes.")
+        parser.add_argument("--seconds", type=float, default=10.0, help="Duration per profile.")
+        parser.add_argument("--output", help="Write the result as JSON here.")
+
+    def handle(self, *args, **options):
+        try:
+            result = sqlite_writes.run(
+                processes=max(1, options["processes"]),
+                seconds=max(0.1, options["seconds"]),
+                log=self.stdout.write,
+            )
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        for name, profile in result["profiles"].items():
+            self.stdout.write(
+                f"{name:>15}: {profile['writes_per_sec']} writes/s, {profile['errors']} locked errors "
+                f"({profile['error_rate']:.1%}), p50 {profile['p50_ms']} ms, p95 {profile['p95_ms']} ms"
+            )
+        if "speedup" in result:
+            self.stdout.write(self.style.SUCCESS(f"production profile: {result['speedup']}x writes/s"))
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(result, f, indent=2)
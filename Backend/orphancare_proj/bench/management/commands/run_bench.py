@@ -0,0 +1,48 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bench import runner
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every API route against the seeded data (see seed_bench) and write a "
+        "JSON baseline. Runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50, help="Timed requests per route.")
+        parser.add_argument("--warmup", type=int, default=5, help="Untimed requests per route.")
+        parser.add_argument("--route", action="append", dest="routes", help="Only this route name (repeatable).")
+        parser.add_argument("--output", default="bench-baseline.json", help="Where to write the JSON baseline.")
+        parser.add_argument("--compare", help="Previous baseline to diff against.")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                baseline = json.load(f)
+
+        self.stdout.write(runner.HEADER)
+        try:
+            result = runner.run(
+                iterations=max(1, options["iterations"]),
+                warmup=max(0, options["warmup"]),
+                only=options["routes"],
+                log=self.stdout.write,
+            )
+        except LookupError as e:
+            raise CommandError(str(e))
+
+        for name in result["missing"]:
+            self.stderr.write(f"no scenario for route {name!r} (add one to bench/scenarios.py)")
+
+        with open(options["output"], "w") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['output']}"))
+
+        if baseline is not None:
+            self.stdout.write(f"\nAgainst {options['compare']} ({baseline['meta'].get('git')}):")
+            for line in runner.compare(baseline, result):
+                self.stdout.write(line)
@@ -0,0 +1,100 @@
+# bench/otp.py
+"""
+OTP verification latency against a large OTP history.
+
+Fills the table with `rows` historical OTPs (mostly used or expired, spread
+over a year, like an unswept production table), then times the lookup
+VerifyOTPSerializer runs for freshly issued codes. Everything happens in a
+transaction that is rolled back.
+"""
+import random
+import time
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from auth_app.models import OTP, User
+from .runner import QueryCounter, percentile
+from .seed import BENCH_DOMAIN, chunked, explicit_timestamps
+
+HISTORY_DAYS = 365
+USED_SHARE = 0.9
+
+
+def history(rng, user_ids, count, now):
+    for _ in range(count):
+        created = now - timedelta(seconds=rng.uniform(0, HISTORY_DAYS * 86400))
+        yield OTP(
+            user_id=rng.choice(user_ids),
+            code_hash=f"{rng.getrandbits(256):064x}",
+            created_at=created,
+            expires_at=created + timedelta(minutes=10),
+            used=rng.random() < USED_SHARE,
+        )
+
+
+def query_plan(email, code):
+    sql, params = OTP.objects.select_related("user").filter(
+        user__email=email, code_hash=OTP.hash_code(email, code), used=False
+    ).order_by("-created_at")[:1].query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def run(rows=10_000_000, users=10_000, iterations=200, batch_size=10_000, purge=False, rng=None, log=print):
+    rng = rng or random.Random(42)
+    now = timezone.now()
+    result = {"rows": rows, "users": users, "iterations": iterations}
+
+    with transaction.atomic():
+        emails = {
+            user.id: user.email for user in User.objects.bulk_create(
+                (User(email=f"otp-{n}@{BENCH_DOMAIN}", password="!", role="donor") for n in range(users)),
+                batch_size=batch_size,
+            )
+        }
+        user_ids = list(emails)
+
+        started = time.perf_counter()
+        with explicit_timestamps(OTP, "created_at"):
+            for done, size in chunked(rows, batch_size):
+                OTP.objects.bulk_create(history(rng, user_ids, size, now), batch_size=batch_size)
+                if done and done % (batch_size * 100) == 0:
+                    log(f"otp rows: {done}")
+        result["seed_seconds"] = round(time.perf_counter() - started, 2)
+        log(f"otp rows: {rows} in {result['seed_seconds']}s")
+
+        latencies, queries = [], []
+        counter = QueryCounter()
+        for _ in range(iterations):
+            user_id = rng.choice(user_ids)
+            email = emails[user_id]
+            code = OTP.create_otp_for_user(User(id=user_id, email=email)).code
+
+            counter.count = 0
+            with connection.execute_wrapper(counter):
+                begin = time.perf_counter()
+                otp = OTP.find_for_verification(email, code)
+                latencies.append(time.perf_counter() - begin)
+            queries.append(counter.count)
+            if otp is None:
+                raise AssertionError("freshly issued OTP was not found")
+
+        latencies.sort()
+        result.update({
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+            "queries": round(sum(queries) / len(queries), 2) if queries else 0,
+            "plan": query_plan(email, code) if iterations else [],
+        })
+
+        if purge:
+            started = time.perf_counter()
+            result["purged"] = OTP.purge_expired(batch_size=batch_size)
+            result["purge_seconds"] = round(time.perf_counter() - started, 2)
+
+        transaction.set_rollback(True)
+    return result
@@ -0,0 +1,199 @@
+# bench/runner.py
+"""
+Drive every named route through the DRF test client and summarise latency,
+queries per request and throughput.
+
+The whole run happens inside one transaction that is rolled back, so write
+endpoints can be exercised against the seeded data without changing it.
+"""
+import logging
+import math
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import django
+from asgiref.sync import async_to_sync
+from django.db import connections, transaction
+from django.test.utils import override_settings
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.test import APIClient
+
+from .scenarios import SCENARIOS, SKIPPED_NAMESPACES, Context
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def route_names(patterns=None, namespace=""):
+    """Fully qualified names ("ns:name") of every named route in the URLconf."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    names = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            inner = f"{namespace}{pattern.namespace}:" if pattern.namespace else namespace
+            names += route_names(pattern.url_patterns, inner)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.append(f"{namespace}{pattern.name}")
+    return names
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(math.ceil(pct / 100 * len(samples)), 1)
+    return samples[rank - 1]
+
+
+def summarise(method, path, latencies, queries, statuses):
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        "method": method.upper(),
+        "path": path,
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(total / len(latencies) * 1000, 3),
+        "queries": round(sum(queries) / len(queries), 2),
+        "rps": round(len(latencies) / total, 1) if total else None,
+        "errors": sum(1 for status in statuses if status >= 400),
+        "statuses": sorted(set(statuses)),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def consume(response):
+    """Read a streamed body; an event stream never ends, so only its first chunk."""
+    endless = response.get("Content-Type", "").startswith("text/event-stream")
+    if response.is_async:
+        async def read():
+            async for _ in response.streaming_content:
+                if endless:
+                    break
+        async_to_sync(read)()
+    else:
+        for _ in response.streaming_content:
+            if endless:
+                break
+
+
+def run_route(client, ctx, scenario, iterations, warmup):
+    latencies, queries, statuses = [], [], []
+    path = None
+    counter = QueryCounter()
+    for i in range(warmup + iterations):
+        call = scenario.prepare(ctx, i)
+        path = call.path
+        client.force_authenticate(call.user)
+        request = getattr(client, scenario.method)
+
+        counter.count = 0
+        with connections["default"].execute_wrapper(counter):
+            started = time.perf_counter()
+            response = request(call.path, data=call.data if call.data is not None else call.params,
+                               format="json" if call.data is not None else None)
+            if response.streaming:
+                # exports do their queries while the body is consumed
+                consume(response)
+            elapsed = time.perf_counter() - started
+
+        if i >= warmup:
+            latencies.append(elapsed)
+            queries.append(counter.count)
+            statuses.append(response.status_code)
+    client.force_authenticate(None)
+    return summarise(scenario.method, path, latencies, queries, statuses)
+
+
+def run(iterations=50, warmup=5, only=None, log=print):
+    """Benchmark all routes (or the names in `only`). Returns the baseline dict."""
+    names = route_names()
+    missing = sorted(
+        name for name in names
+        if name not in SCENARIOS and name.split(":")[0] not in SKIPPED_NAMESPACES
+    )
+    selected = [name for name in names if name in SCENARIOS and (not only or name in only)]
+
+    # per-request log lines would swamp the report
+    perf_logger = logging.getLogger("orphancare.perf")
+    previous_level = perf_logger.level
+    perf_logger.setLevel(logging.WARNING)
+
+    results = {}
+    started = time.perf_counter()
+    try:
+        # every call comes from one address; budgets would turn most into 429s
+        with override_settings(API_THROTTLE_ENABLED=False), transaction.atomic():
+            ctx = Context()
+            client = APIClient()
+            for name in selected:
+                results[name] = run_route(client, ctx, SCENARIOS[name], iterations, warmup)
+                log(format_row(name, results[name]))
+            transaction.set_rollback(True)
+    finally:
+        perf_logger.setLevel(previous_level)
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connections["default"].vendor,
+            "iterations": iterations,
+            "warmup": warmup,
+            "wall_seconds": round(time.perf_counter() - started, 2),
+        },
+        "missing": missing,
+        "routes": results,
+    }
+
+
+# ---------- reporting ----------
+
+HEADER = f"{'route':<32} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'req/s':>8} {'err':>4}"
+
+
+def format_row(name, row):
+    return (
+        f"{name:<32} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} "
+        f"{row['queries']:>8} {row['rps'] or 0:>8.1f} {row['errors']:>4}"
+    )
+
+
+def compare(baseline, current):
+    """
+    Lines describing how each route moved against a previous baseline:
+    p50/p95 change in percent and queries per request before -> after.
+    """
+    lines = []
+    for name, row in current["routes"].items():
+        old = baseline.get("routes", {}).get(name)
+        if old is None:
+            lines.append(f"{name:<32} new")
+            continue
+        deltas = []
+        for key in ("p50_ms", "p95_ms"):
+            if old[key]:
+                deltas.append(f"{key[:3]} {(row[key] - old[key]) / old[key] * 100:+6.1f}%")
+        if row["queries"] != old["queries"]:
+            deltas.append(f"queries {old['queries']} -> {row['queries']}")
+        lines.append(f"{name:<32} {'  '.join(deltas)}")
+    return lines
@@ -0,0 +1,195 @@
+# bench/scenarios.py
+"""
+How the benchmark runner calls each named route.
+
+A scenario's `prepare(ctx, i)` runs before the timed request (so fixture
+setup is never measured) and returns a Call. Routes that exist in the
+URLconf but have no scenario here are reported as missing, so new
+endpoints show up in the benchmark output instead of being silently skipped.
+"""
+import uuid
+from dataclasses import dataclass, field
+
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from auth_app.models import OTP, User
+from donation.models import Donation
+from donor.models import DonorProfile
+from orphanage.models import OrphanageProfile
+from requirement.models import OrphanageRequirement
+from .seed import BENCH_DOMAIN, BENCH_PASSWORD, CITIES
+
+# URL namespaces the runner does not drive (HTML admin)
+SKIPPED_NAMESPACES = ("admin",)
+
+
+@dataclass
+class Call:
+    path: str
+    user: object = None
+    data: object = None
+    params: dict = field(default_factory=dict)
+
+
+@dataclass
+class Scenario:
+    method: str
+    prepare: object
+
+
+class Context:
+    """Users and rows the scenarios act on, picked from the seeded data."""
+
+    def __init__(self):
+        self.orphanage = (
+            OrphanageProfile.objects.filter(user__email__endswith=f"@{BENCH_DOMAIN}")
+            .select_related("user").order_by("id").first()
+        )
+        self.donor = (
+            DonorProfile.objects.filter(user__email__endswith=f"@{BENCH_DOMAIN}")
+            .select_related("user").order_by("id").first()
+        )
+        if self.orphanage is None or self.donor is None:
+            raise LookupError("No bench data; run `manage.py seed_bench` first")
+        self.admin = User.objects.create_superuser(
+            email=f"admin-{uuid.uuid4().hex}@{BENCH_DOMAIN}", password=BENCH_PASSWORD
+        )
+        self.requirement = OrphanageRequirement.objects.create(
+            orphanage=self.orphanage, item_name="Bench rice", category="food", quantity_needed=100
+        )
+        self.donation = Donation.objects.create(
+            donor=self.donor, orphanage=self.orphanage, requirement=self.requirement,
+            item_name="Bench rice", quantity=1,
+        )
+        self.refresh = str(RefreshToken.for_user(self.donor.user))
+
+    def fresh_user(self, role):
+        return User.objects.create(
+            email=f"{role}-run-{uuid.uuid4().hex}@{BENCH_DOMAIN}", role=role, is_active=True
+        )
+
+
+def register(ctx, i):
+    return Call(reverse("auth_app:register"), data={
+        "email": f"register-{uuid.uuid4().hex}@{BENCH_DOMAIN}", "password": "S3cure-pass-123", "role": "donor",
+    })
+
+
+def verify_otp(ctx, i):
+    user = ctx.fresh_user("donor")
+    otp = OTP.create_otp_for_user(user)
+    return Call(reverse("auth_app:verify-otp"), data={"email": user.email, "code": otp.code})
+
+
+def orphanage_create(ctx, i):
+    city, state, pincode = CITIES[i % len(CITIES)]
+    return Call(reverse("orphanage-create"), user=ctx.fresh_user("orphanage"), data={
+        "orphanage_name": "Bench Home", "address": "1 Road", "city": city, "state": state,
+        "pincode": pincode, "phone_number": "9000000000", "email": f"home-{i}@{BENCH_DOMAIN}",
+    })
+
+
+def donor_create(ctx, i):
+    return Call(reverse("donor-create"), user=ctx.fresh_user("donor"), data={
+        "full_name": "Bench Donor", "contact_number": "8000000000", "email": f"donor-{i}@{BENCH_DOMAIN}",
+    })
+
+
+def requirement_delete(ctx, i):
+    requirement = OrphanageRequirement.objects.create(
+        orphanage=ctx.orphanage, item_name="Temporary", quantity_needed=1
+    )
+    return Call(reverse("requirement-delete", args=[requirement.pk]), user=ctx.orphanage.user)
+
+
+SCENARIOS = {
+    # auth
+    "auth_app:register": Scenario("post", register),
+    "auth_app:verify-otp": Scenario("post", verify_otp),
+    "auth_app:profile": Scenario("get", lambda ctx, i: Call(reverse("auth_app:profile"), user=ctx.donor.user)),
+    "auth_app:token_obtain_pair": Scenario("post", lambda ctx, i: Call(
+        reverse("auth_app:token_obtain_pair"),
+        data={"email": ctx.donor.user.email, "password": BENCH_PASSWORD},
+    )),
+    "auth_app:token_refresh": Scenario("post", lambda ctx, i: Call(
+        reverse("auth_app:token_refresh"), data={"refresh": ctx.refresh},
+    )),
+    # orphanage / donor profiles
+    "orphanage-create": Scenario("post", orphanage_create),
+    "orphanage-detail": Scenario("get", lambda ctx, i: Call(reverse("orphanage-detail"), user=ctx.orphanage.user)),
+    "orphanage-list": Scenario("get", lambda ctx, i: Call(reverse("orphanage-list"))),
+    "orphanage-public-detail": Scenario("get", lambda ctx, i: Call(
+        reverse("orphanage-public-detail", args=[ctx.orphanage.pk]),
+    )),
+    "donor-create": Scenario("post", donor_create),
+    "donor-detail": Scenario("get", lambda ctx, i: Call(reverse("donor-detail"), user=ctx.donor.user)),
+    # donations
+    "donation-create": Scenario("post", lambda ctx, i: Call(reverse("donation-create"), user=ctx.donor.user, data={
+        "orphanage": ctx.orphanage.pk, "requirement": ctx.requirement.pk, "item_name": "Bench rice", "quantity": 1,
+    })),
+    "donor-donations": Scenario("get", lambda ctx, i: Call(reverse("donor-donations"), user=ctx.donor.user)),
+    "orphanage-donations": Scenario("get", lambda ctx, i: Call(
+        reverse("orphanage-donations"), user=ctx.orphanage.user,
+    )),
+    "donor-donations-export": Scenario("get", lambda ctx, i: Call(
+        reverse("donor-donations-export"), user=ctx.donor.user, params={"format": ("csv", "ndjson")[i % 2]},
+    )),
+    "orphanage-donations-export": Scenario("get", lambda ctx, i: Call(
+        reverse("orphanage-donations-export"), user=ctx.orphanage.user, params={"status": "completed"},
+    )),
+    # event feeds replay from the start; the runner reads a stream's first chunk only
+    "donation-events": Scenario("get", lambda ctx, i: Call(
+        reverse("donation-events"), user=ctx.orphanage.user, params={"after": 0},
+    )),
+    "donation-event-stream": Scenario("get", lambda ctx, i: Call(
+        reverse("donation-event-stream"), user=ctx.orphanage.user, params={"after": 0},
+    )),
+    "donation-status-update": Scenario("patch", lambda ctx, i: Call(
+        reverse("donation-status-update", args=[ctx.donation.pk]), user=ctx.orphanage.user,
+        data={"status": ("accepted", "completed", "pending")[i % 3]},
+    )),
+    # requirements
+    "requirement-create": Scenario("post", lambda ctx, i: Call(
+        reverse("requirement-create"), user=ctx.orphanage.user,
+        data={"item_name": "Notebooks", "category": "stationary", "quantity_needed": 40},
+    )),
+    "requirement-bulk": Scenario("post", lambda ctx, i: Call(
+        reverse("requirement-bulk"), user=ctx.orphanage.user,
+        data=[{"item_name": f"Item {n}", "category": "food", "quantity_needed": 10} for n in range(20)],
+    )),
+    "requirement-list": Scenario("get", lambda ctx, i: Call(reverse("requirement-list"), user=ctx.orphanage.user)),
+    "requirement-update": Scenario("patch", lambda ctx, i: Call(
+        reverse("requirement-update", args=[ctx.requirement.pk]), user=ctx.orphanage.user,
+        data={"quantity_needed": 100 + i},
+    )),
+    "requirement-delete": Scenario("delete", requirement_delete),
+    "requirement-public": Scenario("get", lambda ctx, i: Call(reverse("requirement-public"))),
+    "requirement-by-orphanage": Scenario("get", lambda ctx, i: Call(
+        reverse("requirement-by-orphanage", args=[ctx.orphanage.pk]),
+    )),
+    "requirement-cache-stats": Scenario("get", lambda ctx, i: Call(reverse("requirement-cache-stats"), user=ctx.admin)),
+    # dashboard
+    "dashboard-summary": Scenario("get", lambda ctx, i: Call(reverse("dashboard-summary"), user=ctx.orphanage.user)),
+    # platform stats
+    "stats-donations-monthly": Scenario("get", lambda ctx, i: Call(reverse("stats-donations-monthly"))),
+    "stats-top-donors": Scenario("get", lambda ctx, i: Call(reverse("stats-top-donors"), params={"limit": 10})),
+    "stats-categories": Scenario("get", lambda ctx, i: Call(reverse("stats-categories"))),
+    "stats-cities": Scenario("get", lambda ctx, i: Call(reverse("stats-cities"))),
+    # discovery
+    "requirement-urgent": Scenario("get", lambda ctx, i: Call(
+        reverse("requirement-urgent"), params={"days": (7, 30, 90)[i % 3]},
+    )),
+    "recommendation-list": Scenario("get", lambda ctx, i: Call(
+        reverse("recommendation-list"), user=ctx.donor.user,
+    )),
+    "search": Scenario("get", lambda ctx, i: Call(
+        reverse("search"), params={"q": CITIES[i % len(CITIES)][0][:4].lower()},
+    )),
+    "geo-nearby": Scenario("get", lambda ctx, i: Call(
+        reverse("geo-nearby"), params={"pincode": CITIES[i % len(CITIES)][2], "radius_km": 25},
+    )),
+    # ops
+    "perf-slow-queries": Scenario("get", lambda ctx, i: Call(reverse("perf-slow-queries"), user=ctx.admin)),
+    "throttle-stats": Scenario("get", lambda ctx, i: Call(reverse("throttle-stats"), user=ctx.admin)),
+}
@@ -0,0 +1,254 @@
+# bench/seed.py
+"""
+Synthetic production-shaped data for local benchmarking.
+
+Everything is written with bulk_create in fixed-size chunks, so memory stays
+flat at any scale. Bench users are recognisable by BENCH_DOMAIN and all share
+the password BENCH_PASSWORD (hashed once).
+
+bulk_create skips model signals, so the derived data those signals maintain
+(requirement totals, search index, dashboard summaries, feed cache), the
+stats rollups and the donor recommendation lists are rebuilt at the end,
+after past-deadline requirements are expired.
+"""
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from auth_app.models import User
+from dashboard.summary import reconcile as reconcile_dashboard
+from donation.models import Donation
+from donor.models import DonorProfile
+from geo.locator import resolve
+from orphanage.models import OrphanageProfile
+from recommendation.engine import refresh as refresh_recommendations
+from requirement.cache import GLOBAL_FEED, bump_version
+from requirement.expiry import expire as expire_requirements
+from requirement.models import OrphanageRequirement
+from search import index as search_index
+from stats.rollups import refresh as refresh_rollups
+
+BENCH_DOMAIN = "bench.example"
+BENCH_PASSWORD = "bench-password"
+
+CITIES = [
+    ("Bengaluru", "Karnataka", "560001"), ("Mysuru", "Karnataka", "570001"),
+    ("Mangaluru", "Karnataka", "575001"), ("Chennai", "Tamil Nadu", "600001"),
+    ("Coimbatore", "Tamil Nadu", "641001"), ("Madurai", "Tamil Nadu", "625001"),
+    ("Hyderabad", "Telangana", "500001"), ("Pune", "Maharashtra", "411001"),
+    ("Mumbai", "Maharashtra", "400001"), ("Nagpur", "Maharashtra", "440001"),
+    ("Kochi", "Kerala", "682001"), ("Jaipur", "Rajasthan", "302001"),
+    ("Lucknow", "Uttar Pradesh", "226001"), ("Patna", "Bihar", "800001"),
+    ("Bhopal", "Madhya Pradesh", "462001"), ("Kolkata", "West Bengal", "700001"),
+    ("Delhi", "Delhi", "110001"), ("Ahmedabad", "Gujarat", "380001"),
+]
+ITEMS = {
+    "food": ["Rice", "Wheat flour", "Dal", "Cooking oil", "Milk powder", "Biscuits"],
+    "groceries": ["Soap", "Toothpaste", "Detergent", "Sugar", "Salt", "Tea"],
+    "clothing": ["School uniforms", "Blankets", "Sweaters", "Shoes", "Socks", "Bedsheets"],
+    "education": ["Textbooks", "School bags", "Geometry boxes", "Atlas", "Dictionaries"],
+    "medical": ["Paracetamol", "Bandages", "Vitamins", "Thermometer", "First-aid kits"],
+    "stationary": ["Notebooks", "Pencils", "Pens", "Crayons", "Rulers"],
+    "others": ["Ceiling fans", "Mattresses", "Buckets", "Steel plates", "Water purifier"],
+}
+# roughly what the live table looks like
+DONATION_STATUSES = (("completed", 60), ("pending", 20), ("accepted", 15), ("cancelled", 5))
+LINKED_DONATION_SHARE = 0.7
+HISTORY_DAYS = 365
+
+
+@contextmanager
+def explicit_timestamps(model, field_name):
+    """
+    Let bulk_create keep the timestamps we set instead of auto_now_add's
+    "now", so data is spread over HISTORY_DAYS like a real table.
+    """
+    field = model._meta.get_field(field_name)
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def chunked(total, size):
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+class Seeder:
+    def __init__(self, rng=None, batch_size=5000, log=print):
+        self.rng = rng or random.Random(42)
+        self.batch_size = batch_size
+        self.log = log
+        self.now = timezone.now()
+        self.password = make_password(BENCH_PASSWORD)
+
+    def past(self, days=HISTORY_DAYS):
+        return self.now - timedelta(seconds=self.rng.uniform(0, days * 86400))
+
+    def users(self, role, count):
+        offset = User.objects.filter(email__endswith=f"@{BENCH_DOMAIN}", role=role).count()
+        return User.objects.bulk_create(
+            (
+                User(
+                    email=f"{role}-{offset + n}@{BENCH_DOMAIN}",
+                    password=self.password,
+                    role=role,
+                    is_active=True,
+                    is_verified=True,
+                )
+                for n in range(count)
+            ),
+            batch_size=self.batch_size,
+        )
+
+    def orphanages(self, count):
+        ids = []
+        for _, size in chunked(count, self.batch_size):
+            profiles = []
+            for user in self.users("orphanage", size):
+                city, state, pincode = self.rng.choice(CITIES)
+                latitude, longitude = resolve(pincode) or (None, None)
+                total = self.rng.randint(10, 150)
+                boys = self.rng.randint(0, total)
+                profiles.append(OrphanageProfile(
+                    user=user,
+                    orphanage_name=f"{self.rng.choice(['Sneha', 'Asha', 'Karuna', 'Nanna', 'Seva'])} "
+                                   f"{self.rng.choice(['Children Home', 'Ashram', 'Trust', 'Foundation'])} {city}",
+                    description=f"Home for {total} children in {city}.",
+                    address=f"{self.rng.randint(1, 500)} Main Road, {city}",
+                    city=city,
+                    state=state,
+                    pincode=pincode,
+                    phone_number=f"9{self.rng.randint(100000000, 999999999)}",
+                    email=user.email,
+                    total_orphans=total,
+                    boys_count=boys,
+                    girls_count=total - boys,
+                    students_count=self.rng.randint(0, total),
+                    verified=self.rng.random() < 0.8,
+                    latitude=latitude,
+                    longitude=longitude,
+                ))
+            ids += [p.id for p in OrphanageProfile.objects.bulk_create(profiles)]
+        self.log(f"orphanages: {len(ids)}")
+        return ids
+
+    def donors(self, count):
+        ids = []
+        for _, size in chunked(count, self.batch_size):
+            profiles = []
+            for user in self.users("donor", size):
+                city, state, pincode = self.rng.choice(CITIES)
+                latitude, longitude = resolve(pincode) or (None, None)
+                profiles.append(DonorProfile(
+                    user=user,
+                    full_name=f"Donor {user.email.split('@')[0]}",
+                    contact_number=f"8{self.rng.randint(100000000, 999999999)}",
+                    email=user.email,
+                    city=city,
+                    state=state,
+                    pincode=pincode,
+                    latitude=latitude,
+                    longitude=longitude,
+                ))
+            ids += [p.id for p in DonorProfile.objects.bulk_create(profiles)]
+        self.log(f"donors: {len(ids)}")
+        return ids
+
+    def requirements(self, orphanage_ids, per_orphanage):
+        """Returns {orphanage_id: [requirement ids]}."""
+        by_orphanage = {}
+        batch = []
+
+        def flush():
+            for requirement in OrphanageRequirement.objects.bulk_create(batch):
+                by_orphanage.setdefault(requirement.orphanage_id, []).append(requirement.id)
+            batch.clear()
+
+        with explicit_timestamps(OrphanageRequirement, "posted_date"):
+            for orphanage_id in orphanage_ids:
+                for _ in range(self.rng.randint(0, per_orphanage * 2)):
+                    category = self.rng.choice(list(ITEMS))
+                    posted = self.past()
+                    batch.append(OrphanageRequirement(
+                        orphanage_id=orphanage_id,
+                        item_name=self.rng.choice(ITEMS[category]),
+                        category=category,
+                        description=f"Needed for {self.rng.choice(['daily use', 'the new term', 'winter', 'exams'])}",
+                        quantity_needed=self.rng.randint(5, 500),
+                        posted_date=posted,
+                        deadline=(posted + timedelta(days=self.rng.randint(7, 90))).date(),
+                    ))
+                    if len(batch) >= self.batch_size:
+                        flush()
+            flush()
+        self.log(f"requirements: {sum(len(ids) for ids in by_orphanage.values())}")
+        return by_orphanage
+
+    def donations(self, count, donor_ids, orphanage_ids, requirements):
+        statuses, weights = zip(*DONATION_STATUSES)
+        with explicit_timestamps(Donation, "donation_date"):
+            for _, size in chunked(count, self.batch_size):
+                batch = []
+                for _ in range(size):
+                    orphanage_id = self.rng.choice(orphanage_ids)
+                    linked = requirements.get(orphanage_id) and self.rng.random() < LINKED_DONATION_SHARE
+                    category = self.rng.choice(list(ITEMS))
+                    batch.append(Donation(
+                        donor_id=self.rng.choice(donor_ids),
+                        orphanage_id=orphanage_id,
+                        requirement_id=self.rng.choice(requirements[orphanage_id]) if linked else None,
+                        item_name=self.rng.choice(ITEMS[category]),
+                        quantity=self.rng.randint(1, 50),
+                        status=self.rng.choices(statuses, weights)[0],
+                        donation_date=self.past(),
+                    ))
+                Donation.objects.bulk_create(batch)
+        self.log(f"donations: {count}")
+
+    def refresh_derived(self):
+        """Recompute what the signal/fulfilment paths would have maintained."""
+        received = (
+            Donation.objects.filter(requirement=OuterRef("pk"), status="completed")
+            .values("requirement")
+            .annotate(total=Sum("quantity"))
+            .values("total")
+        )
+        bench_requirements = OrphanageRequirement.objects.filter(
+            orphanage__user__email__endswith=f"@{BENCH_DOMAIN}"
+        )
+        bench_requirements.update(quantity_received=Coalesce(Subquery(received), 0), updated_at=self.now)
+        bench_requirements.update(is_fulfilled=Q(quantity_received__gte=F("quantity_needed")))
+        expired = expire_requirements()
+        documents = search_index.rebuild()
+        reconcile_dashboard()
+        refresh_rollups(full=True)
+        refresh_recommendations(full=True)
+        transaction.on_commit(lambda: bump_version(GLOBAL_FEED))
+        self.log(f"expired requirements: {expired}")
+        self.log(f"search documents: {documents}")
+
+    def run(self, orphanages, donors, requirements_per_orphanage, donations):
+        with transaction.atomic():
+            orphanage_ids = self.orphanages(orphanages)
+            donor_ids = self.donors(donors)
+            requirements = self.requirements(orphanage_ids, requirements_per_orphanage)
+            if donor_ids and orphanage_ids:
+                self.donations(donations, donor_ids, orphanage_ids, requirements)
+            self.refresh_derived()
+
+
+def flush():
+    """Delete every bench user; profiles, requirements and donations cascade."""
+    deleted, _ = User.objects.filter(email__endswith=f"@{BENCH_DOMAIN}").delete()
+    search_index.rebuild()
+    bump_version(GLOBAL_FEED)
+    return deleted
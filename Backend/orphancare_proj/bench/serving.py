@@ -0,0 +1,195 @@
+# bench/serving.py
+"""
+Concurrent-connection throughput of the public read endpoints: gunicorn with
+sync WSGI workers (today's deployment) against gunicorn with uvicorn workers
+over ASGI (gunicorn_asgi.conf.py), serving the async views and, for
+reference, the DRF views.
+
+Both servers are started as subprocesses on a free local port, with the same
+number of workers and against the configured database (seed it first with
+seed_bench). Throttling is switched off and perf log lines are silenced in the
+servers. For each endpoint, `connections` HTTP/1.1 keep-alive clients then
+issue requests back to back for `seconds`. Sync workers answer with
+`Connection: close`, and the client reconnects when that happens, the same
+way a browser or load balancer would.
+"""
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from importlib.util import find_spec
+
+from django.conf import settings
+
+from orphanage.models import OrphanageProfile
+from .runner import percentile
+
+ASGI = ["-c", "gunicorn_asgi.conf.py", "orphancare_proj.asgi:application"]
+# name -> (gunicorn arguments, extra environment)
+SERVERS = {
+    "wsgi": (["orphancare_proj.wsgi:application"], {}),
+    "asgi": (ASGI, {"ASYNC_PUBLIC_VIEWS": "1"}),
+    # the DRF views through ASGI: separates async view cost from server cost
+    "asgi-sync": (ASGI, {"ASYNC_PUBLIC_VIEWS": "0"}),
+}
+DEFAULT_SERVERS = ("wsgi", "asgi", "asgi-sync")
+SERVER_ENV = {"API_THROTTLE_ENABLED": "0", "PERF_LOG_LEVEL": "WARNING"}
+STARTUP_TIMEOUT = 30
+WARMUP_REQUESTS = 20
+
+
+def endpoints():
+    orphanage_id = OrphanageProfile.objects.order_by("id").values_list("id", flat=True).first()
+    if orphanage_id is None:
+        raise RuntimeError("No orphanages to read; run `python manage.py seed_bench` first.")
+    return {
+        "orphanage-list": "/api/orphanage/list/",
+        "orphanage-public-detail": f"/api/orphanage/{orphanage_id}/",
+        "requirement-public": "/api/requirement/public/",
+        "requirement-by-orphanage": f"/api/requirement/orphanage/{orphanage_id}/",
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(name, workers, port):
+    arguments, extra_env = SERVERS[name]
+    command = [
+        sys.executable, "-m", "gunicorn", *arguments,
+        "--workers", str(workers), "--bind", f"127.0.0.1:{port}",
+    ]
+    env = {**os.environ, **SERVER_ENV, **extra_env}
+    process = subprocess.Popen(
+        command, cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{name} server exited: {process.stderr.read().decode()[-2000:]}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    stop_server(process)
+    raise RuntimeError(f"{name} server did not start within {STARTUP_TIMEOUT}s")
+
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+# ---------- load generator ----------
+
+async def request(reader, writer, path):
+    """One GET on an open connection: (status, keep the connection open?)."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: keep-alive\r\n\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+        keep_alive = headers.get("connection", "").lower() != "close"
+    else:
+        await reader.read()  # body runs to the end of the connection
+        keep_alive = False
+    return status, keep_alive
+
+
+async def client(port, path, deadline, latencies, statuses):
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        begin = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            status, keep_alive = await request(reader, writer, path)
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            statuses.append(None)
+            keep_alive = False
+        else:
+            latencies.append(time.perf_counter() - begin)
+            statuses.append(status)
+        if not keep_alive and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def load(port, path, connections, seconds):
+    latencies, statuses = [], []
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(client(port, path, deadline, latencies, statuses) for _ in range(connections)))
+    latencies.sort()
+    ok = sum(1 for status in statuses if status == 200)
+    return {
+        "requests": ok,
+        "errors": len(statuses) - ok,
+        "rps": round(ok / seconds, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def warm_up(port, path):
+    """A few sequential requests so imports, connections and caches are warm in every worker."""
+    for _ in range(WARMUP_REQUESTS):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            await request(reader, writer, path)
+        finally:
+            writer.close()
+
+
+def run(workers=2, connections=64, seconds=10.0, servers=DEFAULT_SERVERS, log=print):
+    missing = [module for module in ("gunicorn", "uvicorn_worker") if find_spec(module) is None]
+    if missing:
+        raise RuntimeError(f"Install {', '.join(missing)} (requirements.txt) to run the serving benchmark.")
+
+    paths = endpoints()
+    result = {"workers": workers, "connections": connections, "seconds": seconds, "servers": {}}
+    for name in servers:
+        port = free_port()
+        log(f"{name}: starting gunicorn with {workers} workers on :{port}")
+        process = start_server(name, workers, port)
+        try:
+            result["servers"][name] = {}
+            for endpoint, path in paths.items():
+                asyncio.run(warm_up(port, path))
+                log(f"{name}: {endpoint} with {connections} connections for {seconds}s")
+                result["servers"][name][endpoint] = asyncio.run(load(port, path, connections, seconds))
+        finally:
+            stop_server(process)
+
+    wsgi = result["servers"].get("wsgi")
+    if wsgi:
+        # throughput relative to today's WSGI setup
+        result["vs_wsgi"] = {
+            name: {
+                endpoint: round(stats[endpoint]["rps"] / wsgi[endpoint]["rps"], 2) if wsgi[endpoint]["rps"] else None
+                for endpoint in paths
+            }
+            for name, stats in result["servers"].items() if name != "wsgi"
+        }
+    return result
+
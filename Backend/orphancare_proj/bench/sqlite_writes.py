@@ -0,0 +1,175 @@
+# bench/sqlite_writes.py
+"""
+Concurrent write throughput on SQLite, Django defaults vs the production
+profile (orphancare_proj.sqlite).
+
+Forks `processes` workers per profile. Each runs the donation write paths for
+`seconds`: a create (read the requirement, insert the donation) or a status
+update (lock_donation + apply_fulfilment, as DonationStatusUpdateView does),
+each in its own transaction. Failed transactions ("database is locked") are
+counted, not retried.
+
+The workers need committed rows, so this runs against the real database
+file: a bench orphanage, donor and requirements are created up front and
+deleted again at the end.
+"""
+import multiprocessing
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connection, connections, transaction
+
+from auth_app.models import User
+from donation.fulfilment import apply_fulfilment, lock_donation, snapshot
+from donation.models import Donation
+from donor.models import DonorProfile
+from orphanage.models import OrphanageProfile
+from orphancare_proj.sqlite import is_sqlite
+from requirement.models import OrphanageRequirement
+from .runner import percentile
+from .seed import BENCH_DOMAIN
+
+REQUIREMENTS = 20
+UPDATE_SHARE = 0.5
+STATUSES = ("pending", "accepted", "completed", "cancelled")
+
+# Django's sqlite3 backend with no OPTIONS, and a rollback journal
+BASELINE = {"journal_mode": "DELETE", "options": {}}
+
+
+def profiles():
+    return {
+        "django-default": BASELINE,
+        "production": {"journal_mode": "WAL", "options": settings.SQLITE_OPTIONS},
+    }
+
+
+def create_fixtures(tag):
+    user = User.objects.create_user(email=f"sqlw-home-{tag}@{BENCH_DOMAIN}", password="!", role="orphanage")
+    orphanage = OrphanageProfile.objects.create(
+        user=user, orphanage_name=f"SQLite bench {tag}", address="1 Street", city="Bengaluru",
+        state="Karnataka", pincode="560001", phone_number="8888888888", email=user.email,
+    )
+    user = User.objects.create_user(email=f"sqlw-donor-{tag}@{BENCH_DOMAIN}", password="!", role="donor")
+    donor = DonorProfile.objects.create(user=user, full_name="Bench", contact_number="9999999999", email=user.email)
+    requirement_ids = [
+        OrphanageRequirement.objects.create(orphanage=orphanage, item_name=f"Item {n}", quantity_needed=10**6).id
+        for n in range(REQUIREMENTS)
+    ]
+    return donor, orphanage, requirement_ids
+
+
+def delete_fixtures(tag):
+    User.objects.filter(email__in=[f"sqlw-home-{tag}@{BENCH_DOMAIN}", f"sqlw-donor-{tag}@{BENCH_DOMAIN}"]).delete()
+
+
+def create_donation(rng, donor_id, orphanage_id, requirement_ids):
+    with transaction.atomic():
+        requirement = OrphanageRequirement.objects.get(pk=rng.choice(requirement_ids))
+        Donation.objects.create(
+            donor_id=donor_id, orphanage_id=orphanage_id, requirement=requirement,
+            item_name=requirement.item_name, quantity=rng.randint(1, 5),
+        )
+
+
+def update_status(rng, donation_id):
+    with transaction.atomic():
+        donation = lock_donation(donation_id)
+        previous = snapshot(donation)
+        donation.status = rng.choice(STATUSES)
+        donation.save(update_fields=["status", "updated_at"])
+        apply_fulfilment(previous, snapshot(donation))
+
+
+def worker(options, seed, seconds, donor_id, orphanage_id, requirement_ids, start, results):
+    # forked: drop the parent's connection and reconnect with this profile
+    connections[DEFAULT_DB_ALIAS].settings_dict["OPTIONS"] = options
+    connections.close_all()
+    rng = random.Random(seed)
+    report = {"writes": 0, "errors": 0, "latencies": [], "failure": None}
+    try:
+        donation_ids = list(Donation.objects.filter(donor_id=donor_id).values_list("id", flat=True))
+        start.wait()
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            begin = time.perf_counter()
+            try:
+                if donation_ids and rng.random() < UPDATE_SHARE:
+                    update_status(rng, rng.choice(donation_ids))
+                else:
+                    create_donation(rng, donor_id, orphanage_id, requirement_ids)
+            except OperationalError:
+                report["errors"] += 1
+                continue
+            report["latencies"].append(time.perf_counter() - begin)
+            report["writes"] += 1
+    except Exception as exc:
+        report["failure"] = repr(exc)
+    finally:
+        connections.close_all()
+        results.put(report)
+
+
+def run_profile(profile, processes, seconds, donor_id, orphanage_id, requirement_ids):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA journal_mode={profile['journal_mode']}")
+    connections.close_all()
+
+    context = multiprocessing.get_context("fork")
+    start, results = context.Barrier(processes), context.Queue()
+    workers = [
+        context.Process(
+            target=worker,
+            args=(profile["options"], n, seconds, donor_id, orphanage_id, requirement_ids, start, results),
+        )
+        for n in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    reports = [results.get() for _ in workers]
+    for process in workers:
+        process.join()
+    failures = [report["failure"] for report in reports if report["failure"]]
+    if failures:
+        raise RuntimeError(f"Benchmark worker failed: {failures[0]}")
+
+    writes = sum(report["writes"] for report in reports)
+    errors = sum(report["errors"] for report in reports)
+    latencies = sorted(latency for report in reports for latency in report["latencies"])
+    return {
+        "writes": writes,
+        "errors": errors,
+        "writes_per_sec": round(writes / seconds, 1),
+        "error_rate": round(errors / (writes + errors), 4) if writes + errors else 0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+    }
+
+
+def run(processes=8, seconds=10.0, log=print):
+    if not is_sqlite():
+        raise RuntimeError("The write benchmark measures SQLite locking; DATABASES['default'] is not SQLite.")
+
+    tag = uuid.uuid4().hex[:8]
+    donor, orphanage, requirement_ids = create_fixtures(tag)
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode")
+        journal_mode = cursor.fetchone()[0]
+    result = {"processes": processes, "seconds": seconds, "profiles": {}}
+    try:
+        for name, profile in profiles().items():
+            log(f"{name}: {processes} writers for {seconds}s")
+            result["profiles"][name] = run_profile(
+                profile, processes, seconds, donor.id, orphanage.id, requirement_ids
+            )
+    finally:
+        delete_fixtures(tag)
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+
+    before, after = result["profiles"]["django-default"], result["profiles"]["production"]
+    if before["writes_per_sec"]:
+        result["speedup"] = round(after["writes_per_sec"] / before["writes_per_sec"], 2)
+    return result
@@ -0,0 +1,124 @@
+import asyncio
+import random
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from auth_app.models import OTP
+from donation.models import Donation
+from requirement.models import OrphanageRequirement
+from auth_app.models import User
+from . import otp as otp_bench
+from . import serving, sqlite_writes
+from .runner import compare, percentile, route_names, run
+from .scenarios import SCENARIOS
+from .seed import Seeder
+
+
+class SeedBenchTests(TestCase):
+    def test_seeds_consistent_data(self):
+        Seeder(rng=random.Random(1), batch_size=7, log=lambda *a: None).run(
+            orphanages=5, donors=4, requirements_per_orphanage=3, donations=60
+        )
+
+        self.assertEqual(Donation.objects.count(), 60)
+        # totals match what the fulfilment path would have produced
+        for requirement in OrphanageRequirement.objects.all():
+            completed = sum(
+                requirement.donations.filter(status="completed").values_list("quantity", flat=True)
+            )
+            self.assertEqual(requirement.quantity_received, completed)
+            self.assertEqual(requirement.is_fulfilled, completed >= requirement.quantity_needed)
+
+
+class RunBenchTests(TestCase):
+    def test_every_route_has_a_scenario(self):
+        missing = [name for name in route_names() if name not in SCENARIOS and not name.startswith("admin:")]
+        self.assertEqual(missing, [])
+
+    def test_run_reports_every_route_without_errors(self):
+        Seeder(rng=random.Random(1), log=lambda *a: None).run(
+            orphanages=3, donors=3, requirements_per_orphanage=2, donations=20
+        )
+        donations = Donation.objects.count()
+
+        result = run(iterations=2, warmup=0, log=lambda *a: None)
+
+        self.assertEqual(set(result["routes"]), set(SCENARIOS))
+        for name, row in result["routes"].items():
+            with self.subTest(route=name):
+                self.assertEqual(row["errors"], 0, row["statuses"])
+                self.assertLessEqual(row["p50_ms"], row["p99_ms"])
+        # writes made by the scenarios are rolled back
+        self.assertEqual(Donation.objects.count(), donations)
+        self.assertEqual(compare(result, result)[0].split()[0], next(iter(result["routes"])))
+
+    def test_percentile(self):
+        samples = list(range(1, 101))
+        self.assertEqual(
+            (percentile(samples, 50), percentile(samples, 95), percentile(samples, 99)), (50, 95, 99)
+        )
+
+
+class OTPBenchTests(TestCase):
+    def test_verify_benchmark_runs_and_rolls_back(self):
+        result = otp_bench.run(rows=500, users=20, iterations=5, batch_size=100, purge=True, log=lambda *a: None)
+
+        self.assertEqual(result["queries"], 1)
+        self.assertTrue(any("otp_unused_hash_idx" in line for line in result["plan"]))
+        self.assertGreater(result["purged"], 0)
+        self.assertFalse(OTP.objects.exists())
+
+
+class SQLiteWriteBenchTests(TransactionTestCase):
+    def test_production_profile_writes_without_lock_errors(self):
+        result = sqlite_writes.run(processes=3, seconds=0.5, log=lambda *a: None)
+
+        production = result["profiles"]["production"]
+        self.assertGreater(production["writes"], 0)
+        self.assertEqual(production["errors"], 0)
+        self.assertEqual(set(result["profiles"]), {"django-default", "production"})
+        # bench rows are cleaned up
+        self.assertFalse(User.objects.filter(email__startswith="sqlw-").exists())
+        self.assertEqual(Donation.objects.count(), 0)
+
+    def test_connections_use_the_production_profile(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone()[0], "wal")
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertGreater(cursor.fetchone()[0], 0)
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
+
+
+class ServingBenchTests(TestCase):
+    def test_load_generator_handles_keep_alive_and_close(self):
+        async def scenario():
+            served = []
+
+            async def handle(reader, writer):
+                # keep-alive for two requests, then close like a sync worker
+                for n in range(3):
+                    try:
+                        await reader.readuntil(b"\r\n\r\n")
+                    except asyncio.IncompleteReadError:
+                        break
+                    served.append(n)
+                    last = n == 2
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n"
+                        + (b"Connection: close\r\n" if last else b"") + b"\r\n{}"
+                    )
+                    await writer.drain()
+                writer.close()
+
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                result = await serving.load(port, "/", connections=4, seconds=0.3)
+            return result, served
+
+        result, served = asyncio.run(scenario())
+        self.assertGreater(result["requests"], 4)
+        self.assertEqual(result["errors"], 0)
+        self.assertGreaterEqual(len(served), result["requests"])
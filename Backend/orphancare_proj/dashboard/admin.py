@@ -0,0 +1,13 @@
+from django.contrib import admin
+from .models import OrphanageDonationSummary, RequirementCategorySummary
+
+
+@admin.register(OrphanageDonationSummary)
+class OrphanageDonationSummaryAdmin(admin.ModelAdmin):
+    list_display = ("orphanage", "pending", "accepted", "completed", "cancelled", "units_received", "updated_at")
+
+
+@admin.register(RequirementCategorySummary)
+class RequirementCategorySummaryAdmin(admin.ModelAdmin):
+    list_display = ("orphanage", "category", "open", "fulfilled")
+    list_filter = ("category",)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.summary import reconcile
+
+
+class Command(BaseCommand):
+    help = "Rebuild the orphanage dashboard summaries from scratch and report drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orphanage", type=int, action="append", dest="orphanages",
+                            help="Only this orphanage id (repeatable).")
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without fixing it.")
+
+    def handle(self, *args, **options):
+        drift = reconcile(orphanage_ids=options["orphanages"], fix=not options["dry_run"])
+
+        for entry in drift[:100]:
+            self.stdout.write(
+                f"{entry['table']} {entry['key']} {entry['field']}: "
+                f"stored {entry['stored']}, expected {entry['expected']}"
+            )
+        if len(drift) > 100:
+            self.stdout.write(f"... and {len(drift) - 100} more")
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("No drift"))
+        elif options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"{len(drift)} values drifted (not fixed)"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{len(drift)} drifted values fixed"))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('orphanage', '0004_orphanageprofile_banner_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrphanageDonationSummary',
+            fields=[
+                ('orphanage', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='donation_summary', serialize=False, to='orphanage.orphanageprofile')),
+                ('pending', models.IntegerField(default=0)),
+                ('accepted', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+                ('units_received', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RequirementCategorySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('food', 'Food'), ('groceries', 'Groceries'), ('clothing', 'Clothing'), ('education', 'Education'), ('medical', 'Medical'), ('others', 'Others'), ('stationary', 'Stationary')], max_length=50)),
+                ('open', models.IntegerField(default=0)),
+                ('fulfilled', models.IntegerField(default=0)),
+                ('orphanage', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='requirement_summaries', to='orphanage.orphanageprofile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('orphanage', 'category'), name='req_summary_orph_cat_uniq')],
+            },
+        ),
+    ]
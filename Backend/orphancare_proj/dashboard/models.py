@@ -0,0 +1,41 @@
+from django.db import models
+
+from orphanage.models import OrphanageProfile
+from requirement.models import OrphanageRequirement
+
+
+class OrphanageDonationSummary(models.Model):
+    """
+    Donation counts per status and units received (completed donations) for
+    one orphanage. Kept up to date incrementally by dashboard.summary.
+    """
+    orphanage = models.OneToOneField(
+        OrphanageProfile, on_delete=models.CASCADE, primary_key=True, related_name="donation_summary"
+    )
+    pending = models.IntegerField(default=0)
+    accepted = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+    units_received = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Donation summary for orphanage {self.orphanage_id}"
+
+
+class RequirementCategorySummary(models.Model):
+    """Open vs fulfilled requirement counts per (orphanage, category)."""
+    orphanage = models.ForeignKey(
+        OrphanageProfile, on_delete=models.CASCADE, related_name="requirement_summaries"
+    )
+    category = models.CharField(max_length=50, choices=OrphanageRequirement.CATEGORY_CHOICES)
+    open = models.IntegerField(default=0)
+    fulfilled = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["orphanage", "category"], name="req_summary_orph_cat_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.category} for orphanage {self.orphanage_id}"
@@ -0,0 +1,47 @@
+# dashboard/signals.py
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from donation.models import Donation
+from requirement.models import OrphanageRequirement
+from . import summary
+
+
+def _stored_state(sender, instance, fields):
+    if instance._state.adding or instance.pk is None:
+        return None
+    return sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+
+
+@receiver(pre_save, sender=Donation)
+def remember_donation(sender, instance, **kwargs):
+    instance._dashboard_previous = _stored_state(sender, instance, ("orphanage_id", "status", "quantity"))
+
+
+@receiver(post_save, sender=Donation)
+def donation_saved(sender, instance, **kwargs):
+    summary.apply_donation_change(
+        getattr(instance, "_dashboard_previous", None), summary.donation_state(instance)
+    )
+
+
+@receiver(post_delete, sender=Donation)
+def donation_deleted(sender, instance, **kwargs):
+    summary.apply_donation_change(summary.donation_state(instance), None)
+
+
+@receiver(pre_save, sender=OrphanageRequirement)
+def remember_requirement(sender, instance, **kwargs):
+    instance._dashboard_previous = _stored_state(sender, instance, ("orphanage_id", "category", "is_fulfilled"))
+
+
+@receiver(post_save, sender=OrphanageRequirement)
+def requirement_saved(sender, instance, **kwargs):
+    summary.apply_requirement_change(
+        getattr(instance, "_dashboard_previous", None), summary.requirement_state(instance)
+    )
+
+
+@receiver(post_delete, sender=OrphanageRequirement)
+def requirement_deleted(sender, instance, **kwargs):
+    summary.apply_requirement_change(summary.requirement_state(instance), None)
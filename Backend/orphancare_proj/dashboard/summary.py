@@ -0,0 +1,211 @@
+# dashboard/summary.py
+"""
+Incremental upkeep of the per-orphanage dashboard tables.
+
+Every change is reduced to (previous state, current state) of one row and
+turned into +/- deltas applied with a single F-expression UPDATE, so
+concurrent writers never lose a count. States:
+
+    donation     (orphanage_id, status, quantity)
+    requirement  (orphanage_id, category, is_fulfilled)
+
+Model saves and deletes are tracked by dashboard.signals. Code that writes
+with queryset.update() or bulk_create must call in here itself (see
+donation.fulfilment and requirement.bulk). `reconcile` rebuilds the tables
+from the source rows and reports any drift.
+"""
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from donation.models import Donation
+from requirement.models import OrphanageRequirement
+from .models import OrphanageDonationSummary, RequirementCategorySummary
+
+DONATION_STATUSES = [status for status, _ in Donation.STATUS_CHOICES]
+# donations whose quantity counts as received (same rule as donation.fulfilment)
+RECEIVED_STATUSES = ("completed",)
+CATEGORIES = [category for category, _ in OrphanageRequirement.CATEGORY_CHOICES]
+
+
+def donation_state(donation):
+    return (donation.orphanage_id, donation.status, donation.quantity)
+
+
+def requirement_state(requirement):
+    return (requirement.orphanage_id, requirement.category, requirement.is_fulfilled)
+
+
+def _apply(model, key, deltas, create):
+    """
+    Add `deltas` to the row identified by `key`, creating it on first use
+    (a concurrent creator that wins the race is handled by retrying the
+    UPDATE). Deletes pass create=False so a cascade never re-creates a row
+    for an orphanage that is being removed.
+    """
+    changes = {field: F(field) + delta for field, delta in deltas.items()}
+    if model is OrphanageDonationSummary:
+        changes["updated_at"] = timezone.now()
+    rows = model.objects.filter(**key)
+    if rows.update(**changes) or not create:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, **deltas)
+    except IntegrityError:
+        rows.update(**changes)
+
+
+def apply_donation_change(previous, current):
+    deltas = defaultdict(Counter)
+    for state, sign in ((previous, -1), (current, 1)):
+        if state is None:
+            continue
+        orphanage_id, status, quantity = state
+        if status in DONATION_STATUSES:
+            deltas[orphanage_id][status] += sign
+        if status in RECEIVED_STATUSES:
+            deltas[orphanage_id]["units_received"] += sign * quantity
+
+    for orphanage_id, fields in deltas.items():
+        fields = {field: delta for field, delta in fields.items() if delta}
+        if fields:
+            _apply(OrphanageDonationSummary, {"orphanage_id": orphanage_id}, fields, create=current is not None)
+
+
+def apply_requirement_change(previous, current):
+    deltas = defaultdict(Counter)
+    for state, sign in ((previous, -1), (current, 1)):
+        if state is None:
+            continue
+        orphanage_id, category, is_fulfilled = state
+        deltas[(orphanage_id, category)]["fulfilled" if is_fulfilled else "open"] += sign
+
+    for (orphanage_id, category), fields in deltas.items():
+        fields = {field: delta for field, delta in fields.items() if delta}
+        if fields:
+            _apply(
+                RequirementCategorySummary,
+                {"orphanage_id": orphanage_id, "category": category},
+                fields,
+                create=current is not None,
+            )
+
+
+# ---------- reading ----------
+
+def get_summary(orphanage_id):
+    """Dashboard payload for one orphanage: two primary-key/index lookups."""
+    donations = OrphanageDonationSummary.objects.filter(orphanage_id=orphanage_id).first()
+    categories = {
+        row.category: row
+        for row in RequirementCategorySummary.objects.filter(orphanage_id=orphanage_id)
+    }
+
+    donation_counts = {status: getattr(donations, status, 0) for status in DONATION_STATUSES}
+    by_category = {
+        category: {
+            "open": getattr(categories.get(category), "open", 0),
+            "fulfilled": getattr(categories.get(category), "fulfilled", 0),
+        }
+        for category in CATEGORIES
+    }
+    return {
+        "orphanage": orphanage_id,
+        "donations": {**donation_counts, "total": sum(donation_counts.values())},
+        "units_received": getattr(donations, "units_received", 0),
+        "requirements": {
+            "open": sum(row["open"] for row in by_category.values()),
+            "fulfilled": sum(row["fulfilled"] for row in by_category.values()),
+            "by_category": by_category,
+        },
+        "updated_at": getattr(donations, "updated_at", None),
+    }
+
+
+# ---------- rebuilding ----------
+
+def expected_donation_summaries(orphanage_ids=None):
+    rows = Donation.objects.all()
+    if orphanage_ids is not None:
+        rows = rows.filter(orphanage_id__in=orphanage_ids)
+    aggregates = {status: Count("id", filter=Q(status=status)) for status in DONATION_STATUSES}
+    aggregates["units_received"] = Sum("quantity", filter=Q(status__in=RECEIVED_STATUSES), default=0)
+    return {
+        row.pop("orphanage_id"): row
+        for row in rows.values("orphanage_id").order_by().annotate(**aggregates)
+    }
+
+
+def expected_requirement_summaries(orphanage_ids=None):
+    rows = OrphanageRequirement.objects.all()
+    if orphanage_ids is not None:
+        rows = rows.filter(orphanage_id__in=orphanage_ids)
+    grouped = rows.values("orphanage_id", "category").order_by().annotate(
+        open=Count("id", filter=Q(is_fulfilled=False)),
+        fulfilled=Count("id", filter=Q(is_fulfilled=True)),
+    )
+    return {
+        (row["orphanage_id"], row["category"]): {"open": row["open"], "fulfilled": row["fulfilled"]}
+        for row in grouped
+    }
+
+
+def _drift(table, stored, expected, fields):
+    zero = dict.fromkeys(fields, 0)
+    drift = []
+    for k in sorted(set(stored) | set(expected), key=str):
+        before, after = stored.get(k, zero), expected.get(k, zero)
+        for field in fields:
+            if before[field] != after[field]:
+                drift.append({
+                    "table": table, "key": k, "field": field,
+                    "stored": before[field], "expected": after[field],
+                })
+    return drift
+
+
+def reconcile(orphanage_ids=None, fix=True, tables=("donations", "requirements")):
+    """
+    Recompute the summaries from Donation / OrphanageRequirement (optionally
+    only for some orphanages) and return the drift found, one dict per wrong
+    value. With fix=True the stored rows are replaced by the recomputed ones.
+    Writers that commit while this runs can be missed; run it again if the
+    drift it reports looks like live traffic.
+    """
+    drift = []
+    with transaction.atomic():
+        if "donations" in tables:
+            fields = DONATION_STATUSES + ["units_received"]
+            stored_rows = OrphanageDonationSummary.objects.all()
+            if orphanage_ids is not None:
+                stored_rows = stored_rows.filter(orphanage_id__in=orphanage_ids)
+            stored = {row["orphanage_id"]: row for row in stored_rows.values("orphanage_id", *fields)}
+            expected = expected_donation_summaries(orphanage_ids)
+            drift += _drift("donations", stored, expected, fields)
+            if fix:
+                stored_rows.delete()
+                OrphanageDonationSummary.objects.bulk_create(
+                    OrphanageDonationSummary(orphanage_id=orphanage_id, **values)
+                    for orphanage_id, values in expected.items()
+                )
+
+        if "requirements" in tables:
+            stored_rows = RequirementCategorySummary.objects.all()
+            if orphanage_ids is not None:
+                stored_rows = stored_rows.filter(orphanage_id__in=orphanage_ids)
+            stored = {
+                (row["orphanage_id"], row["category"]): row
+                for row in stored_rows.values("orphanage_id", "category", "open", "fulfilled")
+            }
+            expected = expected_requirement_summaries(orphanage_ids)
+            drift += _drift("requirements", stored, expected, ["open", "fulfilled"])
+            if fix:
+                stored_rows.delete()
+                RequirementCategorySummary.objects.bulk_create(
+                    RequirementCategorySummary(orphanage_id=orphanage_id, category=category, **values)
+                    for (orphanage_id, category), values in expected.items()
+                )
+    return drift
@@ -0,0 +1,118 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from donation.models import Donation
+from orphancare_proj.testing import make_donor, make_orphanage
+from requirement.models import OrphanageRequirement
+from .models import OrphanageDonationSummary, RequirementCategorySummary
+from .summary import reconcile
+
+
+class DashboardSummaryTests(TestCase):
+    def setUp(self):
+        self.donor_user, self.donor = make_donor()
+        self.orphanage_user, self.orphanage = make_orphanage()
+        self.client = APIClient()
+        self.requirement = OrphanageRequirement.objects.create(
+            orphanage=self.orphanage, item_name="Rice", category="food", quantity_needed=10
+        )
+
+    def summary(self):
+        self.client.force_authenticate(self.orphanage_user)
+        response = self.client.get(reverse("dashboard-summary"))
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def donate(self, quantity):
+        self.client.force_authenticate(self.donor_user)
+        response = self.client.post(
+            reverse("donation-create"),
+            {"orphanage": self.orphanage.id, "requirement": self.requirement.id, "item_name": "Rice",
+             "quantity": quantity},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data["id"]
+
+    def set_status(self, donation_id, status):
+        self.client.force_authenticate(self.orphanage_user)
+        response = self.client.patch(
+            reverse("donation-status-update", args=[donation_id]), {"status": status}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_tracks_donation_lifecycle_and_fulfilment(self):
+        first = self.donate(6)
+        second = self.donate(4)
+        self.set_status(first, "accepted")
+        self.set_status(first, "completed")
+        self.set_status(second, "completed")
+        OrphanageRequirement.objects.create(orphanage=self.orphanage, item_name="Pens", category="stationary",
+                                            quantity_needed=5)
+
+        data = self.summary()
+        self.assertEqual(data["donations"]["completed"], 2)
+        self.assertEqual(data["donations"]["total"], 2)
+        self.assertEqual(data["units_received"], 10)
+        self.assertEqual(data["requirements"]["by_category"]["food"], {"open": 0, "fulfilled": 1})
+        self.assertEqual(data["requirements"]["by_category"]["stationary"], {"open": 1, "fulfilled": 0})
+
+        # un-completing drops the requirement back to open
+        self.set_status(second, "cancelled")
+        data = self.summary()
+        self.assertEqual((data["donations"]["completed"], data["donations"]["cancelled"]), (1, 1))
+        self.assertEqual(data["units_received"], 6)
+        self.assertEqual(data["requirements"]["by_category"]["food"], {"open": 1, "fulfilled": 0})
+        self.assertEqual(reconcile(fix=False), [])
+
+    def test_deletes_and_bulk_import_stay_in_step(self):
+        Donation.objects.get(pk=self.donate(3)).delete()
+        self.requirement.delete()
+        self.client.force_authenticate(self.orphanage_user)
+        self.client.post(
+            reverse("requirement-bulk"),
+            [{"item_name": f"Item {i}", "category": "medical", "quantity_needed": 1} for i in range(5)],
+            format="json",
+        )
+
+        data = self.summary()
+        self.assertEqual(data["donations"]["total"], 0)
+        self.assertEqual(data["requirements"]["by_category"]["food"], {"open": 0, "fulfilled": 0})
+        self.assertEqual(data["requirements"]["by_category"]["medical"], {"open": 5, "fulfilled": 0})
+        self.assertEqual(reconcile(fix=False), [])
+
+    def test_endpoint_cost_is_constant(self):
+        Donation.objects.bulk_create(
+            Donation(donor=self.donor, orphanage=self.orphanage, item_name="x", status="completed")
+            for _ in range(500)
+        )
+        reconcile()
+        self.client.force_authenticate(self.orphanage_user)
+        # profile id, donation summary row, category rows
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("dashboard-summary"))
+        self.assertEqual(response.data["donations"]["completed"], 500)
+
+    def test_reconcile_reports_and_fixes_drift(self):
+        self.donate(2)
+        OrphanageDonationSummary.objects.filter(orphanage=self.orphanage).update(pending=7)
+        RequirementCategorySummary.objects.all().delete()
+
+        out = StringIO()
+        call_command("reconcile_dashboard", "--dry-run", stdout=out)
+        self.assertIn("2 values drifted", out.getvalue())
+        self.assertEqual(len(reconcile(fix=False)), 2)
+
+        call_command("reconcile_dashboard", stdout=StringIO())
+        self.assertEqual(reconcile(fix=False), [])
+        self.assertEqual(self.summary()["donations"]["pending"], 1)
+
+    def test_orphanage_delete_cascades_cleanly(self):
+        self.donate(2)
+        self.orphanage.user.delete()
+        self.assertFalse(OrphanageDonationSummary.objects.exists())
+        self.assertFalse(RequirementCategorySummary.objects.exists())
@@ -0,0 +1,23 @@
+from django.http import Http404
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from auth_app.authentication import get_profile_id
+from orphanage.models import OrphanageProfile
+from .summary import get_summary
+
+
+class DashboardSummaryView(APIView):
+    """
+    Donation and requirement counts for the signed-in orphanage, read from
+    the precomputed summary tables (constant cost, however many rows).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            orphanage_id = get_profile_id(request, OrphanageProfile)
+        except OrphanageProfile.DoesNotExist:
+            raise Http404
+        return Response(get_summary(orphanage_id))
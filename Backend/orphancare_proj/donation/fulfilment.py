@@ -0,0 +1,96 @@
+# donation/fulfilment.py
+"""
+Keeps OrphanageRequirement.quantity_received / is_fulfilled in step with
+donation status.
+
+A donation counts towards its requirement only while it is "completed".
+Every status (or quantity / requirement) change is turned into per-requirement
+deltas that are applied with a single F-expression UPDATE, so concurrent
+donations against the same requirement never lose an increment and only the
+requirement row is locked.
+"""
+from collections import Counter
+
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from dashboard.summary import apply_requirement_change
+from requirement.models import OrphanageRequirement
+from requirement.cache import invalidate_requirement_feeds
+from .models import Donation
+
+COUNTED_STATUSES = ("completed",)
+
+
+def contribution(status, requirement_id, quantity):
+    """
+    What one donation adds to requirement totals in a given state.
+    """
+    if status in COUNTED_STATUSES and requirement_id:
+        return Counter({requirement_id: quantity})
+    return Counter()
+
+
+def snapshot(donation):
+    return (donation.status, donation.requirement_id, donation.quantity)
+
+
+def apply_requirement_delta(requirement_id, delta):
+    """
+    Atomically move quantity_received by `delta` and recompute is_fulfilled
+    in the same statement (SET expressions see the pre-update row). Returns
+    the id of the orphanage that owns the requirement (None if it's gone).
+    """
+    if not delta:
+        return None
+    requirement = OrphanageRequirement.objects.filter(pk=requirement_id)
+    # is_fulfilled may flip below; the dashboard needs to know which way
+    before = requirement.select_for_update().values_list("orphanage_id", "category", "is_fulfilled").first()
+    if before is None:
+        return None
+    if delta > 0:
+        requirement.update(
+            quantity_received=F("quantity_received") + delta,
+            is_fulfilled=Q(quantity_received__gte=F("quantity_needed") - delta),
+            updated_at=timezone.now(),
+        )
+    else:
+        requirement.update(
+            quantity_received=Greatest(F("quantity_received") + delta, 0),
+            is_fulfilled=Q(quantity_received__gte=F("quantity_needed") - delta),
+            updated_at=timezone.now(),
+        )
+
+    is_fulfilled = requirement.values_list("is_fulfilled", flat=True).first()
+    if is_fulfilled != before[2]:
+        apply_requirement_change(before, (*before[:2], is_fulfilled))
+    return before[0]
+
+
+def lock_donation(pk):
+    """
+    Take the donation's row write lock before reading it.
+
+    A no-op UPDATE row-locks on PostgreSQL and takes the write lock on SQLite
+    (where SELECT ... FOR UPDATE doesn't exist), so the read that follows sees
+    the latest committed state and no other status update can interleave
+    until this transaction commits. Must be called inside transaction.atomic().
+    """
+    Donation.objects.filter(pk=pk).update(status=F("status"))
+    return Donation.objects.get(pk=pk)
+
+
+def apply_fulfilment(previous, current):
+    """
+    Apply the difference between two donation snapshots (see `snapshot`).
+    Must run in the same transaction as the donation update.
+    """
+    deltas = contribution(*current)
+    deltas.subtract(contribution(*previous))
+
+    owners = {apply_requirement_delta(requirement_id, delta) for requirement_id, delta in deltas.items() if delta}
+    # F-expression updates don't fire model signals; invalidate the feeds of
+    # whichever orphanages own the requirements that moved
+    for orphanage_id in owners - {None}:
+        invalidate_requirement_feeds(orphanage_id)
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation', '0001_initial'),
+        ('requirement', '0002_alter_orphanagerequirement_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donation',
+            name='requirement',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='donations', to='requirement.orphanagerequirement'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation', '0002_donation_requirement'),
+        ('donor', '0001_initial'),
+        ('orphanage', '0002_orphanageprofile_established_on'),
+        ('requirement', '0002_alter_orphanagerequirement_category'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['donor', '-donation_date', 'id'], name='donation_donor_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['orphanage', '-donation_date', 'id'], name='donation_orph_date_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation', '0004_donation_proof_renditions'),
+        ('donor', '0002_donorprofile_latitude_donorprofile_longitude'),
+        ('orphanage', '0004_orphanageprofile_banner_renditions'),
+        ('requirement', '0003_orphanagerequirement_req_open_posted_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donation',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['donation_date'], name='donation_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['updated_at'], name='donation_updated_idx'),
+        ),
+    ]
@@ -31,10 +31,23 @@ class Donation(models.Model):
     description = models.TextField(blank=True, null=True)
     quantity = models.PositiveIntegerField(default=1)
     donation_date = models.DateTimeField(auto_now_add=True)
+    # Bumped by every write, including queryset.update() paths (see stats.rollups)
+    updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
 
     # Proof or note
     proof_image = models.ImageField(upload_to="donation_proofs/", blank=True, null=True)
+    # Resized copies of proof_image, written by the process_images worker
+    proof_renditions = models.JSONField(default=dict, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["donor", "-donation_date", "id"], name="donation_donor_date_idx"),
+            models.Index(fields=["orphanage", "-donation_date", "id"], name="donation_orph_date_idx"),
+            # stats rollups: month buckets and changed-since-watermark scans
+            models.Index(fields=["donation_date"], name="donation_date_idx"),
+            models.Index(fields=["updated_at"], name="donation_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.item_name} by {self.donor.user.email} to {self.orphanage.orphanage_name}"
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from imaging.fields import RenditionsField
+from orphancare_proj.instrumentation import TimedSerializerMixin
 from .models import Donation
 
 class DonationSerializer(serializers.ModelSerializer):
@@ -15,7 +17,7 @@ class DonationSerializer(serializers.ModelSerializer):
         read_only_fields = ["donor","donation_date"]
 
 
-class DonationSerializer(serializers.ModelSerializer):
+class DonationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     donor_name = serializers.CharField(source="donor.full_name", read_only=True)
     orphanage_name = serializers.CharField(source="orphanage.orphanage_name", read_only=True)
     donor_phone = serializers.CharField(source = "donor.contact_number", read_only=True)
@@ -23,6 +25,7 @@ class DonationSerializer(serializers.ModelSerializer):
     requirement_item = serializers.CharField(
         source="requirement.item_name", read_only=True
     )
+    proof_renditions = RenditionsField()
 
     class Meta:
         model = Donation
@@ -42,5 +45,16 @@ class DonationSerializer(serializers.ModelSerializer):
             "status",
             "donation_date",
             "proof_image",
+            "proof_renditions",
         ]
         read_only_fields = ["donation_date", "donor"]
+
+
+class DonationStatusSerializer(DonationSerializer):
+    """
+    For DonationStatusUpdateView: the receiving orphanage moves the status
+    (and may correct the quantity), but the orphanage and requirement a
+    donation counts towards are fixed once it's created.
+    """
+    class Meta(DonationSerializer.Meta):
+        read_only_fields = DonationSerializer.Meta.read_only_fields + ["orphanage", "requirement"]
@@ -1,3 +1,405 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.db import OperationalError, connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orphancare_proj.testing import QueryPlanMixin, make_donor, make_orphanage
+from requirement.models import OrphanageRequirement
+from . import export
+from .fulfilment import apply_fulfilment
+from .models import Donation
+
+
+class DonationListQueryCountTests(TestCase):
+    """
+    Pins the number of queries per list endpoint so an N+1 can't sneak back in.
+    """
+    ROW_COUNTS = (10, 100, 1000)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.donor_user, self.donor = make_donor()
+        self.orphanage_user, self.orphanage = make_orphanage()
+
+    def seed(self, rows):
+        Donation.objects.all().delete()
+        OrphanageRequirement.objects.all().delete()
+        requirements = OrphanageRequirement.objects.bulk_create(
+            OrphanageRequirement(orphanage=self.orphanage, item_name=f"Item {i}", quantity_needed=10)
+            for i in range(rows)
+        )
+        Donation.objects.bulk_create(
+            Donation(
+                donor=self.donor,
+                orphanage=self.orphanage,
+                requirement=requirement,
+                item_name=requirement.item_name,
+            )
+            for requirement in requirements
+        )
+
+    def assert_list_queries(self, user, url_name, expected):
+        self.client.force_authenticate(user)
+        for rows in self.ROW_COUNTS:
+            with self.subTest(rows=rows):
+                self.seed(rows)
+                with self.assertNumQueries(expected):
+                    response = self.client.get(reverse(url_name))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data["results"]), min(rows, settings.API_PAGE_SIZE))
+
+    def test_donor_donation_list(self):
+        # profile lookup + donations joined with donor, orphanage, requirement
+        self.assert_list_queries(self.donor_user, "donor-donations", 2)
+
+    def test_orphanage_donation_list(self):
+        self.assert_list_queries(self.orphanage_user, "orphanage-donations", 2)
+
+    def test_related_fields_are_serialized(self):
+        self.seed(1)
+        self.client.force_authenticate(self.orphanage_user)
+        row = self.client.get(reverse("orphanage-donations")).data["results"][0]
+        self.assertEqual(row["donor_name"], "Donor")
+        self.assertEqual(row["donor_email"], "donor@example.com")
+        self.assertEqual(row["orphanage_name"], "Home")
+        self.assertEqual(row["requirement_item"], "Item 0")
+
+
+class DonationQueryPlanTests(QueryPlanMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.donor_user, self.donor = make_donor()
+        self.orphanage_user, self.orphanage = make_orphanage()
+        Donation.objects.bulk_create(
+            Donation(donor=self.donor, orphanage=self.orphanage, item_name=f"Item {i}")
+            for i in range(30)
+        )
+
+    def test_donor_donation_list_uses_index(self):
+        self.client.force_authenticate(self.donor_user)
+        response = self.assert_endpoint_is_indexed(self.client, reverse("donor-donations"), page_size=5)
+        self.assert_endpoint_is_indexed(self.client, response.data["next"])
+
+    def test_orphanage_donation_list_uses_index(self):
+        self.client.force_authenticate(self.orphanage_user)
+        response = self.assert_endpoint_is_indexed(self.client, reverse("orphanage-donations"), page_size=5)
+        self.assert_endpoint_is_indexed(self.client, response.data["next"])
+
+
+class RequirementFulfilmentTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.donor_user, self.donor = make_donor()
+        self.orphanage_user, self.orphanage = make_orphanage()
+        self.requirement = OrphanageRequirement.objects.create(
+            orphanage=self.orphanage, item_name="Rice", quantity_needed=10
+        )
+        self.client.force_authenticate(self.orphanage_user)
+
+    def donate(self, quantity, status="pending"):
+        return Donation.objects.create(
+            donor=self.donor,
+            orphanage=self.orphanage,
+            requirement=self.requirement,
+            item_name="Rice",
+            quantity=quantity,
+            status=status,
+        )
+
+    def set_status(self, donation, status):
+        response = self.client.patch(
+            reverse("donation-status-update", args=[donation.id]), {"status": status}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.requirement.refresh_from_db()
+
+    def test_completed_donation_increments_received(self):
+        donation = self.donate(4)
+        self.set_status(donation, "accepted")
+        self.assertEqual(self.requirement.quantity_received, 0)
+
+        self.set_status(donation, "completed")
+        self.assertEqual(self.requirement.quantity_received, 4)
+        self.assertFalse(self.requirement.is_fulfilled)
+
+    def test_reaching_quantity_needed_fulfils(self):
+        self.set_status(self.donate(6), "completed")
+        self.set_status(self.donate(4), "completed")
+        self.assertEqual(self.requirement.quantity_received, 10)
+        self.assertTrue(self.requirement.is_fulfilled)
+
+    def test_repeating_completed_counts_once(self):
+        donation = self.donate(3)
+        self.set_status(donation, "completed")
+        self.set_status(donation, "completed")
+        self.assertEqual(self.requirement.quantity_received, 3)
+
+    def test_cancelling_completed_donation_reverses(self):
+        donation = self.donate(10)
+        self.set_status(donation, "completed")
+        self.assertTrue(self.requirement.is_fulfilled)
+
+        self.set_status(donation, "cancelled")
+        self.assertEqual(self.requirement.quantity_received, 0)
+        self.assertFalse(self.requirement.is_fulfilled)
+
+    def test_quantity_change_on_completed_donation_is_applied(self):
+        donation = self.donate(3)
+        self.set_status(donation, "completed")
+        response = self.client.patch(
+            reverse("donation-status-update", args=[donation.id]), {"quantity": 8}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.requirement.refresh_from_db()
+        self.assertEqual(self.requirement.quantity_received, 8)
+
+    def test_only_the_receiving_orphanage_updates_a_donation(self):
+        donation = self.donate(10)
+        other_user, other = make_orphanage("other@example.com", "Other")
+        elsewhere = OrphanageRequirement.objects.create(orphanage=other, item_name="Pens", quantity_needed=5)
+        url = reverse("donation-status-update", args=[donation.id])
+        attack = {"status": "completed", "quantity": 500, "requirement": elsewhere.id, "orphanage": other.id}
+
+        self.client.force_authenticate(other_user)
+        self.assertEqual(self.client.patch(url, attack, format="json").status_code, 404)
+        self.client.force_authenticate(self.donor_user)
+        self.assertEqual(self.client.patch(url, attack, format="json").status_code, 403)
+
+        # the owner can complete it, but not move it to another requirement or orphanage
+        self.client.force_authenticate(self.orphanage_user)
+        response = self.client.patch(url, {**attack, "quantity": 10}, format="json")
+        self.assertEqual(response.status_code, 200)
+        donation.refresh_from_db()
+        self.assertEqual((donation.orphanage_id, donation.requirement_id), (self.orphanage.id, self.requirement.id))
+        elsewhere.refresh_from_db()
+        self.requirement.refresh_from_db()
+        self.assertEqual((elsewhere.quantity_received, elsewhere.is_fulfilled), (0, False))
+        self.assertEqual((self.requirement.quantity_received, self.requirement.is_fulfilled), (10, True))
+
+    def test_invalidates_the_feed_of_the_requirement_owner(self):
+        _, other = make_orphanage("other@example.com", "Other")
+        elsewhere = OrphanageRequirement.objects.create(orphanage=other, item_name="Pens", quantity_needed=5)
+        with mock.patch("donation.fulfilment.invalidate_requirement_feeds") as invalidate:
+            apply_fulfilment(("pending", elsewhere.id, 2), ("completed", elsewhere.id, 2))
+        invalidate.assert_called_once_with(other.id)
+
+    def test_fulfilment_invalidates_public_feed(self):
+        feed = reverse("requirement-public")
+        self.client.get(feed)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.set_status(self.donate(10), "completed")
+        self.assertEqual(self.client.get(feed).data["results"], [])
+
+
+class RequirementFulfilmentStressTests(TransactionTestCase):
+    """
+    Hammers DonationStatusUpdateView from many threads at once. Each thread
+    has its own DB connection; SQLite lock errors are retried like a client
+    would, and the final totals must match a serial replay exactly.
+    """
+    THREADS = 16
+
+    def setUp(self):
+        self.donor_user, self.donor = make_donor()
+        self.orphanage_user, self.orphanage = make_orphanage()
+        self.requirement = OrphanageRequirement.objects.create(
+            orphanage=self.orphanage, item_name="Rice", quantity_needed=50
+        )
+        self.donations = Donation.objects.bulk_create(
+            Donation(
+                donor=self.donor,
+                orphanage=self.orphanage,
+                requirement=self.requirement,
+                item_name="Rice",
+                quantity=i % 3 + 1,
+            )
+            for i in range(40)
+        )
+
+    def run_concurrently(self, jobs):
+        errors = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def worker(chunk):
+            client = APIClient()
+            client.force_authenticate(self.orphanage_user)
+            try:
+                barrier.wait()
+                for donation_id, status in chunk:
+                    url = reverse("donation-status-update", args=[donation_id])
+                    for attempt in range(200):
+                        try:
+                            response = client.patch(url, {"status": status}, format="json")
+                            break
+                        except OperationalError:
+                            time.sleep(0.005 * (attempt % 10 + 1))
+                    else:
+                        raise AssertionError("update kept failing with lock errors")
+                    if response.status_code != 200:
+                        errors.append(response.status_code)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        chunks = [jobs[i::self.THREADS] for i in range(self.THREADS)]
+        threads = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_concurrent_completions_and_reversals(self):
+        # every donation completed twice (duplicates must count once) ...
+        jobs = [(d.id, "completed") for d in self.donations] * 2
+        self.run_concurrently(jobs)
+
+        self.requirement.refresh_from_db()
+        total = sum(d.quantity for d in self.donations)
+        self.assertEqual(self.requirement.quantity_received, total)
+        self.assertTrue(self.requirement.is_fulfilled)
+
+        # ... then half of them cancelled concurrently
+        cancelled = self.donations[::2]
+        self.run_concurrently([(d.id, "cancelled") for d in cancelled] * 2)
+
+        self.requirement.refresh_from_db()
+        remaining = total - sum(d.quantity for d in cancelled)
+        self.assertEqual(self.requirement.quantity_received, remaining)
+        self.assertEqual(self.requirement.is_fulfilled, remaining >= 50)
+
+
+class DonationExportTests(QueryPlanMixin, TestCase):
+    def setUp(self):
+        cache.clear()  # throttle history
+        self.donor_user, self.donor = make_donor()
+        self.home_user, self.home = make_orphanage()
+        _, self.other_home = make_orphanage("other@example.com", "Other")
+        self.requirement = OrphanageRequirement.objects.create(
+            orphanage=self.home, item_name="Rice", quantity_needed=10
+        )
+        self.first = Donation.objects.create(
+            donor=self.donor, orphanage=self.home, requirement=self.requirement,
+            item_name="Rice", quantity=2, status="completed", description="=HYPERLINK(\"x\")",
+        )
+        self.second = Donation.objects.create(donor=self.donor, orphanage=self.other_home, item_name="Books")
+        Donation.objects.filter(pk=self.first.pk).update(donation_date=timezone.make_aware(datetime(2024, 1, 15, 12)))
+        Donation.objects.filter(pk=self.second.pk).update(donation_date=timezone.make_aware(datetime(2024, 3, 1, 12)))
+        self.client = APIClient()
+
+    def export(self, user, name, **params):
+        self.client.force_authenticate(user)
+        return self.client.get(reverse(name), params)
+
+    def test_orphanage_csv_lists_only_received_donations(self):
+        response = self.export(self.home_user, "orphanage-donations-export")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="donations-received.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([int(row["id"]) for row in rows], [self.first.pk])
+        self.assertEqual(rows[0]["orphanage_name"], "Home")
+        self.assertEqual(rows[0]["requirement_category"], "others")
+        # spreadsheet formula neutralised
+        self.assertEqual(rows[0]["description"], "'=HYPERLINK(\"x\")")
+
+    def test_donor_ndjson_with_date_and_status_filters(self):
+        response = self.export(self.donor_user, "donor-donations-export", format="ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.first.pk, self.second.pk])
+        self.assertIsNone(rows[1]["requirement_category"])
+
+        response = self.export(self.donor_user, "donor-donations-export", format="ndjson", **{"from": "2024-02-01"})
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 1)
+        response = self.export(self.donor_user, "donor-donations-export", format="ndjson", to="2024-01-15")
+        self.assertEqual(json.loads(b"".join(response.streaming_content))["id"], self.first.pk)
+        response = self.export(self.donor_user, "donor-donations-export", format="ndjson", status="pending,accepted")
+        self.assertEqual(json.loads(b"".join(response.streaming_content))["id"], self.second.pk)
+
+    def test_invalid_filters_are_rejected_as_json(self):
+        for params in ({"from": "15/01/2024"}, {"from": "2024-02-30"}, {"from": "2024-02-01", "to": "2024-01-01"},
+                       {"status": "lost"}, {"format": "xlsx"}):
+            response = self.export(self.donor_user, "donor-donations-export", **params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_roles_are_isolated(self):
+        self.assertEqual(self.export(self.donor_user, "orphanage-donations-export").status_code, 403)
+        self.assertEqual(self.export(self.home_user, "donor-donations-export").status_code, 403)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(reverse("donor-donations-export")).status_code, 401)
+
+    def test_export_reads_the_date_index_without_sorting(self):
+        for params in ({}, {"status": "completed"}, {"from": "2024-01-01", "to": "2024-12-31"}):
+            for queryset in (Donation.objects.filter(donor=self.donor), Donation.objects.filter(orphanage=self.home)):
+                self.assert_queryset_is_indexed(export.filter_donations(queryset, params))
+
+    @override_settings(DONATION_EXPORT_CHUNK_SIZE=10)
+    def test_queries_do_not_grow_with_rows(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.export(self.donor_user, "donor-donations-export")
+                lines = b"".join(response.streaming_content).count(b"\n")
+            return lines, len(queries)
+
+        lines, before = count_queries()
+        Donation.objects.bulk_create(
+            Donation(donor=self.donor, orphanage=self.home, requirement=self.requirement, item_name="Rice")
+            for _ in range(50)
+        )
+        self.assertEqual(count_queries(), (lines + 50, before))
+
+
+@override_settings(DONATION_EXPORT_CHUNK_SIZE=100)
+class DonationExportMemoryTests(TestCase):
+    """
+    Peak Python memory while streaming N rows stays close to that for N/10
+    (both many chunks long). Set EXPORT_MEMORY_TEST_ROWS=1000000 for the
+    full-size check; tracemalloc makes it slow.
+    """
+    rows = int(os.environ.get("EXPORT_MEMORY_TEST_ROWS", 5000))
+
+    @classmethod
+    def setUpTestData(cls):
+        _, cls.donor = make_donor()
+        _, home = make_orphanage()
+        requirement = OrphanageRequirement.objects.create(orphanage=home, item_name="Rice", quantity_needed=10)
+        Donation.objects.bulk_create(
+            (Donation(donor=cls.donor, orphanage=home, requirement=requirement, item_name="Rice", quantity=1)
+             for _ in range(cls.rows)),
+            batch_size=5000,
+        )
+
+    def peak(self, rows, export_format):
+        queryset = export.filter_donations(Donation.objects.filter(donor=self.donor), {})[:rows]
+        tracemalloc.start()
+        try:
+            size = sum(len(chunk) for chunk in export.stream(queryset, export_format, "x").streaming_content)
+            return size, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_memory_is_flat(self):
+        for export_format in export.FORMATS:
+            small_size, small_peak = self.peak(self.rows // 10, export_format)
+            size, peak = self.peak(self.rows, export_format)
+            self.assertGreater(size, 9 * small_size)
+            # a buffered export would need ~10x; allow for allocator noise
+            self.assertLess(peak, 2 * small_peak + 1024 * 1024, export_format)
@@ -4,11 +4,15 @@ from .views import (
     DonorDonationListView,
     OrphanageDonationListView,
     DonationStatusUpdateView,
+    DonorDonationExportView,
+    OrphanageDonationExportView,
 )
 
 urlpatterns = [
     path("create/", DonationCreateView.as_view(), name="donation-create"),
     path("my-donations/", DonorDonationListView.as_view(), name="donor-donations"),
     path("received/", OrphanageDonationListView.as_view(), name="orphanage-donations"),
+    path("my-donations/export/", DonorDonationExportView.as_view(), name="donor-donations-export"),
+    path("received/export/", OrphanageDonationExportView.as_view(), name="orphanage-donations-export"),
     path("<int:pk>/update-status/", DonationStatusUpdateView.as_view(), name="donation-status-update"),
 ]
@@ -1,6 +1,5 @@
 # donation/utils.py
-from django.core.mail import send_mail
-from django.conf import settings
+from outbox.utils import enqueue_email
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,7 +14,7 @@ def safe_get(obj, attr, default="N/A"):
 
 def send_donation_accepted_email(donation):
     """
-    Sends confirmation email to donor when donation is accepted.
+    Queues confirmation email to donor when donation is accepted.
     Never raises.
     """
 
@@ -62,12 +61,6 @@ OrphanCare Network
 """
 
     try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[donor_email],
-            fail_silently=False,
-        )
+        enqueue_email(donor_email, subject, message)
     except Exception as e:
         logger.error("Donation accepted email failed: %s", str(e))
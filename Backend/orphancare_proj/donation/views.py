@@ -1,11 +1,18 @@
 from rest_framework import generics, permissions
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.views import APIView
+from django.db import transaction
 from .models import Donation
-from .serializers import DonationSerializer
+from . import export
+from .serializers import DonationSerializer, DonationStatusSerializer
 from donor.models import DonorProfile
 from orphanage.models import OrphanageProfile
 import logging
+from orphancare_proj.pagination import DonationPagination
+from auth_app.authentication import get_profile_id
 from auth_app.utils import send_donation_created_email
 from donation.utils import send_donation_accepted_email
+from donation.fulfilment import lock_donation, snapshot, apply_fulfilment
 import logging
 
 # ------------------ DONOR VIEWS ------------------
@@ -18,32 +25,36 @@ class DonationCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
-        donor_profile = DonorProfile.objects.get(user=self.request.user)
+        # by primary key; the email below needs the donor's name
+        donor_profile = DonorProfile.objects.get(pk=get_profile_id(self.request, DonorProfile))
 
         orphanage_id = self.request.data.get("orphanage")
         orphanage = OrphanageProfile.objects.get(id=orphanage_id)
 
         requirement = serializer.validated_data.get("requirement")
+        if requirement and requirement.orphanage_id != orphanage.id:
+            raise ValidationError({"requirement": "Requirement does not belong to this orphanage."})
 
-        donation = serializer.save(
-            donor=donor_profile,
-            orphanage=orphanage,
-            item_name=(
-                requirement.item_name
-                if requirement
-                else serializer.validated_data.get("item_name")
-            ),
-        )
-
-        # 🔔 Best-effort email (never breaks API)
-        try:
-            send_donation_created_email(
-                orphanage=orphanage,
+        with transaction.atomic():
+            donation = serializer.save(
                 donor=donor_profile,
-                donation=donation,
+                orphanage=orphanage,
+                item_name=(
+                    requirement.item_name
+                    if requirement
+                    else serializer.validated_data.get("item_name")
+                ),
             )
-        except Exception as e:
-            logger.error("Unexpected error while sending donation email: %s", str(e))
+
+            # 🔔 Best-effort email, queued in the outbox (never breaks API)
+            try:
+                send_donation_created_email(
+                    orphanage=orphanage,
+                    donor=donor_profile,
+                    donation=donation,
+                )
+            except Exception as e:
+                logger.error("Unexpected error while queueing donation email: %s", str(e))
 
 
 # class DonationCreateView(generics.CreateAPIView):
@@ -69,10 +80,14 @@ class DonationCreateView(generics.CreateAPIView):
 class DonorDonationListView(generics.ListAPIView):
     serializer_class = DonationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = DonationPagination
 
     def get_queryset(self):
-        donor_profile = DonorProfile.objects.get(user=self.request.user)
-        return Donation.objects.filter(donor=donor_profile).order_by("-donation_date")
+        return (
+            Donation.objects.filter(donor_id=get_profile_id(self.request, DonorProfile))
+            .select_related("donor", "orphanage", "requirement")
+            .order_by("-donation_date")
+        )
 
 
 # ------------------ ORPHANAGE VIEWS ------------------
@@ -80,32 +95,93 @@ class DonorDonationListView(generics.ListAPIView):
 class OrphanageDonationListView(generics.ListAPIView):
     serializer_class = DonationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = DonationPagination
 
     def get_queryset(self):
-        orphanage_profile = OrphanageProfile.objects.get(user=self.request.user)
-        return Donation.objects.filter(orphanage=orphanage_profile).order_by("-donation_date")
+        return (
+            Donation.objects.filter(orphanage_id=get_profile_id(self.request, OrphanageProfile))
+            .select_related("donor", "orphanage", "requirement")
+            .order_by("-donation_date")
+        )
 
 
 logger = logging.getLogger(__name__)
 
 
 class DonationStatusUpdateView(generics.UpdateAPIView):
-    serializer_class = DonationSerializer
+    serializer_class = DonationStatusSerializer
     permission_classes = [permissions.IsAuthenticated]
-    queryset = Donation.objects.all()
+
+    def get_queryset(self):
+        # only the receiving orphanage moves a donation (and its requirement totals)
+        try:
+            return Donation.objects.filter(orphanage_id=get_profile_id(self.request, OrphanageProfile))
+        except OrphanageProfile.DoesNotExist:
+            raise PermissionDenied("Only the receiving orphanage can update a donation.")
 
     def perform_update(self, serializer):
-        donation = self.get_object()
-        previous_status = donation.status
+        with transaction.atomic():
+            # Re-read under the row lock so concurrent status updates are
+            # applied one after another, each against the state it replaced.
+            donation = lock_donation(serializer.instance.pk)
+            previous_status = donation.status
+            previous = snapshot(donation)
+
+            serializer.instance = donation
+            updated_donation = serializer.save()
+            apply_fulfilment(previous, snapshot(updated_donation))
+
+            # 🔔 Queue mail ONLY when accepted
+            if previous_status != "accepted" and updated_donation.status == "accepted":
+                try:
+                    send_donation_accepted_email(updated_donation)
+                except Exception as e:
+                    logger.error(
+                        "Unexpected error while queueing donation accepted email: %s",
+                        str(e),
+                    )
+
+
+# ------------------ EXPORTS ------------------
+
+class DonationExportView(APIView):
+    """
+    Streams the caller's donation history as CSV or NDJSON (see donation/export.py).
+    Subclasses implement `get_queryset()`.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "export"
+    export_name = None
+
+    def perform_content_negotiation(self, request, force=False):
+        # ?format= picks the export format, not a DRF renderer; errors stay JSON
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request):
+        export_format = export.get_format(request.query_params)
+        queryset = export.filter_donations(self.get_queryset(), request.query_params)
+        filename = "-".join(
+            part for part in ("donations", self.export_name, request.query_params.get("from"),
+                              request.query_params.get("to")) if part
+        )
+        return export.stream(queryset, export_format, filename)
 
-        updated_donation = serializer.save()
 
-        # 🔔 Send mail ONLY when accepted
-        if previous_status != "accepted" and updated_donation.status == "accepted":
-            try:
-                send_donation_accepted_email(updated_donation)
-            except Exception as e:
-                logger.error(
-                    "Unexpected error while sending donation accepted email: %s",
-                    str(e),
-                )
\ No newline at end of file
+class OrphanageDonationExportView(DonationExportView):
+    export_name = "received"
+
+    def get_queryset(self):
+        try:
+            return Donation.objects.filter(orphanage_id=get_profile_id(self.request, OrphanageProfile))
+        except OrphanageProfile.DoesNotExist:
+            raise PermissionDenied("Only orphanages can export received donations.")
+
+
+class DonorDonationExportView(DonationExportView):
+    export_name = "given"
+
+    def get_queryset(self):
+        try:
+            return Donation.objects.filter(donor_id=get_profile_id(self.request, DonorProfile))
+        except DonorProfile.DoesNotExist:
+            raise PermissionDenied("Only donors can export their donations.")
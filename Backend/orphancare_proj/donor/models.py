@@ -18,5 +18,9 @@ class DonorProfile(models.Model):
     organization_name = models.CharField(max_length=150, blank=True, null=True)
     is_verified = models.BooleanField(default=False)
 
+    # Resolved from pincode on save (geo.signals)
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
+
     def __str__(self):
         return f"{self.full_name} - {self.id}"
@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from orphancare_proj.instrumentation import TimedSerializerMixin
 from .models import DonorProfile
 
-class DonorProfileSerializer(serializers.ModelSerializer):
+class DonorProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = DonorProfile
         fields = [
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import Pincode
+
+
+@admin.register(Pincode)
+class PincodeAdmin(admin.ModelAdmin):
+    list_display = ("pincode", "district", "state", "latitude", "longitude")
+    search_fields = ("pincode", "district", "state")
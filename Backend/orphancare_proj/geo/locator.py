@@ -0,0 +1,120 @@
+# geo/locator.py
+"""
+Pincode geocoding and "near me" lookups.
+
+Coordinates are resolved from the Pincode table (operator imports via
+`load_pincodes`), then from the bundled pincode centroids (geo/data/
+pincodes.csv.gz, see geo/data/README.md), and only for pincodes missing from
+both from the regional table keyed on the first two digits (coarse, tens of
+km). Nearby search prefilters with a latitude/longitude bounding box that
+the (latitude, longitude) profile index can answer, then ranks the few
+candidates by haversine distance in Python.
+"""
+import csv
+import gzip
+import math
+from functools import lru_cache
+from pathlib import Path
+
+from .models import Pincode
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.32
+DATA_DIR = Path(__file__).resolve().parent / "data"
+PINCODES_CSV = DATA_DIR / "pincodes.csv.gz"
+REGIONS_CSV = DATA_DIR / "pincode_regions.csv"
+
+
+def normalize_pincode(pincode):
+    digits = "".join(ch for ch in str(pincode or "") if ch.isdigit())
+    return digits if len(digits) == 6 else None
+
+
+@lru_cache(maxsize=1)
+def pincode_table():
+    with gzip.open(PINCODES_CSV, "rt", newline="", encoding="utf-8") as fh:
+        return {
+            row["pincode"]: (float(row["latitude"]), float(row["longitude"]))
+            for row in csv.DictReader(fh)
+        }
+
+
+@lru_cache(maxsize=1)
+def region_table():
+    with open(REGIONS_CSV, newline="", encoding="utf-8") as fh:
+        return {
+            row["prefix"]: (float(row["latitude"]), float(row["longitude"]))
+            for row in csv.DictReader(fh)
+        }
+
+
+def resolve(pincode):
+    """
+    (latitude, longitude) for a pincode, or None if it can't be placed.
+    """
+    pincode = normalize_pincode(pincode)
+    if not pincode:
+        return None
+    exact = Pincode.objects.filter(pk=pincode).values_list("latitude", "longitude").first()
+    if exact:
+        return exact
+    return pincode_table().get(pincode) or region_table().get(pincode[:2])
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    (min_lat, max_lat, min_lon, max_lon) enclosing a circle of radius_km.
+    """
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    # longitude degrees shrink towards the poles; clamp to avoid /0
+    dlon = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 0.01))
+    return latitude - dlat, latitude + dlat, longitude - dlon, longitude + dlon
+
+
+def nearest(queryset, latitude, longitude, radius_km, limit):
+    """
+    [(distance_km, pk)] for rows of `queryset` (a model with latitude and
+    longitude fields) within radius_km, closest first.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    candidates = queryset.filter(
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lon, max_lon),
+    ).values_list("pk", "latitude", "longitude")
+
+    ranked = []
+    for pk, lat, lon in candidates.iterator(chunk_size=2000):
+        distance = haversine_km(latitude, longitude, lat, lon)
+        if distance <= radius_km:
+            ranked.append((distance, pk))
+    ranked.sort()
+    return ranked[:limit]
+
+
+def geocode_all(model, batch_size=2000):
+    """
+    Recompute stored coordinates for every row of a profile model.
+    Returns the number of rows that could be placed.
+    """
+    placed = 0
+    batch = []
+    for profile in model.objects.only("pk", "pincode", "latitude", "longitude").iterator(chunk_size=batch_size):
+        coordinates = resolve(profile.pincode)
+        profile.latitude, profile.longitude = coordinates or (None, None)
+        placed += coordinates is not None
+        batch.append(profile)
+        if len(batch) >= batch_size:
+            model.objects.bulk_update(batch, ["latitude", "longitude"])
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, ["latitude", "longitude"])
+    return placed
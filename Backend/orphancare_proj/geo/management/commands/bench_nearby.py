@@ -0,0 +1,87 @@
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from auth_app.models import User
+from orphanage.models import OrphanageProfile
+from geo.locator import nearest, haversine_km
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark nearby-orphanage lookups (bounding-box index + haversine) against a "
+        "full-table haversine scan. Runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orphanages", type=int, default=100_000)
+        parser.add_argument("--queries", type=int, default=50)
+        parser.add_argument("--radius-km", type=float, default=25)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        radius = options["radius_km"]
+
+        with transaction.atomic():
+            self.seed(rng, options["orphanages"])
+            # roughly mainland India
+            origins = [(rng.uniform(8, 32), rng.uniform(69, 92)) for _ in range(options["queries"])]
+
+            indexed = []
+            for lat, lon in origins:
+                started = time.perf_counter()
+                nearest(OrphanageProfile.objects.all(), lat, lon, radius, limit=20)
+                indexed.append((time.perf_counter() - started) * 1000)
+
+            scan = []
+            for lat, lon in origins[:5]:
+                started = time.perf_counter()
+                rows = OrphanageProfile.objects.values_list("pk", "latitude", "longitude")
+                sorted(
+                    (haversine_km(lat, lon, a, b), pk) for pk, a, b in rows.iterator(chunk_size=5000)
+                )[:20]
+                scan.append((time.perf_counter() - started) * 1000)
+
+            self.stdout.write(f"{'':>12} {'p50 ms':>10} {'p95 ms':>10} {'mean ms':>10}")
+            self.stdout.write(f"{'bbox+index':>12} {self.report(indexed)}")
+            self.stdout.write(f"{'full scan':>12} {self.report(scan)}")
+
+            transaction.set_rollback(True)
+
+    def seed(self, rng, count):
+        started = time.perf_counter()
+        users = User.objects.bulk_create(
+            (User(email=f"bench-{uuid.uuid4().hex}@example.com", password="!", role="orphanage")
+             for _ in range(count)),
+            batch_size=5000,
+        )
+        OrphanageProfile.objects.bulk_create(
+            (
+                OrphanageProfile(
+                    user=user,
+                    orphanage_name="Bench Home",
+                    address="-",
+                    city="-",
+                    state="-",
+                    pincode="000000",
+                    phone_number="0",
+                    email=user.email,
+                    latitude=rng.uniform(8, 32),
+                    longitude=rng.uniform(69, 92),
+                )
+                for user in users
+            ),
+            batch_size=5000,
+        )
+        self.stdout.write(f"seeded {count} orphanages in {time.perf_counter() - started:.2f}s")
+
+    def report(self, samples):
+        samples = sorted(samples)
+        p50 = samples[len(samples) // 2]
+        p95 = samples[max(int(len(samples) * 0.95) - 1, 0)]
+        return f"{p50:>10.2f} {p95:>10.2f} {statistics.mean(samples):>10.2f}"
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from donor.models import DonorProfile
+from orphanage.models import OrphanageProfile
+from geo.locator import geocode_all
+
+
+class Command(BaseCommand):
+    help = "Recompute latitude/longitude for all orphanage and donor profiles from their pincodes."
+
+    def handle(self, *args, **options):
+        for model in (OrphanageProfile, DonorProfile):
+            with transaction.atomic():
+                placed = geocode_all(model)
+            total = model.objects.count()
+            self.stdout.write(f"{model.__name__}: placed {placed}/{total}")
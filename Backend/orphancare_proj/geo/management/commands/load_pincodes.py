@@ -0,0 +1,74 @@
+import csv
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from geo.locator import normalize_pincode
+from geo.models import Pincode
+
+# header aliases used by common pincode directory exports
+COLUMNS = {
+    "pincode": ("pincode", "pin", "postal_code"),
+    "latitude": ("latitude", "lat"),
+    "longitude": ("longitude", "lon", "lng", "long"),
+    "district": ("district", "districtname"),
+    "state": ("state", "statename", "state_name"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load exact pincode coordinates from a CSV (pincode, latitude, longitude "
+        "[, district, state]) into the offline geo table, then re-geocode profiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--skip-geocode", action="store_true", help="Don't update profile coordinates.")
+
+    def handle(self, *args, **options):
+        rows = {}
+        skipped = 0
+        with open(options["csv_path"], newline="", encoding="utf-8-sig") as fh:
+            reader = csv.DictReader(fh)
+            header = {name.strip().lower(): name for name in reader.fieldnames or []}
+            columns = {}
+            for field, aliases in COLUMNS.items():
+                columns[field] = next((header[a] for a in aliases if a in header), None)
+            if not all(columns[f] for f in ("pincode", "latitude", "longitude")):
+                raise CommandError("CSV needs pincode, latitude and longitude columns")
+
+            for record in reader:
+                pincode = normalize_pincode(record[columns["pincode"]])
+                try:
+                    latitude = float(record[columns["latitude"]])
+                    longitude = float(record[columns["longitude"]])
+                except (TypeError, ValueError):
+                    skipped += 1
+                    continue
+                if not pincode or not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                    skipped += 1
+                    continue
+                # directories list one row per post office; keep the first per pincode
+                rows.setdefault(pincode, Pincode(
+                    pincode=pincode,
+                    latitude=latitude,
+                    longitude=longitude,
+                    district=(record.get(columns["district"]) or "").strip() if columns["district"] else "",
+                    state=(record.get(columns["state"]) or "").strip() if columns["state"] else "",
+                ))
+
+        with transaction.atomic():
+            Pincode.objects.bulk_create(
+                rows.values(),
+                batch_size=options["batch_size"],
+                update_conflicts=True,
+                unique_fields=["pincode"],
+                update_fields=["latitude", "longitude", "district", "state"],
+            )
+        self.stdout.write(self.style.SUCCESS(f"Loaded {len(rows)} pincodes ({skipped} rows skipped)"))
+
+        if not options["skip_geocode"]:
+            call_command("geocode_profiles", stdout=self.stdout)
@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class Pincode(models.Model):
+    """
+    Pincode centroid imported with `manage.py load_pincodes`; overrides the
+    bundled table (geo/data/pincodes.csv.gz). Pincodes missing from both fall
+    back to the regional table (geo/data/pincode_regions.csv).
+    """
+    pincode = models.CharField(max_length=10, primary_key=True)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    district = models.CharField(max_length=100, blank=True)
+    state = models.CharField(max_length=100, blank=True)
+
+    def __str__(self):
+        return f"{self.pincode} ({self.latitude}, {self.longitude})"
@@ -0,0 +1,17 @@
+# geo/signals.py
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from donor.models import DonorProfile
+from orphanage.models import OrphanageProfile
+from .locator import resolve
+
+
+@receiver(pre_save, sender=OrphanageProfile)
+@receiver(pre_save, sender=DonorProfile)
+def geocode_profile(sender, instance, update_fields=None, **kwargs):
+    """Store coordinates for the profile's pincode whenever it is saved."""
+    if update_fields is not None and "pincode" not in update_fields:
+        return
+    coordinates = resolve(instance.pincode)
+    instance.latitude, instance.longitude = coordinates or (None, None)
@@ -0,0 +1,143 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from auth_app.models import User
+from donor.models import DonorProfile
+from orphanage.models import OrphanageProfile
+from orphancare_proj.testing import QueryPlanMixin, make_orphanage
+from requirement.models import OrphanageRequirement
+from .locator import bounding_box, haversine_km, nearest, resolve
+from .models import Pincode
+
+
+def make_home(email, pincode):
+    return make_orphanage(email, email.split("@")[0], pincode=pincode)[1]
+
+
+class LocatorTests(TestCase):
+    def test_exact_pincode_wins_over_region(self):
+        Pincode.objects.create(pincode="560034", latitude=12.93, longitude=77.62)
+        self.assertEqual(resolve("560034"), (12.93, 77.62))
+        # not imported: the bundled pincode centroid
+        self.assertEqual(resolve("560099"), (12.8401, 77.6975))
+        # in neither table: the regional centroid
+        self.assertEqual(resolve("560999"), (12.97, 77.59))
+
+    def test_unplaceable_pincodes(self):
+        for pincode in (None, "", "abc", "5600", "990001"):
+            self.assertIsNone(resolve(pincode))
+
+    def test_haversine(self):
+        # Bengaluru -> Chennai is ~290 km as the crow flies
+        self.assertAlmostEqual(haversine_km(12.97, 77.59, 13.08, 80.27), 290, delta=5)
+
+    def test_bounding_box_contains_the_circle(self):
+        min_lat, max_lat, min_lon, max_lon = bounding_box(28.6, 77.2, 50)
+        self.assertGreaterEqual(haversine_km(28.6, 77.2, max_lat, 77.2), 49.9)
+        self.assertGreaterEqual(haversine_km(28.6, 77.2, 28.6, max_lon), 49.9)
+
+    def test_profiles_are_geocoded_on_save(self):
+        home = make_home("home@example.com", "600001")
+        self.assertEqual((home.latitude, home.longitude), (13.0948, 80.2832))
+
+        home.pincode = "not-a-pincode"
+        home.save()
+        home.refresh_from_db()
+        self.assertIsNone(home.latitude)
+
+        user = User.objects.create_user(email="d@example.com", password="pass")
+        donor = DonorProfile.objects.create(
+            user=user, full_name="D", contact_number="1", email="d@example.com", pincode="110001"
+        )
+        self.assertEqual((donor.latitude, donor.longitude), (28.6199, 77.2129))
+
+    def test_load_pincodes_command(self):
+        home = make_home("home@example.com", "560034")
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as fh:
+            fh.write("Pincode,Latitude,Longitude,District,StateName\n")
+            fh.write("560034,12.93,77.62,Bangalore,KARNATAKA\n")
+            fh.write("560034,12.94,77.63,Bangalore,KARNATAKA\n")  # another post office
+            fh.write("560035,NA,NA,Bangalore,KARNATAKA\n")
+        try:
+            out = StringIO()
+            call_command("load_pincodes", fh.name, stdout=out)
+        finally:
+            os.unlink(fh.name)
+
+        self.assertIn("Loaded 1 pincodes (1 rows skipped)", out.getvalue())
+        home.refresh_from_db()
+        self.assertEqual((home.latitude, home.longitude), (12.93, 77.62))
+
+
+class NearbyTests(QueryPlanMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        Pincode.objects.bulk_create([
+            Pincode(pincode="560001", latitude=12.975, longitude=77.605),  # MG Road
+            Pincode(pincode="560034", latitude=12.935, longitude=77.624),  # Koramangala (~5 km)
+            Pincode(pincode="562125", latitude=12.780, longitude=77.780),  # Anekal side (~29 km)
+            Pincode(pincode="570001", latitude=12.305, longitude=76.655),  # Mysuru (~128 km)
+        ])
+        self.mg_road = make_home("mg@example.com", "560001")
+        self.koramangala = make_home("kora@example.com", "560034")
+        self.anekal = make_home("anekal@example.com", "562125")
+        self.mysuru = make_home("mysuru@example.com", "570001")
+        for home in (self.mg_road, self.koramangala, self.mysuru):
+            OrphanageRequirement.objects.create(orphanage=home, item_name="Rice", quantity_needed=5)
+        OrphanageRequirement.objects.create(
+            orphanage=self.mg_road, item_name="Done", quantity_needed=5, is_fulfilled=True
+        )
+
+    def nearby(self, **params):
+        response = self.client.get(reverse("geo-nearby"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_orphanages_sorted_by_distance_within_radius(self):
+        data = self.nearby(pincode="560034", radius_km=40)
+        self.assertEqual(
+            [row["id"] for row in data["orphanages"]],
+            [self.koramangala.id, self.mg_road.id, self.anekal.id],
+        )
+        self.assertEqual(data["orphanages"][0]["distance_km"], 0)
+        self.assertAlmostEqual(data["orphanages"][1]["distance_km"], 4.8, delta=0.5)
+
+    def test_radius_and_limit(self):
+        data = self.nearby(pincode="560034", radius_km=10)
+        self.assertEqual(len(data["orphanages"]), 2)
+        data = self.nearby(pincode="560034", radius_km=200, limit=1)
+        self.assertEqual([row["id"] for row in data["orphanages"]], [self.koramangala.id])
+
+    def test_open_requirements_sorted_by_distance(self):
+        data = self.nearby(pincode="560001", radius_km=200)
+        self.assertEqual(
+            [row["orphanage"] for row in data["requirements"]],
+            [self.mg_road.id, self.koramangala.id, self.mysuru.id],
+        )
+        self.assertNotIn("Done", [row["item_name"] for row in data["requirements"]])
+
+    def test_uses_donor_profile_location(self):
+        user = User.objects.create_user(email="d@example.com", password="pass", role="donor")
+        DonorProfile.objects.create(
+            user=user, full_name="D", contact_number="1", email="d@example.com", pincode="570001"
+        )
+        self.client.force_authenticate(user)
+        data = self.nearby(radius_km=10)
+        self.assertEqual([row["id"] for row in data["orphanages"]], [self.mysuru.id])
+
+    def test_bad_pincode_is_400(self):
+        response = self.client.get(reverse("geo-nearby"), {"pincode": "12"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_bounding_box_query_uses_index(self):
+        queryset = OrphanageProfile.objects.filter(
+            latitude__range=(12.5, 13.5), longitude__range=(77, 78)
+        ).values_list("pk", "latitude", "longitude")
+        self.assert_queryset_is_indexed(queryset)
+        self.assertEqual(len(nearest(OrphanageProfile.objects.all(), 12.975, 77.605, 50, 10)), 3)
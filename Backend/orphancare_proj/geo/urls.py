@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import NearbyView
+
+urlpatterns = [
+    path("nearby/", NearbyView.as_view(), name="geo-nearby"),
+]
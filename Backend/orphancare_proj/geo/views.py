@@ -0,0 +1,92 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from donor.models import DonorProfile
+from orphanage.models import OrphanageProfile
+from orphancare_proj.db_router import ReplicaReadMixin
+from orphancare_proj.params import bounded
+from orphanage.serializers import OrphanageListSerializer
+from requirement.models import OrphanageRequirement
+from requirement.serializers import OrphanageRequirementSerializer
+from .locator import resolve, nearest, normalize_pincode
+
+DEFAULT_RADIUS_KM = 25
+MAX_RADIUS_KM = 200
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+# nearest orphanages considered when collecting open requirements
+REQUIREMENT_CANDIDATE_ORPHANAGES = 500
+
+
+class NearbyView(ReplicaReadMixin, APIView):
+    """
+    Orphanages and open requirements near a pincode, closest first.
+
+    GET ?pincode=560001[&radius_km=25][&limit=20]
+    Without a pincode, an authenticated donor's own profile location is used.
+    """
+    permission_classes = [permissions.AllowAny]
+    throttle_scope = "public"
+
+    def get_origin(self, request):
+        pincode = request.query_params.get("pincode")
+        if pincode:
+            return normalize_pincode(pincode), resolve(pincode)
+
+        if request.user.is_authenticated:
+            profile = (
+                DonorProfile.objects.filter(user=request.user)
+                .values_list("pincode", "latitude", "longitude")
+                .first()
+            )
+            if profile and profile[1] is not None:
+                return profile[0], (profile[1], profile[2])
+        return pincode, None
+
+    def get(self, request):
+        pincode, origin = self.get_origin(request)
+        if origin is None:
+            return Response(
+                {"detail": "Provide a valid 6-digit pincode."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        latitude, longitude = origin
+        radius_km = bounded(request.query_params.get("radius_km"), DEFAULT_RADIUS_KM, MAX_RADIUS_KM, float)
+        limit = bounded(request.query_params.get("limit"), DEFAULT_LIMIT, MAX_LIMIT)
+
+        ranked = nearest(
+            OrphanageProfile.objects.all(), latitude, longitude, radius_km,
+            limit=max(limit, REQUIREMENT_CANDIDATE_ORPHANAGES),
+        )
+        distances = {pk: distance for distance, pk in ranked}
+
+        # orphanages
+        top_ids = [pk for _, pk in ranked[:limit]]
+        orphanages = OrphanageProfile.objects.in_bulk(top_ids)
+        orphanage_data = []
+        for pk in top_ids:
+            data = OrphanageListSerializer(orphanages[pk], context={"request": request}).data
+            data["distance_km"] = round(distances[pk], 2)
+            orphanage_data.append(data)
+
+        # open requirements of the nearest orphanages: closest first, newest first
+        candidates = OrphanageRequirement.objects.filter(
+            orphanage_id__in=list(distances), is_fulfilled=False, is_expired=False
+        ).values_list("id", "orphanage_id", "posted_date")
+        candidates = sorted(candidates, key=lambda row: (distances[row[1]], -row[2].timestamp(), row[0]))
+        requirement_ids = [row[0] for row in candidates[:limit]]
+        requirements = OrphanageRequirement.objects.select_related("orphanage").in_bulk(requirement_ids)
+        requirement_data = []
+        for pk in requirement_ids:
+            requirement = requirements[pk]
+            data = OrphanageRequirementSerializer(requirement).data
+            data["distance_km"] = round(distances[requirement.orphanage_id], 2)
+            requirement_data.append(data)
+
+        return Response({
+            "origin": {"pincode": pincode, "latitude": latitude, "longitude": longitude},
+            "radius_km": radius_km,
+            "orphanages": orphanage_data,
+            "requirements": requirement_data,
+        })
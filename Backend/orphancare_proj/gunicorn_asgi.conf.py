@@ -0,0 +1,21 @@
+# gunicorn_asgi.conf.py
+"""
+ASGI serving config: gunicorn process management with uvicorn workers.
+
+    gunicorn -c gunicorn_asgi.conf.py orphancare_proj.asgi:application
+
+orphancare_proj/asgi.py turns on ASYNC_PUBLIC_VIEWS, so the public orphanage
+and requirement reads run as async views; everything else runs on Django's
+per-request sync thread. Compare against the WSGI setup with
+`python manage.py bench_serving`.
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "uvicorn_worker.UvicornWorker"
+# one event loop per worker holds many idle keep-alive connections cheaply
+keepalive = 5
+graceful_timeout = 30
+timeout = 60
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG") or None
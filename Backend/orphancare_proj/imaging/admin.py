@@ -0,0 +1,19 @@
+from django.contrib import admin
+from .models import ImageJob
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "model_label",
+        "object_id",
+        "field",
+        "status",
+        "attempts",
+        "processed_at",
+    )
+
+    list_filter = ("status", "model_label")
+
+    ordering = ("-created_at",)
@@ -0,0 +1,50 @@
+# imaging/fields.py
+from rest_framework import serializers
+
+from . import renditions
+
+
+class RenditionsField(serializers.Field):
+    """
+    Read-only {rendition: url} for a renditions JSON field; empty until the
+    worker has processed the current upload.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        request = self.context.get("request")
+        return {
+            name: renditions.url_for(value, name, request)
+            for name in renditions.RENDITIONS
+            if (value or {}).get(name)
+        }
+
+
+class RenditionURLField(serializers.Field):
+    """
+    URL of one rendition of an image field, falling back to the original
+    upload while the renditions are missing or stale.
+    """
+
+    def __init__(self, image_field, renditions_field, rendition, **kwargs):
+        self.image_field = image_field
+        self.renditions_field = renditions_field
+        self.rendition = rendition
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        request = self.context.get("request")
+        image = getattr(instance, self.image_field)
+        if not image:
+            return None
+        stored = getattr(instance, self.renditions_field) or {}
+        if stored.get("source") == image.name:
+            url = renditions.url_for(stored, self.rendition, request)
+            if url:
+                return url
+        return request.build_absolute_uri(image.url) if request is not None else image.url
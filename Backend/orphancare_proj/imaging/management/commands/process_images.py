@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from imaging.worker import backfill, process_images
+
+
+class Command(BaseCommand):
+    help = "Build thumbnail/card/full renditions for queued banner and proof uploads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=20, help="Jobs claimed per batch.")
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="First queue every existing upload whose renditions are missing or stale.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for jobs instead of exiting once the queue is drained.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the queue is empty (with --loop).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+
+        if options["backfill"]:
+            self.stdout.write(f"Queued {backfill()} images")
+
+        total_claimed = total_processed = 0
+        try:
+            while True:
+                claimed, processed = process_images(batch_size=batch_size)
+                total_claimed += claimed
+                total_processed += processed
+
+                if claimed:
+                    self.stdout.write(f"Processed {processed}/{claimed} images")
+                    continue
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Image queue drained: {total_processed} processed, {total_claimed - total_processed} deferred"
+            )
+        )
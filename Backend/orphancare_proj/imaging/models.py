@@ -0,0 +1,46 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ImageJob(models.Model):
+    """
+    Pending rendition work for one image field of one row, processed by the
+    `process_images` worker. There is at most one job per (model, row, field):
+    a new upload resets the existing job instead of queueing a second one.
+    """
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("processing", "Processing"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    model_label = models.CharField(max_length=100)
+    object_id = models.PositiveBigIntegerField()
+    field = models.CharField(max_length=50)
+    # storage name of the upload the renditions are built from
+    source = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+
+    # Retry bookkeeping (same scheme as outbox.OutboxEmail)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    claim_token = models.UUIDField(blank=True, null=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["model_label", "object_id", "field"], name="imagejob_target_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="imagejob_status_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label}#{self.object_id}.{self.field} ({self.status})"
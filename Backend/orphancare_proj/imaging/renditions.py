@@ -0,0 +1,180 @@
+# imaging/renditions.py
+"""
+Resized, EXIF-stripped copies of uploaded images.
+
+Each upload is decoded once, rotated upright from its EXIF orientation and
+written out as every size in RENDITIONS, bounded by (width, height) with the
+aspect ratio kept and never upscaled. Nothing from the original file's
+metadata (EXIF, GPS, XMP, comments) is carried over. The upload itself is
+replaced by a full-size re-encoded copy with the same guarantees, so the
+image field never keeps serving the phone's GPS tags once processed.
+
+The result is stored on the row in a JSON field:
+
+    {
+        "source": "orphanage_banners/photo_x7Gk2.jpg",
+        "stripped": True,
+        "thumbnail": {"name": "renditions/...-thumbnail.webp", "width": 320, "height": 160, "bytes": 9120},
+        "card": {...},
+        "full": {...},
+    }
+
+`source` is the stripped copy the image field is switched to; when it no
+longer matches the image field the renditions are stale (a new upload) and a
+new job is queued. Rows processed before uploads were replaced lack
+`stripped` and are queued again by `process_images --backfill`.
+"""
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# name -> bounding box
+RENDITIONS = {
+    "thumbnail": (320, 320),
+    "card": (800, 600),
+    "full": (1600, 1600),
+}
+
+# "<app_label>.<model_name>" -> (image field, renditions field)
+TARGETS = {
+    "orphanage.orphanageprofile": ("banner_image", "banner_renditions"),
+    "donation.donation": ("proof_image", "proof_renditions"),
+}
+
+FORMATS = {
+    "WEBP": ("webp", {"method": 4}),
+    "JPEG": ("jpg", {"optimize": True, "progressive": True}),
+}
+
+# format of the upload -> (extension, save options) of its stripped copy;
+# anything else is stored as JPEG
+ORIGINAL_FORMATS = {
+    "JPEG": ("jpg", {"quality": 95, "optimize": True}),
+    "PNG": ("png", {"optimize": True}),
+    "WEBP": ("webp", {"quality": 95}),
+}
+
+
+def get_format():
+    name = getattr(settings, "IMAGE_RENDITION_FORMAT", "WEBP").upper()
+    return name if name in FORMATS else "JPEG"
+
+
+def get_quality():
+    return getattr(settings, "IMAGE_RENDITION_QUALITY", 80)
+
+
+def target_for(model):
+    return TARGETS.get(model._meta.label_lower)
+
+
+def normalize(image, fmt):
+    """Upright image in a mode the output format can encode."""
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
+    if has_alpha and fmt != "JPEG":
+        return image.convert("RGBA")
+    if has_alpha:
+        # JPEG has no alpha channel: flatten onto white
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image.convert("RGBA"), mask=image.convert("RGBA").split()[-1])
+        return background
+    return image.convert("RGB")
+
+
+def render(fileobj):
+    """
+    Encode every rendition of the image in `fileobj`.
+    Returns {name: (data, width, height)}.
+    """
+    fmt = get_format()
+    _, options = FORMATS[fmt]
+    largest = max(RENDITIONS.values())
+
+    with Image.open(fileobj) as image:
+        # Let the JPEG decoder downscale by a power of two while decoding;
+        # this skips most of the work for large phone photos.
+        image.draft("RGB", largest)
+        image = normalize(image, fmt)
+
+    rendered = {}
+    # largest first, each smaller size is resampled from the previous one
+    for name, box in sorted(RENDITIONS.items(), key=lambda item: -item[1][0] * item[1][1]):
+        image = image.copy()
+        image.thumbnail(box, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, fmt, quality=get_quality(), **options)
+        rendered[name] = (buffer.getvalue(), image.width, image.height)
+    return rendered
+
+
+def strip(fileobj):
+    """
+    Full-size copy of the image in `fileobj`, upright and without metadata.
+    Returns (data, extension).
+    """
+    with Image.open(fileobj) as image:
+        fmt = image.format if image.format in ORIGINAL_FORMATS else "JPEG"
+        image = normalize(image, fmt)
+    extension, options = ORIGINAL_FORMATS[fmt]
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue(), extension
+
+
+def rendition_name(source, name):
+    extension, _ = FORMATS[get_format()]
+    stem, _ = os.path.splitext(source)
+    return f"renditions/{stem}-{name}.{extension}"
+
+
+def build(source):
+    """
+    Render `source` (a storage name) and save the files, including the
+    stripped copy that replaces `source` on the row.
+    Returns the renditions dict to store on the row.
+    """
+    with default_storage.open(source, "rb") as fileobj:
+        rendered = render(fileobj)
+        fileobj.seek(0)
+        data, extension = strip(fileobj)
+
+    stem, _ = os.path.splitext(source)
+    # the upload still exists, so storage picks a fresh name
+    renditions = {
+        "source": default_storage.save(f"{stem}.{extension}", ContentFile(data)),
+        "stripped": True,
+    }
+    for name, (data, width, height) in rendered.items():
+        stored = default_storage.save(rendition_name(source, name), ContentFile(data))
+        renditions[name] = {"name": stored, "width": width, "height": height, "bytes": len(data)}
+    return renditions
+
+
+def is_current(renditions, image_name):
+    """Whether `renditions` were built from, and replaced, the image field's file."""
+    renditions = renditions or {}
+    if renditions.get("source", "") != (image_name or ""):
+        return False
+    return not image_name or renditions.get("stripped", False)
+
+
+def delete(renditions):
+    for name in RENDITIONS:
+        entry = (renditions or {}).get(name)
+        if entry:
+            default_storage.delete(entry["name"])
+
+
+def url_for(renditions, name, request=None):
+    entry = (renditions or {}).get(name)
+    if not entry:
+        return None
+    url = default_storage.url(entry["name"])
+    return request.build_absolute_uri(url) if request is not None else url
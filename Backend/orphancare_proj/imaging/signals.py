@@ -0,0 +1,26 @@
+# imaging/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from donation.models import Donation
+from orphanage.models import OrphanageProfile
+from . import renditions
+from .models import ImageJob
+from .worker import enqueue
+
+
+@receiver(post_save, sender=OrphanageProfile)
+@receiver(post_save, sender=Donation)
+def queue_renditions(sender, instance, **kwargs):
+    """Queue a rendition job when the image no longer matches its renditions."""
+    image_field, renditions_field = renditions.target_for(sender)
+    if not renditions.is_current(getattr(instance, renditions_field), getattr(instance, image_field).name):
+        enqueue(instance)
+
+
+@receiver(post_delete, sender=OrphanageProfile)
+@receiver(post_delete, sender=Donation)
+def delete_renditions(sender, instance, **kwargs):
+    _, renditions_field = renditions.target_for(sender)
+    renditions.delete(getattr(instance, renditions_field))
+    ImageJob.objects.filter(model_label=sender._meta.label_lower, object_id=instance.pk).delete()
@@ -0,0 +1,193 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+
+from auth_app.models import User
+from orphanage.models import OrphanageProfile
+from .models import ImageJob
+from .renditions import RENDITIONS
+from .worker import backfill, process_images
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix="orphancare-media-")
+
+
+def phone_photo(width=4000, height=3000):
+    """
+    A large, noisy JPEG shaped like a phone upload: rotated via the EXIF
+    orientation tag and carrying GPS metadata.
+    """
+    image = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    exif = Image.Exif()
+    exif[0x0112] = 6  # orientation: rotate 90° clockwise to display
+    exif[0x010F] = "PhoneMaker"
+    exif.get_ifd(0x8825)[2] = (12.0, 58.0, 0.0)  # GPSLatitude
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=92, exif=exif)
+    return buffer.getvalue()
+
+
+def decode_seconds(data, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_RENDITION_FORMAT="WEBP")
+class ImagePipelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.photo = phone_photo()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="home@example.com", password="pass", role="orphanage", is_active=True
+        )
+        self.orphanage = OrphanageProfile.objects.create(
+            user=self.user,
+            orphanage_name="Home",
+            address="1 Street",
+            city="Bengaluru",
+            state="Karnataka",
+            pincode="560001",
+            phone_number="8888888888",
+            email="home@example.com",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, data=None, name="banner.jpg"):
+        return self.client.patch(
+            reverse("orphanage-detail"),
+            {"banner_image": SimpleUploadedFile(name, data or self.photo, content_type="image/jpeg")},
+            format="multipart",
+        )
+
+    def list_banner(self):
+        response = self.client.get(reverse("orphanage-list"))
+        return response.data["results"][0]["banner_image"]
+
+    def test_upload_is_queued_not_processed_inline(self):
+        response = self.upload()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["banner_renditions"], {})
+        job = ImageJob.objects.get()
+        self.assertEqual(job.status, "pending")
+        self.assertEqual(job.source, OrphanageProfile.objects.get().banner_image.name)
+        # until the worker runs the list falls back to the original upload
+        self.assertTrue(self.list_banner().endswith(job.source))
+
+    def test_renditions_are_smaller_upright_and_stripped(self):
+        self.upload()
+        self.assertEqual(process_images(), (1, 1))
+
+        self.orphanage.refresh_from_db()
+        renditions = self.orphanage.banner_renditions
+        self.assertEqual(renditions["source"], self.orphanage.banner_image.name)
+        self.assertEqual(ImageJob.objects.get().status, "done")
+
+        for name, (max_width, max_height) in RENDITIONS.items():
+            with default_storage.open(renditions[name]["name"], "rb") as f:
+                data = f.read()
+            with Image.open(io.BytesIO(data)) as image:
+                self.assertEqual(image.format, "WEBP")
+                self.assertLessEqual(image.width, max_width)
+                self.assertLessEqual(image.height, max_height)
+                # 4000x3000 with orientation 6 displays as portrait
+                self.assertGreater(image.height, image.width)
+                self.assertFalse(image.getexif())
+                self.assertNotIn("exif", image.info)
+            self.assertEqual(len(data), renditions[name]["bytes"])
+
+    def test_upload_is_replaced_by_a_stripped_copy(self):
+        self.upload()
+        upload = ImageJob.objects.get().source
+        process_images()
+
+        self.orphanage.refresh_from_db()
+        original = self.orphanage.banner_image.name
+        self.assertNotEqual(original, upload)
+        self.assertFalse(default_storage.exists(upload))
+        with default_storage.open(original, "rb") as f, Image.open(f) as image:
+            self.assertEqual((image.format, image.size), ("JPEG", (3000, 4000)))
+            self.assertFalse(image.getexif())
+        detail = self.client.get(reverse("orphanage-detail")).data
+        self.assertTrue(detail["banner_image"].endswith(original))
+
+        # processed before originals were replaced: backfill queues it again
+        renditions = {**self.orphanage.banner_renditions, "source": upload}
+        del renditions["stripped"]
+        OrphanageProfile.objects.filter(pk=self.orphanage.pk).update(
+            banner_image=upload, banner_renditions=renditions
+        )
+        self.assertEqual(backfill(), 1)
+
+    def test_list_serves_thumbnail_with_byte_and_decode_savings(self):
+        self.upload()
+        process_images()
+        self.orphanage.refresh_from_db()
+
+        thumbnail = self.orphanage.banner_renditions["thumbnail"]
+        self.assertTrue(self.list_banner().endswith(thumbnail["name"]))
+        detail = self.client.get(reverse("orphanage-public-detail", args=[self.orphanage.pk])).data
+        self.assertEqual(set(detail["banner_renditions"]), set(RENDITIONS))
+
+        with default_storage.open(thumbnail["name"], "rb") as f:
+            thumbnail_bytes = f.read()
+        # bytes a list client downloads per card, and the time to decode them
+        self.assertLess(len(thumbnail_bytes) * 50, len(self.photo))
+        self.assertLess(decode_seconds(thumbnail_bytes) * 10, decode_seconds(self.photo))
+
+    def test_reupload_replaces_renditions(self):
+        self.upload()
+        process_images()
+        self.orphanage.refresh_from_db()
+        old = self.orphanage.banner_renditions
+
+        self.upload(phone_photo(800, 600), name="second.jpg")
+        process_images()
+        self.orphanage.refresh_from_db()
+
+        self.assertEqual(self.orphanage.banner_renditions["source"], self.orphanage.banner_image.name)
+        self.assertFalse(default_storage.exists(old["thumbnail"]["name"]))
+        self.assertEqual(ImageJob.objects.count(), 1)
+
+    def test_stale_job_does_not_overwrite_newer_upload(self):
+        self.upload()
+        stale = ImageJob.objects.get()
+        self.upload(phone_photo(800, 600), name="second.jpg")
+        # simulate the first job still being claimed by a slow worker
+        ImageJob.objects.filter(pk=stale.pk).update(source=stale.source)
+        process_images()
+
+        self.orphanage.refresh_from_db()
+        self.assertEqual(self.orphanage.banner_renditions, {})
+
+    def test_corrupt_upload_is_retried_then_failed(self):
+        OrphanageProfile.objects.filter(pk=self.orphanage.pk).update(banner_image="orphanage_banners/missing.jpg")
+        self.assertEqual(backfill(), 1)
+
+        with self.settings(IMAGE_JOB_MAX_ATTEMPTS=1):
+            self.assertEqual(process_images(), (1, 0))
+        job = ImageJob.objects.get()
+        self.assertEqual(job.status, "failed")
+        self.assertTrue(job.last_error)
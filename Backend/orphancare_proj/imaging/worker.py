@@ -0,0 +1,151 @@
+# imaging/worker.py
+import logging
+import uuid
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.utils import timezone
+
+from outbox.worker import backoff_delay
+from . import renditions as rendition_utils
+from .models import ImageJob
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(instance):
+    """
+    Queue (or re-queue) rendition work for `instance`'s image field.
+    Call inside the transaction that saved the row.
+    """
+    image_field, _ = rendition_utils.target_for(type(instance))
+    ImageJob.objects.update_or_create(
+        model_label=instance._meta.label_lower,
+        object_id=instance.pk,
+        field=image_field,
+        defaults={
+            "source": getattr(instance, image_field).name or "",
+            "status": "pending",
+            "attempts": 0,
+            "next_attempt_at": timezone.now(),
+            "last_error": "",
+            "claim_token": None,
+            "locked_at": None,
+        },
+    )
+
+
+def claim_batch(batch_size):
+    """
+    Claim up to `batch_size` due jobs, recovering ones whose worker died
+    (see outbox.worker.claim_batch).
+    """
+    now = timezone.now()
+    timeout = getattr(settings, "IMAGE_JOB_LOCK_TIMEOUT_SECONDS", 300)
+    due = (
+        Q(status="pending", next_attempt_at__lte=now)
+        | Q(status="processing", locked_at__lt=now - timedelta(seconds=timeout))
+    )
+
+    ids = list(
+        ImageJob.objects.filter(due).order_by("next_attempt_at").values_list("id", flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+
+    token = uuid.uuid4()
+    ImageJob.objects.filter(due, id__in=ids).update(
+        status="processing", claim_token=token, locked_at=now
+    )
+    return list(ImageJob.objects.filter(claim_token=token, status="processing"))
+
+
+def mark_failed(job, error):
+    attempts = job.attempts + 1
+    give_up = attempts >= getattr(settings, "IMAGE_JOB_MAX_ATTEMPTS", 3)
+    ImageJob.objects.filter(id=job.id, claim_token=job.claim_token).update(
+        status="failed" if give_up else "pending",
+        attempts=attempts,
+        next_attempt_at=timezone.now() + backoff_delay(attempts),
+        last_error=str(error)[:2000],
+        claim_token=None,
+        locked_at=None,
+    )
+    logger.warning("Image job %s failed (attempt %s): %s", job.id, attempts, error)
+
+
+def process(job):
+    """
+    Build renditions for one claimed job and store them on the row, pointing
+    the image field at the stripped copy and deleting the raw upload.
+
+    The row is only updated while its image field still holds the job's
+    source, so a worker that finishes after a newer upload never overwrites
+    the newer renditions. The UPDATE skips save() and its signals on purpose.
+    """
+    model = apps.get_model(job.model_label)
+    _, renditions_field = rendition_utils.TARGETS[job.model_label]
+    row = model.objects.filter(pk=job.object_id).values(renditions_field).first()
+
+    built = rendition_utils.build(job.source) if job.source and row is not None else {}
+    same_source = Q(**{job.field: job.source})
+    if not job.source:
+        same_source |= Q(**{f"{job.field}__isnull": True})
+    # both targets carry an auto_now updated_at, which update() doesn't touch
+    values = {renditions_field: built, "updated_at": timezone.now()}
+    if built:
+        values[job.field] = built["source"]
+    updated = model.objects.filter(same_source, pk=job.object_id).update(**values)
+    if updated:
+        rendition_utils.delete(row[renditions_field])
+        if built:
+            default_storage.delete(job.source)
+    else:
+        rendition_utils.delete(built)
+        if built:
+            default_storage.delete(built["source"])
+
+    ImageJob.objects.filter(id=job.id, claim_token=job.claim_token).update(
+        status="done",
+        attempts=job.attempts + 1,
+        processed_at=timezone.now(),
+        last_error="",
+        claim_token=None,
+        locked_at=None,
+    )
+
+
+def process_images(batch_size=20):
+    """
+    Claim one batch and process it. Returns (claimed, processed).
+    """
+    jobs = claim_batch(batch_size)
+    processed = 0
+    for job in jobs:
+        try:
+            process(job)
+        except Exception as e:
+            mark_failed(job, e)
+            continue
+        processed += 1
+    return len(jobs), processed
+
+
+def backfill():
+    """
+    Queue every row whose renditions are missing or stale. Returns the count.
+    """
+    queued = 0
+    for label, (image_field, renditions_field) in rendition_utils.TARGETS.items():
+        model = apps.get_model(label)
+        rows = model.objects.exclude(**{f"{image_field}__isnull": True}).exclude(**{image_field: ""})
+        for instance in rows.only("pk", image_field, renditions_field).iterator():
+            if not rendition_utils.is_current(
+                getattr(instance, renditions_field), getattr(instance, image_field).name
+            ):
+                enqueue(instance)
+                queued += 1
+    return queued
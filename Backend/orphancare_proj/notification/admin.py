@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import DonationEvent
+
+
+@admin.register(DonationEvent)
+class DonationEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "orphanage", "donation", "kind", "status", "created_at")
+    list_filter = ("kind", "status")
+    raw_id_fields = ("orphanage", "donation")
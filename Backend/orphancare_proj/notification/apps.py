@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+from django.core.exceptions import ImproperlyConfigured
+
+
+class NotificationConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'notification'
+
+    def ready(self):
+        from orphancare_proj.sqlite import is_sqlite
+        from . import signals  # noqa: F401
+
+        # events are resumed by id, which needs ids to commit in order
+        if not is_sqlite():
+            raise ImproperlyConfigured(
+                "The notification app needs SQLite: its event cursors assume ids commit in order."
+            )
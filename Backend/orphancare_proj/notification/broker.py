@@ -0,0 +1,126 @@
+# notification/broker.py
+"""
+Wake-ups for the donation event streams.
+
+DonationEvent rows are the source of truth: a stream only ever sends what it
+reads from the table. The broker just tells a waiting stream that there is
+something new on its channel, so it can read it now instead of at its next
+heartbeat. A missed wake-up costs latency (up to
+NOTIFICATION_HEARTBEAT_SECONDS), never an event.
+
+NOTIFICATION_BROKER picks the backend:
+
+    LocalBroker   streams in the publishing process only (runserver, one worker)
+    CacheBroker   also streams in other workers, through the shared cache
+                  (set CACHE_BACKEND to redis/memcached)
+
+A backend implements `publish(channel, event_id)`, called from any thread
+once the event has committed, and `async wait(channel, after, timeout)`,
+which returns the newest event id published on the channel once it is above
+`after`, or None on timeout. That id may belong to a row deleted since, so
+callers treat it as a hint to re-read (events.next_events), not as an event.
+The re-read relies on ids committing in order, i.e. on SQLite (see
+notification/events.py).
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+def _wake(future, event_id):
+    if not future.done():
+        future.set_result(event_id)
+
+
+class LocalBroker:
+    """In-process pub/sub: waiters are futures on whichever event loop they run in."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._waiters = defaultdict(set)
+
+    def publish(self, channel, event_id):
+        with self._lock:
+            latest = self._latest[channel] = max(event_id, self._latest.get(channel, 0))
+            waiters = self._waiters.pop(channel, ())
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future, latest)
+
+    async def wait(self, channel, after, timeout):
+        """
+        The newest event id published on `channel` once one newer than
+        `after` has been (straight away if one already was), None after
+        `timeout` seconds.
+        """
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        with self._lock:
+            latest = self._latest.get(channel, 0)
+            if latest > after:
+                return latest
+            self._waiters[channel].add(waiter)
+        try:
+            return await asyncio.wait_for(waiter[1], timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(channel)
+                if waiters is not None:
+                    waiters.discard(waiter)
+                    if not waiters:
+                        del self._waiters[channel]
+
+
+class CacheBroker(LocalBroker):
+    """
+    LocalBroker plus the latest event id per channel in the NOTIFICATION_CACHE
+    cache, which waiters check every NOTIFICATION_CACHE_POLL_SECONDS: one
+    cache read per open stream, instead of clients re-reading their lists.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.cache = caches[getattr(settings, "NOTIFICATION_CACHE", "default")]
+        self.interval = getattr(settings, "NOTIFICATION_CACHE_POLL_SECONDS", 0.5)
+
+    def key(self, channel):
+        return f"notify:{channel}"
+
+    def publish(self, channel, event_id):
+        super().publish(channel, event_id)
+        # last writer wins; an out-of-order id only delays a wake-up
+        self.cache.set(self.key(channel), event_id, None)
+
+    async def wait(self, channel, after, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            latest = await self.cache.aget(self.key(channel)) or 0
+            if latest > after:
+                return latest
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            latest = await super().wait(channel, after, min(self.interval, remaining))
+            if latest is not None:
+                return latest
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(getattr(settings, "NOTIFICATION_BROKER", "notification.broker.LocalBroker"))()
+
+
+@receiver(setting_changed)
+def reset_broker(setting, **kwargs):
+    if setting.startswith("NOTIFICATION_") or setting == "CACHES":
+        get_broker.cache_clear()
@@ -0,0 +1,97 @@
+# notification/events.py
+"""
+Donation events per orphanage: recorded with the change, read back by id.
+
+Clients keep the id of the last event they saw and ask for what came after
+it, so a reconnect (SSE Last-Event-ID, or the next long-poll) resumes where
+it stopped, whichever worker serves it. A cursor from before the retention
+window (prune_donation_events) can't resume: `cursor_expired` spots it and
+the client reloads its donation list instead.
+
+Resuming by `id > cursor` is only safe when ids become visible in commit
+order, otherwise a reader can move past an id whose transaction is still
+open and never see it. SQLite gives that for free: one writer at a time,
+holding the lock from its insert until its commit. Backends with
+concurrent writers (PostgreSQL, MySQL) don't, so the app refuses to start
+on anything but SQLite (NotificationConfig.ready).
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+from .broker import get_broker
+from .models import DonationEvent
+
+
+def get_batch_size():
+    """Events sent per read; a longer backlog is sent over several reads."""
+    return getattr(settings, "NOTIFICATION_BATCH_SIZE", 100)
+
+
+def channel(orphanage_id):
+    return f"donations:{orphanage_id}"
+
+
+def record(donation, kind):
+    """Write the event in the caller's transaction and wake its streams once that commits."""
+    event = DonationEvent.objects.create(
+        orphanage_id=donation.orphanage_id, donation_id=donation.pk, kind=kind, status=donation.status,
+    )
+    transaction.on_commit(lambda: get_broker().publish(channel(event.orphanage_id), event.id))
+    return event
+
+
+def latest_id(orphanage_id):
+    """Id of the orphanage's newest event (0 when there is none): "from now on"."""
+    return (
+        DonationEvent.objects.filter(orphanage_id=orphanage_id)
+        .order_by("-id").values_list("id", flat=True).first()
+    ) or 0
+
+
+def cursor_expired(orphanage_id, after):
+    """
+    Whether events after `after` may have been pruned: none of the
+    orphanage's events at or before the cursor is left, but newer ones are.
+    The prune keeps each orphanage's newest event, so when events after the
+    cursor were deleted at least one newer one is still there.
+    """
+    if not after:
+        return False
+    rows = DonationEvent.objects.filter(orphanage_id=orphanage_id)
+    return not rows.filter(id__lte=after).exists() and rows.filter(id__gt=after).exists()
+
+
+def events_after(orphanage_id, after, limit=None):
+    """The orphanage's events after id `after`, oldest first, with everything the serializer reads."""
+    return list(
+        DonationEvent.objects.filter(orphanage_id=orphanage_id, id__gt=after)
+        .select_related("donation__donor", "donation__orphanage", "donation__requirement")
+        .order_by("id")[:limit or get_batch_size()]
+    )
+
+
+async def next_events(orphanage_id, after, timeout, limit=None):
+    """
+    events_after(), waiting up to `timeout` seconds for the first one if
+    there are none yet. A wake-up the re-read finds nothing for (its event
+    was deleted since) doesn't end the wait: it goes on for a newer one.
+    """
+    events = await sync_to_async(events_after)(orphanage_id, after, limit)
+    if events or timeout <= 0:
+        return events
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    seen = after
+    while not events:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        latest = await get_broker().wait(channel(orphanage_id), seen, remaining)
+        if latest is None:
+            break
+        seen = max(seen, latest)
+        events = await sync_to_async(events_after)(orphanage_id, after, limit)
+    return events
@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from django.utils import timezone
+
+from notification.models import DonationEvent
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete donation events older than the retention window, except each orphanage's "
+        "newest. A client that was away longer reloads its donation list instead of "
+        "resuming. Run it daily from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=getattr(settings, "NOTIFICATION_EVENT_RETENTION_DAYS", 7))
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        # the newest event stays so events.cursor_expired can tell a pruned
+        # cursor from one that simply has nothing new
+        newest = DonationEvent.objects.values("orphanage_id").order_by().annotate(newest=Max("id")).values("newest")
+        deleted, _ = DonationEvent.objects.filter(created_at__lt=cutoff).exclude(id__in=newest).delete()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} donation events deleted"))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('donation', '0005_donation_updated_at_donation_donation_date_idx_and_more'),
+        ('orphanage', '0005_orphanageprofile_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('created', 'Created'), ('status', 'Status changed')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('accepted', 'Accepted'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('donation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='donation.donation')),
+                ('orphanage', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='orphanage.orphanageprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['orphanage', 'id'], name='event_orphanage_id_idx'), models.Index(fields=['created_at'], name='event_created_idx')],
+            },
+        ),
+    ]
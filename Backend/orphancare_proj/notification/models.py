@@ -0,0 +1,33 @@
+from django.db import models
+
+from donation.models import Donation
+from orphanage.models import OrphanageProfile
+
+
+class DonationEvent(models.Model):
+    """
+    A donation change an orphanage is told about: a new donation, or a status
+    change. Written in the same transaction as the change (notification/events.py);
+    the id is the event id clients resume from with Last-Event-ID.
+    """
+    KIND_CHOICES = [
+        ("created", "Created"),
+        ("status", "Status changed"),
+    ]
+
+    orphanage = models.ForeignKey(OrphanageProfile, on_delete=models.CASCADE, related_name="+")
+    donation = models.ForeignKey(Donation, on_delete=models.CASCADE, related_name="+")
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    # the donation's status right after the change (it may have moved on since)
+    status = models.CharField(max_length=20, choices=Donation.STATUS_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # "events after N for this orphanage"
+            models.Index(fields=["orphanage", "id"], name="event_orphanage_id_idx"),
+            models.Index(fields=["created_at"], name="event_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.kind} {self.status} (donation {self.donation_id})"
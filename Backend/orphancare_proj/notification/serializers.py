@@ -0,0 +1,14 @@
+from rest_framework import serializers
+
+from donation.serializers import DonationSerializer
+from .models import DonationEvent
+
+
+class DonationEventSerializer(serializers.ModelSerializer):
+    # the donation as it is now, like a row of /api/donation/received/
+    donation = DonationSerializer(read_only=True)
+
+    class Meta:
+        model = DonationEvent
+        fields = ["id", "kind", "status", "created_at", "donation"]
+        read_only_fields = fields
@@ -0,0 +1,22 @@
+# notification/signals.py
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from donation.models import Donation
+from .events import record
+
+
+@receiver(pre_save, sender=Donation)
+def remember_status(sender, instance, **kwargs):
+    if instance._state.adding or instance.pk is None:
+        instance._event_previous_status = None
+        return
+    instance._event_previous_status = sender.objects.filter(pk=instance.pk).values_list("status", flat=True).first()
+
+
+@receiver(post_save, sender=Donation)
+def donation_changed(sender, instance, created, **kwargs):
+    if created:
+        record(instance, "created")
+    elif getattr(instance, "_event_previous_status", None) != instance.status:
+        record(instance, "status")
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from donation.models import Donation
+from orphancare_proj.testing import QueryPlanMixin, make_donor, make_orphanage
+from .broker import CacheBroker, LocalBroker, get_broker
+from . import events
+from .events import channel, latest_id
+from .models import DonationEvent
+
+
+class DonationEventTestCase(TestCase):
+    def setUp(self):
+        self.donor_user, self.donor = make_donor()
+        self.orphanage_user, self.orphanage = make_orphanage()
+        self.client = APIClient()
+        self.client.force_authenticate(self.orphanage_user)
+        self.auth = {"Authorization": f"Bearer {AccessToken.for_user(self.orphanage_user)}"}
+        # a fresh in-process broker per test
+        get_broker.cache_clear()
+
+    def donate(self, item_name="Rice"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Donation.objects.create(donor=self.donor, orphanage=self.orphanage, item_name=item_name)
+
+    def poll(self, **params):
+        response = self.client.get(reverse("donation-events"), params)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def kinds(self):
+        return list(DonationEvent.objects.order_by("id").values_list("kind", "status"))
+
+
+class RecordingTests(DonationEventTestCase):
+    def test_new_donations_and_status_changes_are_recorded_and_published(self):
+        donation = self.donate()
+        self.assertEqual(get_broker()._latest[channel(self.orphanage.id)], latest_id(self.orphanage.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse("donation-status-update", args=[donation.pk]), {"status": "accepted"}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+        donation.refresh_from_db()
+        donation.description = "2 bags"
+        donation.save()  # no status change, no event
+        self.assertEqual(self.kinds(), [("created", "pending"), ("status", "accepted")])
+        self.assertEqual(get_broker()._latest[channel(self.orphanage.id)], latest_id(self.orphanage.id))
+
+    def test_nothing_is_published_for_a_rolled_back_change(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            Donation.objects.create(donor=self.donor, orphanage=self.orphanage, item_name="Rice")
+        # the publish is deferred to the commit
+        self.assertEqual(len(callbacks), 1)
+        self.assertNotIn(channel(self.orphanage.id), get_broker()._latest)
+
+
+class LongPollTests(QueryPlanMixin, DonationEventTestCase):
+    def test_without_a_cursor_returns_the_current_one(self):
+        self.donate()
+        self.assertEqual(self.poll(), {"events": [], "last_event_id": latest_id(self.orphanage.id)})
+
+    def test_returns_events_after_the_cursor(self):
+        first = self.donate("Rice")
+        self.donate("Dal")
+        body = self.poll(after=latest_id(self.orphanage.id) - 1)
+        self.assertEqual([e["donation"]["item_name"] for e in body["events"]], ["Dal"])
+        self.assertEqual(body["last_event_id"], latest_id(self.orphanage.id))
+
+        response = self.client.get(reverse("donation-events"), HTTP_LAST_EVENT_ID="0")
+        events = json.loads(response.content)["events"]
+        self.assertEqual([(e["kind"], e["donation"]["id"]) for e in events][0], ("created", first.id))
+        self.assertEqual(events[0]["donation"]["donor_name"], "Donor")
+
+    async def test_wakes_when_an_event_commits(self):
+        after = await sync_to_async(latest_id)(self.orphanage.id)
+        poll = asyncio.ensure_future(
+            AsyncClient().get(reverse("donation-events"), {"after": after, "wait": 30}, headers=self.auth)
+        )
+        await asyncio.sleep(0.1)
+        self.assertFalse(poll.done())
+        await sync_to_async(self.donate)("Milk")
+        body = json.loads((await asyncio.wait_for(poll, 5)).content)
+        self.assertEqual([e["donation"]["item_name"] for e in body["events"]], ["Milk"])
+
+    async def test_wake_up_for_a_deleted_event_keeps_waiting(self):
+        after = await sync_to_async(latest_id)(self.orphanage.id)
+        donation = await sync_to_async(self.donate)("Rice")
+        # published, then gone before the stream reads it
+        await DonationEvent.objects.filter(donation=donation).adelete()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with mock.patch("notification.events.events_after", wraps=events.events_after) as reads:
+            response = await AsyncClient().get(
+                reverse("donation-events"), {"after": after, "wait": 1}, headers=self.auth
+            )
+        self.assertEqual(json.loads(response.content), {"events": [], "last_event_id": after})
+        # waited out the timeout instead of answering (and being polled again) at once
+        self.assertGreaterEqual(loop.time() - started, 0.9)
+        # the first read, and one after the wake-up: no re-reading until the timeout
+        self.assertEqual(reads.call_count, 2)
+
+    def test_pruned_cursor_is_gone(self):
+        self.donate("Rice")
+        cursor = latest_id(self.orphanage.id)
+        self.donate("Dal")
+        self.donate("Milk")
+        DonationEvent.objects.update(created_at=timezone.now() - timedelta(days=30))
+        call_command("prune_donation_events", stdout=StringIO())
+        # the orphanage's newest event is kept
+        self.assertEqual(list(DonationEvent.objects.values_list("id", flat=True)), [latest_id(self.orphanage.id)])
+
+        response = self.client.get(reverse("donation-events"), {"after": cursor})
+        self.assertEqual(response.status_code, 410)
+        current = json.loads(response.content)["last_event_id"]
+        self.assertEqual(current, latest_id(self.orphanage.id))
+        # up to date, or nothing before the cursor was pruned: resumes as usual
+        self.donate("Oil")
+        self.assertEqual([e["donation"]["item_name"] for e in self.poll(after=current)["events"]], ["Oil"])
+        self.assertEqual([e["donation"]["item_name"] for e in self.poll(after=0)["events"]], ["Milk", "Oil"])
+
+    def test_times_out_empty(self):
+        after = latest_id(self.orphanage.id)
+        self.assertEqual(self.poll(after=after, wait=1), {"events": [], "last_event_id": after})
+
+    def test_only_for_orphanages(self):
+        self.assertEqual(self.client.get(reverse("donation-events"), {"after": "x"}).status_code, 400)
+        self.client.force_authenticate(self.donor_user)
+        self.assertEqual(self.client.get(reverse("donation-events")).status_code, 403)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(reverse("donation-events")).status_code, 401)
+
+    def test_indexed_plan(self):
+        self.donate()
+        self.assert_queryset_is_indexed(
+            DonationEvent.objects.filter(orphanage_id=self.orphanage.id, id__gt=0).order_by("id")[:100]
+        )
+        self.assert_endpoint_is_indexed(self.client, reverse("donation-events"), after=0)
+
+
+@override_settings(NOTIFICATION_HEARTBEAT_SECONDS=0.2, NOTIFICATION_STREAM_SECONDS=5)
+class StreamTests(DonationEventTestCase):
+    async def test_replays_from_last_event_id_then_pushes_new_events(self):
+        first = await sync_to_async(self.donate)("Rice")
+        await sync_to_async(self.donate)("Dal")
+        resume_from = (await DonationEvent.objects.aget(donation=first)).id
+
+        response = await AsyncClient().get(
+            reverse("donation-event-stream"), headers={**self.auth, "Last-Event-ID": str(resume_from)}
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        content = response.streaming_content
+        replay = await anext(content)
+        await sync_to_async(self.donate)("Milk")
+        pushed = await asyncio.wait_for(anext(content), 5)
+        # nothing new: a comment line keeps the connection alive
+        keepalive = await asyncio.wait_for(anext(content), 5)
+        await content.aclose()
+
+        self.assertTrue(replay.startswith(b"retry: 3000\n\n"))
+        ids = [pk async for pk in DonationEvent.objects.order_by("id").values_list("id", flat=True)]
+        frame = replay.split(b"\n\n")[1].decode().split("\n")
+        self.assertEqual(frame[:2], [f"id: {ids[1]}", "event: donation.created"])
+        self.assertEqual(json.loads(frame[2].removeprefix("data: "))["donation"]["item_name"], "Dal")
+        self.assertIn(f"id: {ids[2]}\n".encode(), pushed)
+        self.assertIn(b'"item_name":"Milk"', pushed)
+        self.assertEqual(keepalive, b": keepalive\n\n")
+
+    @override_settings(NOTIFICATION_STREAM_SECONDS=0)
+    async def test_pruned_cursor_starts_with_a_reset(self):
+        first = await sync_to_async(self.donate)("Rice")
+        await sync_to_async(self.donate)("Dal")
+        pruned = (await DonationEvent.objects.aget(donation=first)).id
+        await DonationEvent.objects.filter(id=pruned).adelete()
+        current = await sync_to_async(latest_id)(self.orphanage.id)
+
+        response = await AsyncClient().get(
+            reverse("donation-event-stream"), headers={**self.auth, "Last-Event-ID": str(pruned)}
+        )
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(
+            chunks,
+            [f'retry: 3000\n\nid: {current}\nevent: reset\ndata: {{"last_event_id":{current}}}\n\n'.encode()],
+        )
+
+    @override_settings(NOTIFICATION_STREAM_SECONDS=0)
+    async def test_closes_for_the_client_to_reconnect(self):
+        await sync_to_async(self.donate)()
+        response = await AsyncClient().get(reverse("donation-event-stream"), {"after": 0}, headers=self.auth)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), 1)
+        self.assertIn(b"event: donation.created", chunks[0])
+
+
+class BrokerTests(TestCase):
+    async def test_local_broker_wakes_waiters_from_other_threads(self):
+        broker = LocalBroker()
+        waiting = asyncio.ensure_future(broker.wait("c", 1, 5))
+        await asyncio.sleep(0.05)
+        threading.Thread(target=broker.publish, args=("c", 2)).start()
+        self.assertEqual(await waiting, 2)
+        self.assertIsNone(await broker.wait("c", 2, 0.05))
+        self.assertEqual(await broker.wait("c", 1, 0.05), 2)
+        self.assertEqual(broker._waiters, {})
+
+    async def test_cache_broker_reaches_other_workers(self):
+        # two instances stand in for two processes sharing the cache
+        publisher, subscriber = CacheBroker(), CacheBroker()
+        subscriber.interval = 0.05
+        waiting = asyncio.ensure_future(subscriber.wait("c", 0, 5))
+        await asyncio.sleep(0.1)
+        publisher.publish("c", 1)
+        self.assertEqual(await waiting, 1)
+        self.assertIsNone(await subscriber.wait("c", 1, 0.1))
+        self.assertNotIn("c", subscriber._latest)
+
+
+class BackendTests(TestCase):
+    def test_refuses_to_start_without_sqlite(self):
+        # id cursors need ids to commit in order, which only SQLite promises
+        with mock.patch("orphancare_proj.sqlite.is_sqlite", return_value=False):
+            with self.assertRaises(ImproperlyConfigured):
+                apps.get_app_config("notification").ready()
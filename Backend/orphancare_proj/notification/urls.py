@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import DonationEventPollView, DonationEventStreamView
+
+urlpatterns = [
+    path("donations/", DonationEventPollView.as_view(), name="donation-events"),
+    path("donations/stream/", DonationEventStreamView.as_view(), name="donation-event-stream"),
+]
@@ -0,0 +1,170 @@
+# notification/views.py
+"""
+Donation events for the signed-in orphanage, pushed instead of polled.
+
+    GET /api/notification/donations/stream/     Server-Sent Events
+    GET /api/notification/donations/?after=N    long-poll fallback
+
+Both are async views (orphancare_proj/async_views.py): a waiting client holds
+a suspended coroutine, not a thread. Serve them under ASGI; under WSGI the
+long-poll works but ties up a worker thread while it waits, and a stream is
+only delivered when it closes.
+
+The stream starts at `Last-Event-ID` (sent by EventSource on reconnect) or
+`?after=`, and without either at the newest event, so a fresh client loads
+/api/donation/received/ once and then only applies events. It sends each
+event as `id: <event id>`, `event: donation.created|donation.status` and the
+event JSON, a comment line every NOTIFICATION_HEARTBEAT_SECONDS to keep
+proxies from timing it out, and closes after NOTIFICATION_STREAM_SECONDS;
+the client reconnects with the last id it saw.
+
+A cursor older than the retained events (events.cursor_expired) can't be
+resumed from: the stream then starts with an `event: reset` carrying the
+current id, and the long-poll answers 410 Gone with `last_event_id`. Either
+way the client reloads /api/donation/received/ and carries on from that id.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import permissions, status
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from auth_app.authentication import get_profile_id
+from orphanage.models import OrphanageProfile
+from orphancare_proj.async_views import AsyncReadView
+from orphancare_proj.params import bounded
+from . import events
+from .serializers import DonationEventSerializer
+
+KEEPALIVE = b": keepalive\n\n"
+
+
+def get_heartbeat():
+    return getattr(settings, "NOTIFICATION_HEARTBEAT_SECONDS", 15)
+
+
+def get_stream_seconds():
+    return getattr(settings, "NOTIFICATION_STREAM_SECONDS", 300)
+
+
+def get_retry_ms():
+    return getattr(settings, "NOTIFICATION_RETRY_MS", 3000)
+
+
+def get_max_wait():
+    return getattr(settings, "NOTIFICATION_POLL_MAX_WAIT", 30)
+
+
+class DonationEventView(APIView):
+    """Authentication, permissions and throttling for the async views below."""
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "events"
+
+    def get_orphanage_id(self):
+        try:
+            return get_profile_id(self.request, OrphanageProfile)
+        except OrphanageProfile.DoesNotExist:
+            raise PermissionDenied("Only orphanages receive donation events.")
+
+    def get_after(self):
+        """The last event id the client has seen, or None for "from now on"."""
+        value = self.request.headers.get("Last-Event-ID") or self.request.query_params.get("after")
+        if value in (None, ""):
+            return None
+        try:
+            after = int(value)
+        except ValueError:
+            raise ValidationError({"after": "Must be an event id."})
+        if after < 0:
+            raise ValidationError({"after": "Must be an event id."})
+        return after
+
+    def serialize(self, rows):
+        return DonationEventSerializer(rows, many=True, context={"request": self.request}).data
+
+
+class DonationEventPollView(AsyncReadView):
+    """
+    GET ?after=<event id>[&wait=25]: the events after `after` as soon as
+    there are any, or none after `wait` seconds. Without `after` it answers
+    straight away with the current `last_event_id` to poll from.
+    """
+    view_class = DonationEventView
+
+    async def build(self, view, request):
+        orphanage_id = await sync_to_async(view.get_orphanage_id)()
+        after = view.get_after()
+        if after is None:
+            return Response({"events": [], "last_event_id": await sync_to_async(events.latest_id)(orphanage_id)})
+
+        if await sync_to_async(events.cursor_expired)(orphanage_id, after):
+            return Response(
+                {
+                    "detail": "Events after this id are no longer kept; reload the donation list.",
+                    "last_event_id": await sync_to_async(events.latest_id)(orphanage_id),
+                },
+                status=status.HTTP_410_GONE,
+            )
+
+        wait = bounded(request.query_params.get("wait"), get_max_wait(), get_max_wait())
+        rows = await events.next_events(orphanage_id, after, wait)
+        return Response({
+            "events": view.serialize(rows),
+            "last_event_id": rows[-1].id if rows else after,
+        })
+
+
+class DonationEventStreamView(AsyncReadView):
+    """Server-Sent Events; see the module docstring."""
+    view_class = DonationEventView
+
+    async def build(self, view, request):
+        orphanage_id = await sync_to_async(view.get_orphanage_id)()
+        after, reset = view.get_after(), False
+        if after is not None and await sync_to_async(events.cursor_expired)(orphanage_id, after):
+            after, reset = None, True
+        if after is None:
+            after = await sync_to_async(events.latest_id)(orphanage_id)
+
+        response = StreamingHttpResponse(
+            self.stream(view, orphanage_id, after, reset), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # nginx would otherwise buffer the stream
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def format(self, data):
+        body = JSONRenderer().render(data).decode("utf-8")
+        return f"id: {data['id']}\nevent: donation.{data['kind']}\ndata: {body}\n\n".encode("utf-8")
+
+    def format_reset(self, after):
+        body = JSONRenderer().render({"last_event_id": after}).decode("utf-8")
+        return f"id: {after}\nevent: reset\ndata: {body}\n\n".encode("utf-8")
+
+    async def stream(self, view, orphanage_id, after, reset=False):
+        loop = asyncio.get_running_loop()
+        closes_at = loop.time() + get_stream_seconds()
+        limit = events.get_batch_size()
+        # the first chunk (retry hint, reset and backlog) goes out straight away
+        chunk, timeout = f"retry: {get_retry_ms()}\n\n".encode("ascii"), 0
+        if reset:
+            chunk += self.format_reset(after)
+        while True:
+            rows = await events.next_events(orphanage_id, after, timeout, limit)
+            if rows:
+                chunk += b"".join(self.format(data) for data in view.serialize(rows))
+                after = rows[-1].id
+            yield chunk or KEEPALIVE
+            chunk = b""
+
+            remaining = closes_at - loop.time()
+            if remaining <= 0:
+                return
+            # a full batch means more backlog: read on without waiting
+            timeout = 0 if len(rows) == limit else min(get_heartbeat(), remaining)
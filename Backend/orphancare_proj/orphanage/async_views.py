@@ -0,0 +1,26 @@
+# orphanage/async_views.py
+"""Async versions of the public orphanage reads (see orphancare_proj.async_views)."""
+from django.db.models import Count, Max
+
+from orphancare_proj.async_views import AsyncListView, AsyncRetrieveView
+from .models import OrphanageProfile
+from .views import OrphanageListView, OrphanageProfilePublicView
+
+
+class AsyncOrphanageListView(AsyncListView):
+    view_class = OrphanageListView
+
+    async def aget_validators(self, view):
+        latest = await OrphanageProfile.objects.aaggregate(latest=Max("updated_at"), total=Count("id"))
+        return [(latest["latest"], (latest["total"],))]
+
+
+class AsyncOrphanageProfilePublicView(AsyncRetrieveView):
+    view_class = OrphanageProfilePublicView
+
+    async def aget_validators(self, view):
+        updated_at = await (
+            OrphanageProfile.objects.filter(pk=view.kwargs["pk"])
+            .values_list("updated_at", flat=True).afirst()
+        )
+        return [] if updated_at is None else [(updated_at, ())]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orphanage', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orphanageprofile',
+            name='established_on',
+            field=models.DateField(null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orphanage', '0002_orphanageprofile_established_on'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orphanageprofile',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='orphanageprofile',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='orphanageprofile',
+            index=models.Index(fields=['latitude', 'longitude'], name='orphanage_lat_lon_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orphanage', '0003_orphanageprofile_latitude_orphanageprofile_longitude_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orphanageprofile',
+            name='banner_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
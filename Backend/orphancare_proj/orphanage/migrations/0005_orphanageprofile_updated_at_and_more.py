@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orphanage', '0004_orphanageprofile_banner_renditions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orphanageprofile',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='orphanageprofile',
+            index=models.Index(fields=['updated_at'], name='orphanage_updated_idx'),
+        ),
+    ]
@@ -30,6 +30,23 @@ class OrphanageProfile(models.Model):
 
     # NEW: Banner Image
     banner_image = models.ImageField(upload_to="orphanage_banners/", blank=True, null=True)
+    # Resized copies of banner_image, written by the process_images worker
+    banner_renditions = models.JSONField(default=dict, blank=True, editable=False)
+
+    # Resolved from pincode on save (geo.signals)
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
+
+    # Bumped by every write, including queryset.update() paths (see
+    # orphancare_proj.conditional)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # bounding-box prefilter for nearby lookups (geo.locator.nearest)
+            models.Index(fields=["latitude", "longitude"], name="orphanage_lat_lon_idx"),
+            models.Index(fields=["updated_at"], name="orphanage_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.orphanage_name} - {self.id}"
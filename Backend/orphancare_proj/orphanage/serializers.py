@@ -1,19 +1,26 @@
 from rest_framework import serializers
+from imaging.fields import RenditionsField, RenditionURLField
+from orphancare_proj.instrumentation import TimedSerializerMixin
 from .models import OrphanageProfile
 
-class OrphanageProfileSerializer(serializers.ModelSerializer):
+class OrphanageProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    banner_renditions = RenditionsField()
+
     class Meta:
         model = OrphanageProfile
         fields = [
             "id", "user", "orphanage_name", "description",
             "address", "city", "state", "pincode", "phone_number",
             "email", "total_orphans", "boys_count", "girls_count", 
-            "students_count", "registration_no", "website", "verified","banner_image","established_on","email"
+            "students_count", "registration_no", "website", "verified","banner_image","banner_renditions","established_on","email"
         ]       
         read_only_fields = ["user", "verified"]
 
 
-class OrphanageListSerializer(serializers.ModelSerializer):
+class OrphanageListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    # list cards only need the thumbnail, not the raw upload
+    banner_image = RenditionURLField("banner_image", "banner_renditions", "thumbnail")
+
     class Meta:
         model = OrphanageProfile
         fields = [
@@ -1,10 +1,12 @@
 from django.urls import path
-from .views import OrphanageProfileCreateView, OrphanageProfileDetailView,OrphanageListView,OrphanageProfilePublicView
+from orphancare_proj.async_views import public_view
+from .async_views import AsyncOrphanageListView, AsyncOrphanageProfilePublicView
+from .views import OrphanageProfileCreateView, OrphanageProfileDetailView
 
 urlpatterns = [
     path('create/', OrphanageProfileCreateView.as_view(), name='orphanage-create'),
     path('me/', OrphanageProfileDetailView.as_view(), name='orphanage-detail'),
-    path('list/', OrphanageListView.as_view(), name='orphanage-list'),
-    path("<int:pk>/", OrphanageProfilePublicView.as_view(), name="orphanage-public-detail"),
+    path('list/', public_view(AsyncOrphanageListView), name='orphanage-list'),
+    path("<int:pk>/", public_view(AsyncOrphanageProfilePublicView), name="orphanage-public-detail"),
 
 ]
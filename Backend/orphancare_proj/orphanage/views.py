@@ -1,7 +1,11 @@
+from django.db.models import Count, Max
 from rest_framework import generics, permissions
 from .models import OrphanageProfile
 from .serializers import OrphanageProfileSerializer,OrphanageListSerializer,OrphanageProfileSerializer
 from rest_framework.permissions import AllowAny
+from orphancare_proj.conditional import ConditionalGetMixin
+from orphancare_proj.db_router import ReplicaReadMixin
+from orphancare_proj.pagination import OrphanagePagination
 
 
 
@@ -22,14 +26,28 @@ class OrphanageProfileDetailView(generics.RetrieveUpdateAPIView):
 
 
 
-class OrphanageListView(generics.ListAPIView):
+class OrphanageListView(ReplicaReadMixin, ConditionalGetMixin, generics.ListAPIView):
     queryset = OrphanageProfile.objects.all()
     serializer_class = OrphanageListSerializer
     permission_classes = [AllowAny]
+    pagination_class = OrphanagePagination
+    throttle_scope = "public"
 
+    def get_validators(self):
+        latest = OrphanageProfile.objects.aggregate(latest=Max("updated_at"), total=Count("id"))
+        return [(latest["latest"], (latest["total"],))]
 
 
-class OrphanageProfilePublicView(generics.RetrieveAPIView):
+
+class OrphanageProfilePublicView(ReplicaReadMixin, ConditionalGetMixin, generics.RetrieveAPIView):
     queryset = OrphanageProfile.objects.all()
     serializer_class = OrphanageProfileSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_scope = "public"
+
+    def get_validators(self):
+        updated_at = (
+            OrphanageProfile.objects.filter(pk=self.kwargs["pk"])
+            .values_list("updated_at", flat=True).first()
+        )
+        return [] if updated_at is None else [(updated_at, ())]
@@ -3,6 +3,10 @@ ASGI config for orphancare_proj project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve it with gunicorn_asgi.conf.py:
+
+    gunicorn -c gunicorn_asgi.conf.py orphancare_proj.asgi:application
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -12,5 +16,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'orphancare_proj.settings')
+# async public read views (orphancare_proj/async_views.py); set to 0 to serve
+# the DRF views through the sync thread instead
+os.environ.setdefault("ASYNC_PUBLIC_VIEWS", "1")
 
 application = get_asgi_application()
@@ -0,0 +1,110 @@
+# orphancare_proj/async_views.py
+"""
+Async serving path for the anonymous read endpoints.
+
+With ASYNC_PUBLIC_VIEWS on (orphancare_proj/asgi.py turns it on under ASGI),
+the URLconfs serve the public orphanage and requirement reads with the views
+in each app's async_views.py instead of their DRF generics. Each async view
+wraps the DRF view it replaces (`view_class`) and reuses its configuration:
+serializer, pagination, throttle scope, replica routing, feed cache and
+conditional GET validators. Bodies, ETags and error responses are the same on
+both paths.
+
+Rows come from the async ORM (aget, aiterator) with select_related covering
+everything the serializer reads, so serializing them is CPU only: a lazy
+query on the event loop would raise SynchronousOnlyOperation. The remaining
+sync work (authentication, throttling, cache bookkeeping) goes through
+sync_to_async. Responses are rendered to plain HttpResponses here so Django
+doesn't hop to a thread to render them.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .db_router import _read_alias
+
+
+def public_view(async_view):
+    """The view function for a URLconf: `async_view` if ASYNC_PUBLIC_VIEWS, else the DRF view it wraps."""
+    if getattr(settings, "ASYNC_PUBLIC_VIEWS", False):
+        return async_view.as_view()
+    return async_view.view_class.as_view()
+
+
+class AsyncReadView(View):
+    """
+    Serves GET for a DRF `view_class` asynchronously. Subclasses implement
+    `build(view, request)` returning a DRF Response, and may implement
+    `aget_validators(view)` for conditional GET.
+    """
+    view_class = None
+    http_method_names = ["get", "head", "options"]
+
+    def get_drf_view(self, request, *args, **kwargs):
+        # JSON only: the browsable API renders forms with sync queries
+        view = self.view_class(renderer_classes=[JSONRenderer])
+        view.setup(request, *args, **kwargs)
+        view.format_kwarg = None
+        view.request = view.initialize_request(request, *args, **kwargs)
+        view.headers = view.default_response_headers
+        return view
+
+    async def get(self, request, *args, **kwargs):
+        view = self.get_drf_view(request, *args, **kwargs)
+        token = _read_alias.set(None)
+        try:
+            try:
+                # authentication, permissions, throttles, replica choice
+                await sync_to_async(view.initial)(view.request, *args, **kwargs)
+                response = await self.respond(view, view.request)
+            except Exception as exc:
+                response = view.handle_exception(exc)
+            return self.render(view, response)
+        finally:
+            _read_alias.reset(token)
+
+    async def respond(self, view, request):
+        validators = await self.aget_validators(view)
+        if not validators:
+            return await self.build(view, request)
+
+        etag, last_modified, response = view.evaluate_validators(request, validators)
+        if response is None:
+            response = await self.build(view, request)
+        return view.set_validator_headers(response, etag, last_modified)
+
+    async def aget_validators(self, view):
+        return []
+
+    async def build(self, view, request):
+        raise NotImplementedError
+
+    def render(self, view, response):
+        if not isinstance(response, Response):
+            return response  # 304 / 412 from the conditional check
+        response = view.finalize_response(view.request, response)
+        response.render()
+        return HttpResponse(response.content, status=response.status_code, headers=response.headers)
+
+
+class AsyncListView(AsyncReadView):
+    async def build(self, view, request):
+        queryset = view.filter_queryset(view.get_queryset())
+        page = await view.paginator.apaginate_queryset(queryset, request, view=view)
+        return view.paginator.get_paginated_response(view.get_serializer(page, many=True).data)
+
+
+class AsyncRetrieveView(AsyncReadView):
+    async def build(self, view, request):
+        queryset = view.filter_queryset(view.get_queryset())
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        try:
+            instance = await queryset.aget(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+        except (ObjectDoesNotExist, TypeError, ValueError):
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+        view.check_object_permissions(request, instance)
+        return Response(view.get_serializer(instance).data)
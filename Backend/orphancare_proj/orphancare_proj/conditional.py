@@ -0,0 +1,71 @@
+# orphancare_proj/conditional.py
+"""
+Conditional GET (ETag / Last-Modified) for public read views.
+
+Validators come from the `updated_at` columns of the rows a view shows, read
+with a couple of indexed aggregate queries, never from hashing the rendered
+body. When the client's copy is current the view answers 304 before any
+row is fetched or serialized.
+
+A view lists its validator sources in `get_validators()` as
+(latest updated_at, extra parts) pairs. Extra parts are values such as a row
+count that also change when rows leave the result (deletes, fulfilment) but
+leave the newest updated_at as it was. The requirement feeds keep their
+validators in the versioned feed cache (requirement.cache).
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    Views implement `get_validators()` returning a list of
+    (datetime or None, tuple) pairs. A view with no validators (e.g. the
+    object doesn't exist) is served normally.
+    """
+
+    def get_validators(self):
+        raise NotImplementedError
+
+    def get_etag(self, request, validators):
+        parts = [
+            type(self).__name__,
+            request.get_host(),  # pagination links are absolute
+            request.GET.urlencode(),
+            getattr(request, "accepted_media_type", ""),
+        ]
+        for timestamp, extra in validators:
+            parts.append(timestamp.timestamp() if timestamp else "")
+            parts.extend(extra)
+        digest = hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()[:32]
+        return quote_etag(digest)
+
+    def evaluate_validators(self, request, validators):
+        """
+        (etag, last_modified, response): the response is a 304/412 when the
+        client's conditional headers say so, else None.
+        """
+        etag = self.get_etag(request, validators)
+        timestamps = [timestamp for timestamp, _ in validators if timestamp]
+        last_modified = int(max(timestamps).timestamp()) if timestamps else None
+        return etag, last_modified, get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+    def set_validator_headers(self, response, etag, last_modified):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        # make clients revalidate rather than reuse a heuristically "fresh" copy
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if not validators:
+            return super().get(request, *args, **kwargs)
+
+        etag, last_modified, response = self.evaluate_validators(request, validators)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return self.set_validator_headers(response, etag, last_modified)
@@ -0,0 +1,123 @@
+# orphancare_proj/db_router.py
+"""
+Read/write splitting between `default` and the replica aliases in
+DATABASE_REPLICAS (built from DATABASE_REPLICA_URLS in settings).
+
+Only views that opt in with ReplicaReadMixin read from a replica, and only
+for safe methods; everything else, every write and anything inside a
+transaction stays on `default`. A client that has just written (a non-safe
+request that succeeded) is pinned to `default` for
+DATABASE_REPLICA_STICKY_SECONDS, so they read their own writes while the
+replicas catch up. Clients are told apart by user id, or by address when
+anonymous; the pin lives in the shared cache so every worker sees it.
+
+The chosen alias is held in a context variable for the duration of the
+view, which keeps it per request under both WSGI threads and ASGI tasks.
+"""
+import contextvars
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+_read_alias = contextvars.ContextVar("orphancare_read_alias", default=None)
+
+
+def get_replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def get_sticky_seconds():
+    return getattr(settings, "DATABASE_REPLICA_STICKY_SECONDS", 5)
+
+
+def choose_replica():
+    return random.choice(get_replicas())
+
+
+def current_read_alias():
+    """The replica this request reads from, or None when it reads the primary."""
+    return _read_alias.get()
+
+
+def client_key(request):
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        ident = f"user:{user.pk}"
+    else:
+        forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+        ident = "ip:" + (forwarded.split(",")[0].strip() or request.META.get("REMOTE_ADDR", ""))
+    return f"db:primary-pin:{ident}"
+
+
+def pin_to_primary(request):
+    cache.set(client_key(request), 1, get_sticky_seconds())
+
+
+def is_pinned(request):
+    return cache.get(client_key(request)) is not None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same rows as the primary
+        return True
+
+
+class ReplicaReadMixin:
+    """Serve a DRF view's safe requests from a replica unless the client is pinned."""
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _read_alias.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        # authentication and permission checks above read from the primary
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and get_replicas() and not is_pinned(request):
+            _read_alias.set(choose_replica())
+
+
+class PrimaryStickinessMiddleware:
+    """Pins a client to the primary after each successful write."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.wrote(request, response):
+            # DRF has set request.user by now, so JWT clients are keyed by user
+            pin_to_primary(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.wrote(request, response):
+            # request.user may still be the lazy session user, which queries
+            await sync_to_async(pin_to_primary)(request)
+        return response
+
+    def wrote(self, request, response):
+        return request.method not in SAFE_METHODS and response.status_code < 400 and get_replicas()
@@ -0,0 +1,292 @@
+# orphancare_proj/instrumentation.py
+"""
+Per-request timing: DB queries, serializer, render and view time.
+
+Results go out as one JSON log line per request on the "orphancare.perf"
+logger and, for staff users (or everyone with PERF_SERVER_TIMING_PUBLIC), a
+`Server-Timing` header visible in browser dev tools:
+
+    {"route": "api/donation/received/", "namespace": "donation", "status": 200,
+     "total_ms": 41.2, "view_ms": 35.0, "db_ms": 12.8, "queries": 2,
+     "serializer_ms": 18.1, "render_ms": 4.9, "slowest_query_ms": 11.9}
+
+The N slowest queries seen per route are kept in memory (SQL only, never
+parameters) and served to admins by SlowQueriesView.
+
+Instrumentation is off by default and enabled per URL namespace with
+PERF_INSTRUMENTATION_NAMESPACES ("*" for all). Includes without an explicit
+namespace use the app label of the view's module, so "donation" covers
+everything under /api/donation/. Serializer time only covers serializers
+that opt in with TimedSerializerMixin.
+
+Overhead is two perf_counter() calls and a heap push per query, and nothing
+at all for namespaces that are switched off.
+"""
+import contextvars
+import heapq
+import json
+import logging
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework import permissions, serializers
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .throttling import throttle_stats
+
+logger = logging.getLogger("orphancare.perf")
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+_slow_queries = {}
+_slow_queries_lock = threading.Lock()
+
+
+def get_sample_size():
+    return getattr(settings, "PERF_SLOW_QUERY_SAMPLES", 5)
+
+
+def enabled_namespaces():
+    value = getattr(settings, "PERF_INSTRUMENTATION_NAMESPACES", [])
+    if isinstance(value, str):
+        value = [name.strip() for name in value.split(",") if name.strip()]
+    return set(value)
+
+
+def server_timing_allowed(request):
+    """Server-Timing exposes query counts and timings: staff only by default."""
+    if getattr(settings, "PERF_SERVER_TIMING_PUBLIC", False):
+        return True
+    user = getattr(request, "user", None)
+    # a session user nothing has loaded: loading it here could query from
+    # async code, and a view that never authenticated has no staff to show
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return False
+    return bool(getattr(user, "is_staff", False))
+
+
+def namespace_for(match):
+    if match.namespace:
+        return match.namespace.split(":")[0]
+    return match.func.__module__.split(".")[0]
+
+
+class RequestMetrics:
+    def __init__(self, route, namespace):
+        self.route = route
+        self.namespace = namespace
+        self.queries = 0
+        self.db = 0.0
+        self.serializer = 0.0
+        self.render = 0.0
+        self.serializer_depth = 0
+        # min-heap of (seconds, sql), the slowest `sample_size` queries
+        self.slowest = []
+        self.sample_size = get_sample_size()
+
+    # connection.execute_wrapper hook
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.db += elapsed
+            if len(self.slowest) < self.sample_size:
+                heapq.heappush(self.slowest, (elapsed, sql))
+            elif self.slowest and elapsed > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (elapsed, sql))
+
+    def server_timing(self, view, total):
+        parts = [
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+            f"ser;dur={self.serializer * 1000:.1f}",
+            f"render;dur={self.render * 1000:.1f}",
+            f"view;dur={view * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ]
+        return ", ".join(parts)
+
+    def as_log(self, request, status, view, total):
+        return {
+            "route": self.route,
+            "namespace": self.namespace,
+            "method": request.method,
+            "status": status,
+            "total_ms": round(total * 1000, 2),
+            "view_ms": round(view * 1000, 2),
+            "db_ms": round(self.db * 1000, 2),
+            "queries": self.queries,
+            "serializer_ms": round(self.serializer * 1000, 2),
+            "render_ms": round(self.render * 1000, 2),
+            "slowest_query_ms": round(max(self.slowest)[0] * 1000, 2) if self.slowest else 0.0,
+        }
+
+
+# ---------- slow query samples ----------
+
+def record_slow_queries(metrics):
+    if not metrics.slowest:
+        return
+    with _slow_queries_lock:
+        heap = _slow_queries.setdefault(metrics.route, [])
+        for sample in metrics.slowest:
+            if len(heap) < metrics.sample_size:
+                heapq.heappush(heap, sample)
+            elif sample[0] > heap[0][0]:
+                heapq.heapreplace(heap, sample)
+
+
+def slow_queries():
+    """{route: [{"ms": .., "sql": ..}, ...]}, slowest first."""
+    with _slow_queries_lock:
+        return {
+            route: [{"ms": round(seconds * 1000, 2), "sql": sql} for seconds, sql in sorted(heap, reverse=True)]
+            for route, heap in _slow_queries.items()
+        }
+
+
+def reset_slow_queries():
+    with _slow_queries_lock:
+        _slow_queries.clear()
+
+
+# ---------- serializer timing ----------
+
+class TimedSerializerMixin:
+    """
+    Counts `.data` towards the request's serializer time. Only the outermost
+    call counts, so a nested serializer isn't added up twice; `many=True`
+    lists are timed as a whole.
+    """
+
+    @property
+    def data(self):
+        metrics = _current.get()
+        if metrics is None:
+            return super().data
+        metrics.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().data
+        finally:
+            metrics.serializer_depth -= 1
+            if not metrics.serializer_depth:
+                metrics.serializer += time.perf_counter() - start
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        serializer = super().many_init(*args, **kwargs)
+        if type(serializer) is serializers.ListSerializer:
+            serializer.__class__ = TimedListSerializer
+        return serializer
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    pass
+
+
+# ---------- middleware ----------
+
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics = self.detach(request)
+        return self.report(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics = self.detach(request)
+        return self.report(request, response, metrics, start)
+
+    def detach(self, request):
+        metrics = getattr(request, "_perf_metrics", None)
+        if metrics is not None:
+            # the connections of the thread process_view ran in (under ASGI,
+            # the request's sync thread, which also runs its async ORM queries)
+            for wrapper in request._perf_connections:
+                wrapper.execute_wrappers.remove(metrics)
+            try:
+                _current.reset(request._perf_token)
+            except ValueError:
+                # under ASGI process_view runs in a sync_to_async thread, so
+                # the token belongs to a copy of this context
+                _current.set(None)
+        return metrics
+
+    def report(self, request, response, metrics, start):
+        if metrics is None:
+            return response
+        total = time.perf_counter() - start
+        view = time.perf_counter() - request._perf_view_start - metrics.render
+        if server_timing_allowed(request):
+            response["Server-Timing"] = metrics.server_timing(view, total)
+        logger.info(json.dumps(metrics.as_log(request, response.status_code, view, total)))
+        record_slow_queries(metrics)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        namespace = namespace_for(match)
+        enabled = enabled_namespaces()
+        if "*" not in enabled and namespace not in enabled:
+            return None
+
+        metrics = RequestMetrics(match.route, namespace)
+        request._perf_connections = [connections[alias] for alias in connections]
+        for wrapper in request._perf_connections:
+            wrapper.execute_wrappers.append(metrics)
+        request._perf_metrics = metrics
+        request._perf_token = _current.set(metrics)
+        request._perf_view_start = time.perf_counter()
+        return None
+
+    def process_template_response(self, request, response):
+        metrics = getattr(request, "_perf_metrics", None)
+        if metrics is not None:
+            # DRF responses are rendered right after this hook returns
+            render_start = time.perf_counter()
+
+            def rendered(response):
+                metrics.render += time.perf_counter() - render_start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+class SlowQueriesView(APIView):
+    """Slowest sampled queries per route since the process started (admins only)."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(slow_queries())
+
+
+class ThrottleStatsView(APIView):
+    """Allowed/throttled counts per throttle scope since the process started (admins only)."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(throttle_stats())
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, close_old_connections
+
+from orphancare_proj.sqlite import CHECKPOINT_MODES, checkpoint, is_sqlite
+
+
+class Command(BaseCommand):
+    help = (
+        "Checkpoint the SQLite write-ahead log into the database file. "
+        "TRUNCATE (the default) also shrinks the -wal file back to zero."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            "--mode", default="TRUNCATE", type=str.upper, choices=CHECKPOINT_MODES,
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep checkpointing every --interval seconds instead of exiting.",
+        )
+        parser.add_argument("--interval", type=float, default=60.0)
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        if not is_sqlite(alias):
+            raise CommandError(f"Database {alias!r} is not SQLite; nothing to checkpoint.")
+
+        try:
+            while True:
+                busy, wal_pages, checkpointed = checkpoint(alias, options["mode"])
+                if busy:
+                    self.stdout.write(
+                        self.style.WARNING(f"Checkpoint blocked by a reader or writer: {checkpointed}/{wal_pages} pages")
+                    )
+                else:
+                    self.stdout.write(f"Checkpointed {checkpointed}/{wal_pages} WAL pages ({options['mode']})")
+                if not options["loop"]:
+                    break
+                close_old_connections()
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,162 @@
+# orphancare_proj/pagination.py
+import base64
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque-cursor keyset pagination.
+
+    The cursor holds the ordering values of the last row on the page, and the
+    next page is fetched with `WHERE (ordering) > (cursor) LIMIT n` instead of
+    OFFSET, so page 500 costs the same as page 1. The last ordering field must
+    be unique (normally `id`) so ties on the leading fields are never skipped.
+    """
+    ordering = ("id",)
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self):
+        self.page_size = getattr(settings, "API_PAGE_SIZE", 20)
+        self.max_page_size = getattr(settings, "API_MAX_PAGE_SIZE", 100)
+
+    # ---------- request parsing ----------
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode("ascii"))
+            values = json.loads(raw.decode("utf-8"))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [self.to_python(model, name.lstrip("-"), value) for name, value in zip(self.ordering, values)]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def to_python(self, model, name, value):
+        """Cursor value -> ordering value; override for annotated ordering names."""
+        return model._meta.get_field(name).to_python(value)
+
+    def encode_cursor(self, instance):
+        values = []
+        for name in self.ordering:
+            value = getattr(instance, name.lstrip("-"))
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    # ---------- keyset filter ----------
+
+    def get_keyset_filter(self, values):
+        """
+        Rows strictly after `values` in `self.ordering`, i.e. for (-a, b):
+        a < va OR (a = va AND b > vb)
+
+        An expanded OR/AND chain rather than a row-value comparison
+        `(a, b) > (va, vb)`: that only works when every field sorts the same
+        way, and most orderings here mix a descending date with `id`.
+        """
+        condition = Q()
+        equal = Q()
+        for name, value in zip(self.ordering, values):
+            field = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def get_page_queryset(self, queryset, request):
+        """The rows of the requested page, plus one more if there is a next page."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.current_page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        values = self.decode_cursor(request, queryset.model)
+        if values is not None:
+            queryset = queryset.filter(self.get_keyset_filter(values))
+
+        # one extra row tells us whether there is a next page
+        return queryset[:self.current_page_size + 1]
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.current_page_size
+        page = rows[:self.current_page_size]
+        self.next_cursor = self.encode_cursor(page[-1]) if self.has_next else None
+        return page
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() for async views (orphancare_proj.async_views)."""
+        return self.set_page([row async for row in self.get_page_queryset(queryset, request).aiterator()])
+
+    # ---------- response ----------
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class OrphanagePagination(KeysetPagination):
+    ordering = ("id",)
+
+
+class RequirementPagination(KeysetPagination):
+    ordering = ("-posted_date", "id")
+
+
+class UrgentRequirementPagination(KeysetPagination):
+    # `remaining` is annotated by UrgentRequirementListView (req_urgent_idx order)
+    ordering = ("deadline", "-remaining", "id")
+
+    def to_python(self, model, name, value):
+        if name == "remaining":
+            return int(value)
+        return super().to_python(model, name, value)
+
+
+class DonationPagination(KeysetPagination):
+    ordering = ("-donation_date", "id")
+
+
+class RecommendationPagination(KeysetPagination):
+    ordering = ("-score", "id")
@@ -0,0 +1,13 @@
+# orphancare_proj/params.py
+
+
+def bounded(value, default, maximum, cast=int):
+    """
+    A query parameter cast with `cast` and clamped to [1, maximum], or
+    `default` when it is missing or malformed.
+    """
+    try:
+        value = cast(value)
+    except (TypeError, ValueError):
+        return default
+    return min(max(value, 1), maximum)
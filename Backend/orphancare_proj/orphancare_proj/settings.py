@@ -13,7 +13,9 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 import os
-# import dj_database_url
+import dj_database_url
+
+from orphancare_proj.sqlite import production_options
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -53,9 +55,21 @@ INSTALLED_APPS = [
     "orphanage",
     "donation",
     "requirement",
+    "outbox",
+    "search",
+    "geo",
+    "imaging",
+    "bench",
+    "dashboard",
+    "stats",
+    "recommendation",
+    "notification",
+    # project-wide management commands (checkpoint_sqlite)
+    "orphancare_proj",
 ]
 
 MIDDLEWARE = [
+    "orphancare_proj.instrumentation.PerformanceMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -64,8 +78,16 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    "orphancare_proj.db_router.PrimaryStickinessMiddleware",
 ]
 
+# Server-Timing headers + "orphancare.perf" log lines (orphancare_proj/instrumentation.py).
+# Comma-separated URL namespaces / app labels, e.g. "donation,requirement"; "*" = all, "" = off.
+PERF_INSTRUMENTATION_NAMESPACES = os.environ.get("PERF_INSTRUMENTATION_NAMESPACES", "")
+# Server-Timing goes to staff users only unless this is on
+PERF_SERVER_TIMING_PUBLIC = os.environ.get("PERF_SERVER_TIMING_PUBLIC", "0") == "1"
+PERF_SLOW_QUERY_SAMPLES = 5
+
 ROOT_URLCONF = 'orphancare_proj.urls'
 
 TEMPLATES = [
@@ -98,15 +120,92 @@ WSGI_APPLICATION = 'orphancare_proj.wsgi.application'
 
 # else:
 
+# DATABASE_URL (dj-database-url syntax) picks the primary; SQLite by default.
 DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / 'db.sqlite3',
-
-       }
+    "default": dj_database_url.config(default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
+}
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    # File-backed test DB: multi-threaded tests then get SQLite's normal
+    # busy-timeout locking instead of shared-cache "table is locked" errors.
+    DATABASES["default"]["TEST"] = {"NAME": BASE_DIR / "test_db.sqlite3"}
+
+# Production SQLite profile (WAL, BEGIN IMMEDIATE, busy timeout, ...), see
+# orphancare_proj/sqlite.py. SQLITE_PRODUCTION=0 restores Django's defaults.
+SQLITE_PRODUCTION = os.environ.get("SQLITE_PRODUCTION", "1") == "1"
+SQLITE_OPTIONS = production_options(
+    busy_timeout_ms=int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 20_000)),
+    mmap_size=int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+    cache_size_kib=int(os.environ.get("SQLITE_CACHE_SIZE_KIB", 64 * 1024)),
+    wal_autocheckpoint=int(os.environ.get("SQLITE_WAL_AUTOCHECKPOINT", 1000)),
+)
+
+# Read replicas: comma-separated URLs become aliases replica1, replica2, ...
+# Safe requests to public views read from them (orphancare_proj/db_router.py);
+# a client that just wrote reads from the primary for the sticky window.
+# To try it locally with two SQLite files:
+#   python manage.py migrate && cp db.sqlite3 replica.sqlite3
+#   DATABASE_REPLICA_URLS=sqlite:///replica.sqlite3 python manage.py runserver
+DATABASE_REPLICAS = []
+for number, url in enumerate(filter(None, os.environ.get("DATABASE_REPLICA_URLS", "").split(",")), 1):
+    alias = f"replica{number}"
+    DATABASES[alias] = dj_database_url.parse(url.strip())
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+
+if SQLITE_PRODUCTION:
+    for config in DATABASES.values():
+        if config["ENGINE"] == "django.db.backends.sqlite3":
+            config["OPTIONS"] = {**SQLITE_OPTIONS, **config.get("OPTIONS", {})}
+DATABASE_ROUTERS = ["orphancare_proj.db_router.ReplicaRouter"]
+DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get("DATABASE_REPLICA_STICKY_SECONDS", 5))
+
+
+
+# Cache
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# backend (redis, memcached, database) when running several workers.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "orphancare"),
     }
+}
 
-
+# Serialized requirement feeds (requirement/cache.py)
+REQUIREMENT_FEED_CACHE_ALIAS = "default"
+REQUIREMENT_FEED_CACHE_TIMEOUT = int(os.environ.get("REQUIREMENT_FEED_CACHE_TIMEOUT", 300))
+
+# Rows accepted per bulk requirement import (requirement/bulk.py)
+REQUIREMENT_BULK_MAX_ROWS = 500
+
+# Rows flipped per transaction by `manage.py expire_requirements` (requirement/expiry.py)
+REQUIREMENT_EXPIRY_BATCH_SIZE = 500
+
+# Stats rollups (stats/rollups.py): each incremental run re-reads this much
+# history behind its watermark to catch late-committing writes
+STATS_ROLLUP_OVERLAP_SECONDS = int(os.environ.get("STATS_ROLLUP_OVERLAP_SECONDS", 300))
+STATS_ROLLUP_MAX_INCREMENTAL_KEYS = 5000
+
+# Donor recommendations (recommendation/engine.py): list length per donor,
+# score weights, the horizons urgency and remaining need are scaled to, and
+# the overlap window re-read behind the refresh watermark
+RECOMMENDATION_LIMIT = 50
+RECOMMENDATION_WEIGHTS = {"locality": 0.35, "category": 0.3, "urgency": 0.2, "need": 0.15}
+RECOMMENDATION_URGENCY_DAYS = 30
+RECOMMENDATION_NEED_SCALE = 100
+RECOMMENDATION_MAX_INCREMENTAL_DONORS = 5000
+RECOMMENDATION_OVERLAP_SECONDS = int(os.environ.get("RECOMMENDATION_OVERLAP_SECONDS", 300))
+
+# Donation events pushed to orphanages (notification/). The broker wakes open
+# streams when an event commits: LocalBroker reaches streams in the same
+# process, CacheBroker also reaches other workers through a shared cache.
+NOTIFICATION_BROKER = os.environ.get("NOTIFICATION_BROKER", "notification.broker.LocalBroker")
+NOTIFICATION_CACHE = "default"
+NOTIFICATION_CACHE_POLL_SECONDS = 0.5
+NOTIFICATION_HEARTBEAT_SECONDS = 15
+NOTIFICATION_STREAM_SECONDS = 300
+NOTIFICATION_POLL_MAX_WAIT = 30
+NOTIFICATION_EVENT_RETENTION_DAYS = 7
 
 
 # Password validation
@@ -158,13 +257,47 @@ AUTH_USER_MODEL = "auth_app.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWTAuthentication + the profile_id claim (auth_app/authentication.py)
+        "auth_app.authentication.ProfileJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # no-ops unless the view sets throttle_scope (see API_THROTTLE_RATES)
+    "DEFAULT_THROTTLE_CLASSES": (
+        "orphancare_proj.throttling.IPThrottle",
+        "orphancare_proj.throttling.AccountThrottle",
+    ),
 }
 
+# Sliding-window budgets per view throttle_scope (orphancare_proj/throttling.py),
+# per client IP and per account (email in the body, or the signed-in user)
+API_THROTTLE_ENABLED = os.environ.get("API_THROTTLE_ENABLED", "1") == "1"
+API_THROTTLE_CACHE = "default"
+API_THROTTLE_RATES = {
+    "register": {"ip": "10/hour"},
+    "verify_otp": {"ip": "30/10m", "account": "5/10m"},
+    "token": {"ip": "30/min", "account": "10/10m"},
+    "public": {"ip": "300/min"},
+    # donation ledger exports stream whole histories
+    "export": {"account": "30/hour"},
+    # event stream reconnects and long-polls (each one waits up to 30s)
+    "events": {"account": "120/min"},
+}
+
+# Rows fetched (and written out) per chunk by the donation exports (donation/export.py)
+DONATION_EXPORT_CHUNK_SIZE = int(os.environ.get("DONATION_EXPORT_CHUNK_SIZE", 2000))
+
+# Serve the public orphanage/requirement reads with async views
+# (orphancare_proj/async_views.py). asgi.py turns this on by default; under
+# WSGI the DRF views are faster, so leave it off there.
+ASYNC_PUBLIC_VIEWS = os.environ.get("ASYNC_PUBLIC_VIEWS", "0") == "1"
+
+# Keyset pagination for list endpoints (see orphancare_proj/pagination.py);
+# clients can ask for a different size with ?page_size= up to the max.
+API_PAGE_SIZE = int(os.environ.get("API_PAGE_SIZE", 20))
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", 100))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -172,6 +305,10 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# OTPs are stored as HMAC-SHA256(OTP_HASH_KEY, "email:code"); rotating the
+# key invalidates codes already sent
+OTP_HASH_KEY = os.environ.get("OTP_HASH_KEY", SECRET_KEY)
+
 # EMAIL CONFIG (Gmail SMTP)
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = "smtp.gmail.com"
@@ -181,5 +318,35 @@ EMAIL_HOST_USER = "dsakshay128@gmail.com"
 EMAIL_HOST_PASSWORD = "xqpb liwc kbyg nqex"    
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
-
- 
\ No newline at end of file
+# OUTBOX (emails are queued by the API and sent by `manage.py send_outbox`)
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_BACKOFF_SECONDS = 30
+OUTBOX_MAX_BACKOFF_SECONDS = 3600
+OUTBOX_LOCK_TIMEOUT_SECONDS = 300
+
+# IMAGE RENDITIONS (built off the request thread by `manage.py process_images`)
+IMAGE_RENDITION_FORMAT = os.environ.get("IMAGE_RENDITION_FORMAT", "WEBP")  # or "JPEG"
+IMAGE_RENDITION_QUALITY = int(os.environ.get("IMAGE_RENDITION_QUALITY", 80))
+IMAGE_JOB_MAX_ATTEMPTS = 3
+IMAGE_JOB_LOCK_TIMEOUT_SECONDS = 300
+
+
+ 
+# LOGGING (per-request timing lines from orphancare_proj/instrumentation.py)
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "perf": {"format": "%(asctime)s perf %(message)s"},
+    },
+    "handlers": {
+        "perf_console": {"class": "logging.StreamHandler", "formatter": "perf"},
+    },
+    "loggers": {
+        "orphancare.perf": {
+            "handlers": ["perf_console"],
+            "level": os.environ.get("PERF_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
@@ -0,0 +1,74 @@
+# orphancare_proj/testing.py
+import re
+import unittest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from auth_app.models import User
+from donor.models import DonorProfile
+from orphanage.models import OrphanageProfile
+
+FULL_SCAN = re.compile(r"\bSCAN (?!.*\bUSING\b.*\bINDEX\b)")
+TEMP_SORT = re.compile(r"USE TEMP B-TREE")
+
+
+class QueryPlanMixin:
+    """
+    TestCase mixin that runs EXPLAIN QUERY PLAN over the SELECTs an endpoint
+    issues and fails on full table scans or temp B-tree sorts.
+    """
+
+    def explain(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assert_plan_is_indexed(self, sql, params=()):
+        plan = self.explain(sql, params)
+        bad = [line for line in plan if FULL_SCAN.search(line) or TEMP_SORT.search(line)]
+        self.assertFalse(bad, f"Unindexed plan for:\n{sql}\n" + "\n".join(plan))
+
+    def assert_queryset_is_indexed(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        self.assert_plan_is_indexed(sql, params)
+
+    def assert_endpoint_is_indexed(self, client, url, **params):
+        if connection.vendor != "sqlite":
+            raise unittest.SkipTest("EXPLAIN QUERY PLAN checks are written for SQLite")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+
+        selects = [q["sql"] for q in ctx.captured_queries if q["sql"].lstrip().upper().startswith("SELECT")]
+        self.assertTrue(selects)
+        for sql in selects:
+            self.assert_plan_is_indexed(sql)
+        return response
+
+
+def make_donor(email="donor@example.com", **fields):
+    """A verified donor user and profile; `fields` override the profile's."""
+    user = User.objects.create_user(email=email, password="pass", role="donor", is_active=True)
+    profile = DonorProfile.objects.create(**{
+        "user": user, "full_name": "Donor", "contact_number": "9999999999", "email": email, **fields,
+    })
+    return user, profile
+
+
+def make_orphanage(email="home@example.com", name="Home", **fields):
+    """A verified orphanage user and profile in Bengaluru 560001; `fields` override the profile's."""
+    user = User.objects.create_user(email=email, password="pass", role="orphanage", is_active=True)
+    profile = OrphanageProfile.objects.create(**{
+        "user": user,
+        "orphanage_name": name,
+        "address": "1 Street",
+        "city": "Bengaluru",
+        "state": "Karnataka",
+        "pincode": "560001",
+        "phone_number": "8888888888",
+        "email": email,
+        **fields,
+    })
+    return user, profile
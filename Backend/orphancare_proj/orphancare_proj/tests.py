@@ -0,0 +1,393 @@
+import json
+import time
+from io import StringIO
+
+from asgiref.sync import async_to_sync
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, AsyncRequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import path, reverse
+from rest_framework.request import Request
+from rest_framework.serializers import BaseSerializer
+from rest_framework.test import APIClient
+
+from auth_app.models import User
+from donation.models import Donation
+from orphancare_proj.testing import make_donor, make_orphanage
+from orphanage.async_views import AsyncOrphanageListView, AsyncOrphanageProfilePublicView
+from requirement.cache import get_cache
+from requirement.async_views import AsyncOrphanageRequirementByOrphanageView, AsyncPublicRequirementListView
+from requirement.models import OrphanageRequirement
+from . import db_router
+from .instrumentation import reset_slow_queries, slow_queries
+from .throttling import IPThrottle, reset_throttle_stats, throttle_stats
+
+
+# ROOT_URLCONF for AsyncReadViewTests: the async views as an ASGI deployment serves them
+urlpatterns = [
+    path("api/orphanage/list/", AsyncOrphanageListView.as_view(), name="orphanage-list"),
+]
+
+
+@override_settings(PERF_INSTRUMENTATION_NAMESPACES="*", PERF_SERVER_TIMING_PUBLIC=True)
+class PerformanceMiddlewareTests(TestCase):
+    def setUp(self):
+        reset_slow_queries()
+        self.client = APIClient()
+        _, donor = make_donor()
+        self.orphanage_user, orphanage = make_orphanage()
+        Donation.objects.bulk_create(
+            Donation(donor=donor, orphanage=orphanage, item_name=f"Item {i}") for i in range(30)
+        )
+        self.client.force_authenticate(self.orphanage_user)
+        self.url = reverse("orphanage-donations")
+
+    def timings(self, response):
+        timings = {}
+        for part in response["Server-Timing"].split(", "):
+            name, *params = part.split(";")
+            timings[name] = dict(param.split("=", 1) for param in params)
+        return timings
+
+    def test_server_timing_header(self):
+        response = self.client.get(self.url)
+
+        timings = self.timings(response)
+        self.assertEqual(set(timings), {"db", "ser", "render", "view", "total"})
+        self.assertEqual(timings["db"]["desc"], '"2 queries"')
+        self.assertGreater(float(timings["ser"]["dur"]), 0)
+        self.assertGreaterEqual(float(timings["total"]["dur"]), float(timings["view"]["dur"]))
+        # the query hook is removed again once the request is done
+        self.assertEqual(connection.execute_wrappers, [])
+
+    @override_settings(PERF_SERVER_TIMING_PUBLIC=False)
+    def test_server_timing_is_for_staff(self):
+        self.assertFalse(self.client.get(self.url).has_header("Server-Timing"))
+        self.orphanage_user.is_staff = True
+        self.orphanage_user.save()
+        self.assertTrue(self.client.get(self.url).has_header("Server-Timing"))
+        # nor for anonymous callers, whose requests are still logged
+        self.client.force_authenticate(None)
+        with self.assertLogs("orphancare.perf", "INFO"):
+            response = self.client.get(reverse("requirement-public"))
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_serializer_timing_is_opt_in(self):
+        # serializers without TimedSerializerMixin are left alone
+        self.assertEqual(BaseSerializer.__dict__["data"].fget.__module__, "rest_framework.serializers")
+
+    def test_structured_log_line(self):
+        with self.assertLogs("orphancare.perf", "INFO") as logs:
+            self.client.get(self.url)
+
+        line = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(line["route"], "api/donation/received/")
+        self.assertEqual(line["namespace"], "donation")
+        self.assertEqual((line["status"], line["queries"]), (200, 2))
+
+    def test_slow_queries_are_sampled_per_route_without_params(self):
+        with self.settings(PERF_SLOW_QUERY_SAMPLES=1):
+            self.client.get(self.url)
+            self.client.get(self.url)
+
+        samples = slow_queries()["api/donation/received/"]
+        self.assertEqual(len(samples), 1)
+        # SQL is kept with its placeholders, never the bound values
+        self.assertIn("%s", samples[0]["sql"])
+
+        admin = User.objects.create_superuser(email="admin@example.com", password="pass")
+        self.client.force_authenticate(admin)
+        self.assertIn("api/donation/received/", self.client.get(reverse("perf-slow-queries")).data)
+
+    def test_enabled_per_namespace(self):
+        with self.settings(PERF_INSTRUMENTATION_NAMESPACES="requirement,auth_app"):
+            self.assertFalse(self.client.get(self.url).has_header("Server-Timing"))
+            self.assertTrue(self.client.get(reverse("requirement-public")).has_header("Server-Timing"))
+        with self.settings(PERF_INSTRUMENTATION_NAMESPACES=""):
+            self.assertFalse(self.client.get(reverse("requirement-public")).has_header("Server-Timing"))
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        _, self.orphanage = make_orphanage()
+        self.requirement = OrphanageRequirement.objects.create(
+            orphanage=self.orphanage, item_name="Rice", category="food", quantity_needed=10
+        )
+        self.urls = [
+            reverse("orphanage-list"),
+            reverse("orphanage-public-detail", args=[self.orphanage.pk]),
+            reverse("requirement-public"),
+            reverse("requirement-by-orphanage", args=[self.orphanage.pk]),
+        ]
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_resources_return_304_without_serializing(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first.status_code, 200)
+                self.assertTrue(first["ETag"].startswith('"'))
+                self.assertIn("Last-Modified", first)
+
+                # requirement feeds keep their validators in the feed cache
+                with patch.object(BaseSerializer, "to_representation") as to_representation, \
+                        self.assertNumQueries(0 if "requirement" in url else 1):
+                    second = self.revalidate(url, first["ETag"])
+                self.assertEqual(second.status_code, 304)
+                self.assertEqual(second.content, b"")
+                to_representation.assert_not_called()
+                self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_if_modified_since(self):
+        url = self.urls[1]
+        first = self.client.get(url)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_with_rows(self):
+        etags = [self.client.get(url)["ETag"] for url in self.urls]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.orphanage.orphanage_name = "Renamed"
+            self.orphanage.save()
+        for url, etag in zip(self.urls, etags):
+            with self.subTest(url=url):
+                response = self.revalidate(url, etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], etag)
+
+    def test_requirement_leaving_feed_changes_etag(self):
+        url = self.urls[2]
+        etag = self.client.get(url)["ETag"]
+        # deleted rows leave no updated_at behind; the open count catches them
+        with self.captureOnCommitCallbacks(execute=True):
+            self.requirement.delete()
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_pages_have_distinct_etags(self):
+        url = self.urls[0]
+        self.assertNotEqual(
+            self.client.get(url)["ETag"], self.client.get(url, {"page_size": 1})["ETag"]
+        )
+
+    def test_missing_object_is_still_404(self):
+        response = self.client.get(reverse("orphanage-public-detail", args=[self.orphanage.pk + 100]))
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response)
+
+
+THROTTLE_RATES = {
+    "register": {"ip": "3/min"},
+    "verify_otp": {"ip": "100/min", "account": "2/min"},
+    "public": {"ip": "1000/min"},
+}
+
+
+@override_settings(API_THROTTLE_RATES=THROTTLE_RATES)
+class ThrottleTests(TestCase):
+    def setUp(self):
+        reset_throttle_stats()
+        self.client = APIClient()
+
+    def register(self, n, ip):
+        return self.client.post(
+            reverse("auth_app:register"),
+            {"email": f"user{n}-{ip}@example.com", "password": "S3cure-pass-123", "role": "donor"},
+            REMOTE_ADDR=ip,
+        )
+
+    def test_ip_budget_returns_429_with_retry_after(self):
+        for n in range(3):
+            self.assertEqual(self.register(n, "10.0.0.1").status_code, 201)
+        response = self.register(3, "10.0.0.1")
+        self.assertEqual(response.status_code, 429)
+        # 4 counted: the retry fits once they decay to 2, half way into the next window
+        self.assertTrue(30 <= int(response["Retry-After"]) <= 90)
+        # other addresses have their own budget
+        self.assertEqual(self.register(4, "10.0.0.2").status_code, 201)
+        self.assertEqual(throttle_stats()["register"]["throttled"], 1)
+
+    def test_account_budget_spans_addresses(self):
+        statuses = [
+            self.client.post(
+                reverse("auth_app:verify-otp"), {"email": "target@example.com", "code": "000000"},
+                REMOTE_ADDR=f"10.0.1.{n}",
+            ).status_code
+            for n in range(3)
+        ]
+        self.assertEqual(statuses, [400, 400, 429])
+
+    def test_sliding_window_counts_previous_window(self):
+        throttle, view = IPThrottle(), type("View", (), {"throttle_scope": "register"})()
+        request = APIClient().get("/").wsgi_request
+        request.META["REMOTE_ADDR"] = "10.0.2.1"
+        drf_request = Request(request)
+
+        with patch("orphancare_proj.throttling.time.time", return_value=6000.0):  # start of a window
+            self.assertEqual([throttle.allow_request(drf_request, view) for _ in range(3)], [True] * 3)
+        # half way through the next window, 3 * 0.5 previous + 1 current = 2.5 <= 3
+        with patch("orphancare_proj.throttling.time.time", return_value=6090.0):
+            self.assertTrue(throttle.allow_request(drf_request, view))
+            self.assertFalse(throttle.allow_request(drf_request, view))
+            # a retry at 6120 (next window) sees 2 * 1 + 1 = 3
+            self.assertEqual(throttle.wait(), 30)
+
+    def test_cache_errors_fall_back_to_local_counters(self):
+        broken = MagicMock()
+        broken.get.side_effect = ConnectionError("cache down")
+        with patch("orphancare_proj.throttling.get_cache", return_value=broken):
+            statuses = [self.register(n, "10.0.3.1").status_code for n in range(4)]
+        self.assertEqual(statuses, [201, 201, 201, 429])
+        self.assertEqual(throttle_stats()["register"]["fallback"], 4)
+
+    def test_check_costs_under_a_millisecond(self):
+        throttle, view = IPThrottle(), type("View", (), {"throttle_scope": "public"})()
+        drf_request = Request(APIClient().get("/").wsgi_request)
+        started = time.perf_counter()
+        for _ in range(500):
+            throttle.allow_request(drf_request, view)
+        self.assertLess((time.perf_counter() - started) / 500, 0.001)
+
+    def test_stats_endpoint_is_admin_only(self):
+        self.assertEqual(self.client.get(reverse("throttle-stats")).status_code, 401)
+        self.client.force_authenticate(User.objects.create_superuser(email="admin@example.com", password="pass"))
+        self.register(0, "10.0.4.1")
+        self.assertEqual(self.client.get(reverse("throttle-stats")).data["register"]["allowed"], 1)
+
+
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = db_router.ReplicaRouter()
+
+    def test_router_reads_the_chosen_alias_outside_transactions(self):
+        self.assertIsNone(self.router.db_for_read(OrphanageRequirement))
+        token = db_router._read_alias.set("replica1")
+        try:
+            self.assertEqual(self.router.db_for_write(OrphanageRequirement), "default")
+            # TestCase wraps each test in a transaction: reads stay on the primary
+            self.assertIsNone(self.router.db_for_read(OrphanageRequirement))
+            with patch.object(connection, "in_atomic_block", False):
+                self.assertEqual(self.router.db_for_read(OrphanageRequirement), "replica1")
+        finally:
+            db_router._read_alias.reset(token)
+
+    @override_settings(DATABASE_REPLICAS=["default"], DATABASE_REPLICA_STICKY_SECONDS=30)
+    def test_reads_stick_to_primary_after_own_write(self):
+        user, _ = make_orphanage()
+        client = APIClient()
+        client.force_authenticate(user)
+        url = reverse("requirement-public")
+
+        with patch("orphancare_proj.db_router.choose_replica", wraps=db_router.choose_replica) as choose:
+            client.get(url)
+            self.assertEqual(choose.call_count, 1)
+
+            response = client.post(reverse("requirement-bulk"), [{"item_name": "Rice", "quantity_needed": 5}], format="json")
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(client.get(url).status_code, 200)
+            self.assertEqual(choose.call_count, 1)
+
+            # other clients still read from a replica
+            APIClient().get(url, REMOTE_ADDR="10.0.5.1")
+            self.assertEqual(choose.call_count, 2)
+
+    @override_settings(DATABASE_REPLICAS=["default"])
+    def test_writes_and_private_views_ignore_replicas(self):
+        user, _ = make_orphanage()
+        client = APIClient()
+        client.force_authenticate(user)
+        with patch("orphancare_proj.db_router.choose_replica") as choose:
+            client.get(reverse("requirement-list"))
+        choose.assert_not_called()
+        self.assertIsNone(db_router.current_read_alias())
+
+
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        _, self.orphanage = make_orphanage()
+        make_orphanage(email="other@example.com", name="Other")
+        for n in range(3):
+            OrphanageRequirement.objects.create(orphanage=self.orphanage, item_name=f"Item {n}", quantity_needed=5)
+
+    def fetch(self, async_view, path, **kwargs):
+        headers = kwargs.pop("headers", {})
+        request = AsyncRequestFactory().get(path, headers=headers)
+        return async_to_sync(async_view.as_view())(request, **kwargs)
+
+    def test_responses_match_the_drf_views(self):
+        cases = [
+            (AsyncOrphanageListView, reverse("orphanage-list") + "?page_size=1", {}),
+            (AsyncOrphanageProfilePublicView, reverse("orphanage-public-detail", args=[self.orphanage.pk]),
+             {"pk": self.orphanage.pk}),
+            (AsyncPublicRequirementListView, reverse("requirement-public") + "?page_size=2", {}),
+            (AsyncOrphanageRequirementByOrphanageView,
+             reverse("requirement-by-orphanage", args=[self.orphanage.pk]), {"orphanage_id": self.orphanage.pk}),
+        ]
+        for async_view, url, kwargs in cases:
+            with self.subTest(view=async_view.__name__):
+                expected = APIClient().get(url)
+                response = self.fetch(async_view, url, **kwargs)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(json.loads(response.content), expected.json())
+                # validators and ETags are shared, so either path can revalidate
+                self.assertEqual(response["ETag"], expected["ETag"])
+                not_modified = self.fetch(async_view, url, headers={"If-None-Match": expected["ETag"]}, **kwargs)
+                self.assertEqual(not_modified.status_code, 304)
+
+    def test_feed_pages_come_from_the_shared_cache(self):
+        url = reverse("requirement-public")
+        self.assertEqual(APIClient().get(url)["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.fetch(AsyncPublicRequirementListView, url)["X-Cache"], "HIT")
+
+    def test_errors_match_the_drf_views(self):
+        url = reverse("orphanage-public-detail", args=[999])
+        response = self.fetch(AsyncOrphanageProfilePublicView, url, pk=999)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(json.loads(response.content), APIClient().get(url).json())
+
+        invalid = self.fetch(AsyncPublicRequirementListView, reverse("requirement-public") + "?cursor=bogus")
+        self.assertEqual(invalid.status_code, 404)
+
+    @override_settings(API_THROTTLE_RATES={"public": {"ip": "1/min"}})
+    def test_public_throttle_applies(self):
+        url = reverse("orphanage-list")
+        self.assertEqual(self.fetch(AsyncOrphanageListView, url).status_code, 200)
+        response = self.fetch(AsyncOrphanageListView, url)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+    @override_settings(DATABASE_REPLICAS=["default"])
+    def test_reads_go_to_a_replica(self):
+        with patch("orphancare_proj.db_router.choose_replica", return_value="default") as choose:
+            self.assertEqual(self.fetch(AsyncOrphanageListView, reverse("orphanage-list")).status_code, 200)
+        choose.assert_called_once()
+        self.assertIsNone(db_router.current_read_alias())
+
+    @override_settings(
+        ROOT_URLCONF="orphancare_proj.tests",
+        PERF_INSTRUMENTATION_NAMESPACES="*",
+        PERF_SERVER_TIMING_PUBLIC=True,
+    )
+    async def test_served_through_the_async_middleware_stack(self):
+        response = await AsyncClient().get("/api/orphanage/list/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 2)
+        # the async ORM's queries are still counted: validators + page
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+
+
+class CheckpointSqliteTests(TransactionTestCase):
+    def test_truncates_the_wal(self):
+        out = StringIO()
+        call_command("checkpoint_sqlite", stdout=out)
+        self.assertIn("WAL pages (TRUNCATE)", out.getvalue())
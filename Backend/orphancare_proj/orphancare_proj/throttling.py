@@ -0,0 +1,171 @@
+# orphancare_proj/throttling.py
+"""
+Sliding-window rate limits for DRF views.
+
+A view opts in with `throttle_scope = "<scope>"`; API_THROTTLE_RATES maps the
+scope to a budget per dimension:
+
+    "ip"       client address (DRF's get_ident, honours NUM_PROXIES)
+    "account"  the email in the request body (login, OTP verification) or
+               the authenticated user, so one account can't be brute-forced
+               from many addresses
+
+Rates look like "10/min", "5/15m" or "1000/day". Each (scope, dimension,
+ident) keeps two counters, the current and the previous fixed window, and
+the sliding count is estimated as
+
+    previous * (1 - elapsed / window) + current
+
+which costs one get and one incr per check, whatever the budget. The
+counters live in API_THROTTLE_CACHE (shared across workers when that cache
+is). If the cache errors, checks fall back to a process-local cache rather
+than failing the request. Throttled requests get a 429 with Retry-After
+(DRF sets the header from `wait()`).
+"""
+import hashlib
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+# no rest_framework.views import here: DRF loads this module while
+# building APIView (DEFAULT_THROTTLE_CLASSES)
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+RATE_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*(s|sec|second|m|min|minute|h|hour|d|day)s?\s*$")
+UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_local_cache = LocMemCache("orphancare-throttle-fallback", {})
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def parse_rate(rate):
+    """"5/15m" -> (5, 900). Raises ValueError for anything else."""
+    match = RATE_RE.match(rate or "")
+    if not match:
+        raise ValueError(f"Invalid throttle rate {rate!r}")
+    count, multiplier, unit = match.groups()
+    return int(count), int(multiplier or 1) * UNIT_SECONDS[unit[0]]
+
+
+def count(scope, outcome):
+    with _stats_lock:
+        _stats[(scope, outcome)] += 1
+
+
+def throttle_stats():
+    """{scope: {"allowed": n, "throttled": n}, ...} plus fallback uses, for this process."""
+    with _stats_lock:
+        result = {}
+        for (scope, outcome), value in _stats.items():
+            result.setdefault(scope, {"allowed": 0, "throttled": 0, "fallback": 0})[outcome] = value
+        return result
+
+
+def reset_throttle_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def get_cache():
+    return caches[getattr(settings, "API_THROTTLE_CACHE", "default")]
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    dimension = None
+
+    def get_ident_for(self, request):
+        raise NotImplementedError
+
+    def get_rate(self, view):
+        scope = getattr(view, "throttle_scope", None)
+        if not scope or not getattr(settings, "API_THROTTLE_ENABLED", True):
+            return None, None
+        rate = getattr(settings, "API_THROTTLE_RATES", {}).get(scope, {}).get(self.dimension)
+        return scope, rate
+
+    def allow_request(self, request, view):
+        scope, rate = self.get_rate(view)
+        if rate is None:
+            return True
+        ident = self.get_ident_for(request)
+        if ident is None:
+            return True
+
+        self.limit, self.window = parse_rate(rate)
+        now = time.time()
+        index = int(now // self.window)
+        self.elapsed = now - index * self.window
+        prefix = f"throttle:{scope}:{self.dimension}:{ident}:"
+        current_key, previous_key = f"{prefix}{index}", f"{prefix}{index - 1}"
+
+        try:
+            self.previous, self.current = self.read(get_cache(), previous_key, current_key)
+        except Exception:
+            logger.warning("Throttle cache unavailable; using process-local counters", exc_info=True)
+            count(scope, "fallback")
+            self.previous, self.current = self.read(_local_cache, previous_key, current_key)
+
+        if self.estimate(self.current) > self.limit:
+            count(scope, "throttled")
+            return False
+        count(scope, "allowed")
+        return True
+
+    def read(self, cache, previous_key, current_key):
+        """Count this request and return (previous window, current window) totals."""
+        previous = cache.get(previous_key, 0)
+        try:
+            return previous, cache.incr(current_key)
+        except ValueError:
+            # first request of the window; counters must outlive the next one
+            if cache.add(current_key, 1, timeout=self.window * 2):
+                return previous, 1
+            return previous, cache.incr(current_key)
+
+    def estimate(self, current):
+        return self.previous * (1 - self.elapsed / self.window) + current
+
+    def wait(self):
+        """Seconds until a retry (which counts too) fits the budget, if idle."""
+        remaining = self.window - self.elapsed
+        if self.current < self.limit and self.previous:
+            # the previous window's share decays within this window
+            needed = self.window * (1 - (self.limit - self.current - 1) / self.previous)
+            return max(math.ceil(round(needed - self.elapsed, 6)), 1)
+        # this window alone is over budget: wait until it has decayed enough
+        # as the previous one
+        excess = max(self.window * (1 - (self.limit - 1) / self.current), 0)
+        return max(math.ceil(round(remaining + excess, 6)), 1)
+
+
+class IPThrottle(SlidingWindowThrottle):
+    dimension = "ip"
+
+    def get_ident_for(self, request):
+        return self.get_ident(request)
+
+
+class AccountThrottle(SlidingWindowThrottle):
+    dimension = "account"
+
+    def get_ident_for(self, request):
+        email = None
+        if hasattr(request.data, "get"):
+            email = request.data.get("email")
+        if isinstance(email, str) and email.strip():
+            ident = email.strip().lower()
+        elif request.user and request.user.is_authenticated:
+            ident = str(request.user.pk)
+        else:
+            return None
+        # emails aren't safe cache keys everywhere (memcached)
+        return hashlib.sha1(ident.encode()).hexdigest()
@@ -19,6 +19,8 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path,include
 
+from .instrumentation import SlowQueriesView, ThrottleStatsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("api/auth/", include("auth_app.urls", namespace="auth_app")),
@@ -26,6 +28,14 @@ urlpatterns = [
     path('api/donor/', include('donor.urls')),
     path('api/donation/', include('donation.urls')),
     path('api/requirement/', include('requirement.urls')),
+    path('api/search/', include('search.urls')),
+    path('api/geo/', include('geo.urls')),
+    path('api/dashboard/', include('dashboard.urls')),
+    path('api/stats/', include('stats.urls')),
+    path('api/recommendation/', include('recommendation.urls')),
+    path('api/notification/', include('notification.urls')),
+    path('api/perf/slow-queries/', SlowQueriesView.as_view(), name='perf-slow-queries'),
+    path('api/perf/throttles/', ThrottleStatsView.as_view(), name='throttle-stats'),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,21 @@
+from django.contrib import admin
+from .models import OutboxEmail
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "to_email",
+        "subject",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+    )
+
+    list_filter = ("status",)
+
+    search_fields = ("to_email", "subject")
+
+    ordering = ("-created_at",)
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from outbox.worker import process_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails, retrying failures with exponential backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Concurrent SMTP senders.")
+        parser.add_argument("--batch-size", type=int, default=50, help="Emails claimed per batch.")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting once it is drained.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the outbox is empty (with --loop).",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"])
+        batch_size = max(1, options["batch_size"])
+
+        total_claimed = total_sent = 0
+        try:
+            while True:
+                claimed, sent = process_outbox(workers=workers, batch_size=batch_size)
+                total_claimed += claimed
+                total_sent += sent
+
+                if claimed:
+                    self.stdout.write(f"Sent {sent}/{claimed} emails")
+                    continue
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Outbox drained: {total_sent} sent, {total_claimed - total_sent} deferred")
+        )
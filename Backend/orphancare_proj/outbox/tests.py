@@ -0,0 +1,85 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from auth_app.models import User
+from .models import OutboxEmail
+from .utils import enqueue_email
+from .worker import process_outbox
+
+
+class OutboxWorkerTests(TestCase):
+    def test_register_queues_otp_email_without_sending(self):
+        client = APIClient()
+        response = client.post(
+            reverse("auth_app:register"),
+            {"email": "new@example.com", "password": "S3cure-pass-123", "role": "donor"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        queued = OutboxEmail.objects.get()
+        self.assertEqual(queued.to_email, "new@example.com")
+        self.assertEqual(queued.status, "pending")
+
+    def test_outbox_row_rolls_back_with_business_row(self):
+        with mock.patch("auth_app.views.OTP.create_otp_for_user", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                APIClient().post(
+                    reverse("auth_app:register"),
+                    {"email": "x@example.com", "password": "S3cure-pass-123", "role": "donor"},
+                    format="json",
+                )
+        self.assertFalse(User.objects.filter(email="x@example.com").exists())
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_worker_sends_and_marks_sent(self):
+        enqueue_email("a@example.com", "Hello", "Body")
+        enqueue_email("b@example.com", "Hello", "Body")
+
+        claimed, sent = process_outbox(workers=1, batch_size=10)
+
+        self.assertEqual((claimed, sent), (2, 2))
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertFalse(OutboxEmail.objects.exclude(status="sent").exists())
+
+    def test_failed_send_is_retried_with_backoff(self):
+        email = enqueue_email("a@example.com", "Hello", "Body")
+
+        with mock.patch("outbox.worker.EmailMessage.send", side_effect=OSError("relay down")):
+            claimed, sent = process_outbox(workers=1, batch_size=10)
+
+        self.assertEqual((claimed, sent), (1, 0))
+        email.refresh_from_db()
+        self.assertEqual(email.status, "pending")
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("relay down", email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+
+        # Not due yet: nothing is claimed until the backoff elapses
+        self.assertEqual(process_outbox(workers=1, batch_size=10), (0, 0))
+
+    def test_gives_up_after_max_attempts(self):
+        email = enqueue_email("a@example.com", "Hello", "Body")
+        OutboxEmail.objects.filter(id=email.id).update(attempts=4)
+
+        with self.settings(OUTBOX_MAX_ATTEMPTS=5), \
+                mock.patch("outbox.worker.EmailMessage.send", side_effect=OSError("relay down")):
+            process_outbox(workers=1, batch_size=10)
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, "failed")
+
+    def test_stale_claim_is_recovered(self):
+        email = enqueue_email("a@example.com", "Hello", "Body")
+        OutboxEmail.objects.filter(id=email.id).update(
+            status="sending", locked_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(process_outbox(workers=1, batch_size=10), (1, 1))
@@ -0,0 +1,20 @@
+# outbox/utils.py
+from django.db import transaction
+from .models import OutboxEmail
+
+
+def enqueue_email(to_email, subject, message):
+    """
+    Queue an email for the outbox worker.
+
+    Call this inside the transaction that writes the business row: the email
+    row commits (or rolls back) together with it, and the API can return
+    without waiting on SMTP. The savepoint lets callers swallow a failed
+    insert without breaking the surrounding transaction.
+    """
+    with transaction.atomic():
+        return OutboxEmail.objects.create(
+            to_email=to_email,
+            subject=subject,
+            message=message,
+        )
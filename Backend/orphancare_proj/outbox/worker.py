@@ -0,0 +1,138 @@
+# outbox/worker.py
+import logging
+import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection, EmailMessage
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+def get_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def backoff_delay(attempts):
+    """
+    Exponential backoff with jitter: base * 2^(attempts-1), capped.
+    """
+    base = get_setting("OUTBOX_BACKOFF_SECONDS", 30)
+    cap = get_setting("OUTBOX_MAX_BACKOFF_SECONDS", 3600)
+    delay = min(cap, base * (2 ** max(attempts - 1, 0)))
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_batch(batch_size):
+    """
+    Atomically claim up to `batch_size` due emails for this worker.
+
+    Rows stuck in "sending" longer than OUTBOX_LOCK_TIMEOUT_SECONDS (a worker
+    that died mid-send) are picked up again. The conditional UPDATE on a fresh
+    claim token means concurrent workers never claim the same row.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=get_setting("OUTBOX_LOCK_TIMEOUT_SECONDS", 300))
+    due = (
+        Q(status="pending", next_attempt_at__lte=now)
+        | Q(status="sending", locked_at__lt=stale_before)
+    )
+
+    ids = list(
+        OutboxEmail.objects.filter(due)
+        .order_by("next_attempt_at")
+        .values_list("id", flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+
+    token = uuid.uuid4()
+    OutboxEmail.objects.filter(due, id__in=ids).update(
+        status="sending", claim_token=token, locked_at=now
+    )
+    return list(OutboxEmail.objects.filter(claim_token=token, status="sending"))
+
+
+def mark_failed(email, error):
+    attempts = email.attempts + 1
+    max_attempts = get_setting("OUTBOX_MAX_ATTEMPTS", 5)
+    give_up = attempts >= max_attempts
+
+    OutboxEmail.objects.filter(id=email.id, claim_token=email.claim_token).update(
+        status="failed" if give_up else "pending",
+        attempts=attempts,
+        next_attempt_at=timezone.now() + backoff_delay(attempts),
+        last_error=str(error)[:2000],
+        claim_token=None,
+        locked_at=None,
+    )
+    if give_up:
+        logger.error("Outbox email %s failed permanently: %s", email.id, error)
+    else:
+        logger.warning("Outbox email %s failed (attempt %s): %s", email.id, attempts, error)
+
+
+def deliver(emails):
+    """
+    Send a list of claimed emails over a single SMTP connection.
+    """
+    sent = 0
+    connection = get_connection(fail_silently=False)
+    for email in emails:
+        try:
+            EmailMessage(
+                subject=email.subject,
+                body=email.message,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[email.to_email],
+                connection=connection,
+            ).send()
+        except Exception as e:
+            mark_failed(email, e)
+            continue
+
+        OutboxEmail.objects.filter(id=email.id, claim_token=email.claim_token).update(
+            status="sent",
+            attempts=email.attempts + 1,
+            sent_at=timezone.now(),
+            last_error="",
+            claim_token=None,
+            locked_at=None,
+        )
+        sent += 1
+    connection.close()
+    return sent
+
+
+def _deliver_in_thread(emails):
+    # Pool threads open their own DB connections; release them on exit.
+    try:
+        return deliver(emails)
+    finally:
+        connections.close_all()
+
+
+def process_outbox(workers=4, batch_size=50):
+    """
+    Claim one batch and send it concurrently on `workers` threads.
+    Returns (claimed, sent).
+    """
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0, 0
+
+    chunks = [emails[i::workers] for i in range(workers)]
+    chunks = [chunk for chunk in chunks if chunk]
+    if len(chunks) == 1:
+        return len(emails), deliver(chunks[0])
+
+    with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+        sent = sum(pool.map(_deliver_in_thread, chunks))
+    return len(emails), sent
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import Recommendation, RefreshWatermark, StaleDonor
+
+
+@admin.register(Recommendation)
+class RecommendationAdmin(admin.ModelAdmin):
+    list_display = ("donor", "requirement", "score")
+    raw_id_fields = ("donor", "requirement")
+
+
+@admin.register(StaleDonor)
+class StaleDonorAdmin(admin.ModelAdmin):
+    list_display = ("donor", "queued_at")
+
+
+@admin.register(RefreshWatermark)
+class RefreshWatermarkAdmin(admin.ModelAdmin):
+    list_display = ("name", "value")
@@ -0,0 +1,343 @@
+# recommendation/engine.py
+"""
+Scores open requirements for each donor and keeps the donor's best
+RECOMMENDATION_LIMIT in the Recommendation table.
+
+    score = w_locality * locality   1 same pincode, 0.5 same city, else 0
+          + w_category * affinity   share of the donor's donations (not
+                                    cancelled) in the requirement's category
+          + w_urgency  * urgency    1 on the deadline, falling to 0 at
+                                    RECOMMENDATION_URGENCY_DAYS out (0 without one)
+          + w_need     * need       units still needed, log-scaled to reach 1
+                                    at RECOMMENDATION_NEED_SCALE
+
+Open means not fulfilled, something left to give and the deadline not past.
+
+Urgency and need are the same for every donor (a requirement's `base`), and
+the rest only depends on the category and on whether the requirement is in
+the donor's pincode or city. So the open requirements are kept sorted by
+base per category, per (city, category) and per (pincode, category), and a
+donor's exact top LIMIT is a merge of the heads of those lists (Index.top):
+about LIMIT steps per donor, however many requirements are open.
+
+Refresh works like stats.rollups: a watermark on updated_at (kept in
+RefreshWatermark), re-reading an overlap window behind it. Lists are
+written in batches of donors, one short transaction each (like
+requirement.expiry), and only the watermark moves in the last one, so a
+refresh never holds SQLite's write lock for long. An incremental run
+rebuilds the lists of
+
+    - donors queued in StaleDonor (new profile, city/pincode changed),
+    - donors whose donations changed (category affinity),
+    - donors whose list holds a changed requirement (its score moved, or it
+      closed and the list needs refilling),
+    - donors a changed requirement now scores above the bottom of their list.
+
+Urgency moves with the calendar and deleted rows leave no updated_at behind,
+so schedule a nightly full=True run as well.
+"""
+import heapq
+import math
+from collections import defaultdict
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from donation.models import Donation
+from donor.models import DonorProfile
+from requirement.models import OrphanageRequirement
+from .models import Recommendation, RefreshWatermark, StaleDonor
+
+WATERMARK = "recommendations"
+DEFAULT_WEIGHTS = {"locality": 0.35, "category": 0.3, "urgency": 0.2, "need": 0.15}
+SAME_PINCODE = 1.0
+SAME_CITY = 0.5
+# donations that say nothing about what a donor likes to give
+IGNORED_STATUSES = ("cancelled",)
+BATCH_SIZE = 5000
+
+
+def get_weights():
+    return {**DEFAULT_WEIGHTS, **getattr(settings, "RECOMMENDATION_WEIGHTS", {})}
+
+
+def get_limit():
+    return getattr(settings, "RECOMMENDATION_LIMIT", 50)
+
+
+def get_urgency_days():
+    return getattr(settings, "RECOMMENDATION_URGENCY_DAYS", 30)
+
+
+def get_need_scale():
+    return getattr(settings, "RECOMMENDATION_NEED_SCALE", 100)
+
+
+def get_max_donors():
+    """Above this many donors to rebuild, a full rebuild is cheaper."""
+    return getattr(settings, "RECOMMENDATION_MAX_INCREMENTAL_DONORS", 5000)
+
+
+def get_overlap():
+    return timedelta(seconds=getattr(settings, "RECOMMENDATION_OVERLAP_SECONDS", 300))
+
+
+def get_watermark(name):
+    return RefreshWatermark.objects.filter(name=name).values_list("value", flat=True).first()
+
+
+def set_watermark(name, value):
+    RefreshWatermark.objects.update_or_create(name=name, defaults={"value": value})
+
+
+def normalize_city(city):
+    return (city or "").strip().lower()
+
+
+def open_requirements(today):
+    return OrphanageRequirement.objects.filter(
+        Q(deadline__isnull=True) | Q(deadline__gte=today),
+        is_fulfilled=False,
+        is_expired=False,
+        quantity_needed__gt=F("quantity_received"),
+    )
+
+
+def urgency(deadline, today, days):
+    if deadline is None:
+        return 0.0
+    return max(0.0, 1 - (deadline - today).days / days)
+
+
+def need(remaining, scale):
+    return min(1.0, math.log1p(remaining) / math.log1p(scale))
+
+
+class Candidate(NamedTuple):
+    id: int
+    category: str
+    city: str
+    pincode: str
+    base: float
+
+
+class Donor(NamedTuple):
+    id: int
+    city: str
+    pincode: str
+    affinity: dict
+
+
+def donor_features(donor_ids=None):
+    """Donor tuples with their category affinity (all donors when None)."""
+    donors = DonorProfile.objects.order_by("id")
+    donations = Donation.objects.filter(requirement__isnull=False).exclude(status__in=IGNORED_STATUSES)
+    if donor_ids is not None:
+        donors = donors.filter(id__in=donor_ids)
+        donations = donations.filter(donor_id__in=donor_ids)
+
+    counts = defaultdict(dict)
+    for row in donations.values("donor_id", "requirement__category").order_by().annotate(n=Count("id")):
+        counts[row["donor_id"]][row["requirement__category"]] = row["n"]
+
+    for donor_id, city, pincode in donors.values_list("id", "city", "pincode").iterator(chunk_size=BATCH_SIZE):
+        by_category = counts.get(donor_id, {})
+        total = sum(by_category.values())
+        affinity = {category: n / total for category, n in by_category.items()}
+        yield Donor(donor_id, normalize_city(city), (pincode or "").strip(), affinity)
+
+
+class Index:
+    """The open requirements, arranged for per-donor top-LIMIT lookups."""
+
+    def __init__(self, today=None):
+        self.today = today or timezone.localdate()
+        self.weights = get_weights()
+        self.limit = get_limit()
+        days, scale = get_urgency_days(), get_need_scale()
+
+        self.by_id = {}
+        # best base first, per category, (city, category) and (pincode, category)
+        self.by_category = defaultdict(list)
+        self.by_city = defaultdict(list)
+        self.by_pincode = defaultdict(list)
+        rows = open_requirements(self.today).values_list(
+            "id", "category", "deadline", "quantity_needed", "quantity_received",
+            "orphanage__city", "orphanage__pincode",
+        )
+        for pk, category, deadline, needed, received, city, pincode in rows.iterator(chunk_size=BATCH_SIZE):
+            base = (
+                self.weights["urgency"] * urgency(deadline, self.today, days)
+                + self.weights["need"] * need(needed - received, scale)
+            )
+            candidate = Candidate(pk, category, normalize_city(city), (pincode or "").strip(), base)
+            self.by_id[pk] = candidate
+            self.by_category[category].append(candidate)
+            if candidate.city:
+                self.by_city[candidate.city, category].append(candidate)
+            if candidate.pincode:
+                self.by_pincode[candidate.pincode, category].append(candidate)
+        for lists in (self.by_category, self.by_city, self.by_pincode):
+            for candidates in lists.values():
+                candidates.sort(key=lambda c: (-c.base, c.id))
+
+    def score(self, candidate, donor):
+        score = candidate.base + self.weights["category"] * donor.affinity.get(candidate.category, 0.0)
+        if donor.pincode and candidate.pincode == donor.pincode:
+            score += self.weights["locality"] * SAME_PINCODE
+        elif donor.city and candidate.city == donor.city:
+            score += self.weights["locality"] * SAME_CITY
+        return round(score, 6)
+
+    def top(self, donor):
+        """
+        The donor's best LIMIT as (score, requirement_id) pairs. Within each
+        list the donor adds the same bonus to every base, so this is a lazy
+        merge of the lists by base + bonus. A requirement is met first in
+        its most local list, so later sightings are skipped.
+        """
+        lists = []
+        for category, candidates in self.by_category.items():
+            bonus = self.weights["category"] * donor.affinity.get(category, 0.0)
+            lists.append((candidates, bonus))
+            if donor.city and (donor.city, category) in self.by_city:
+                lists.append((self.by_city[donor.city, category], bonus + self.weights["locality"] * SAME_CITY))
+            if donor.pincode and (donor.pincode, category) in self.by_pincode:
+                lists.append((
+                    self.by_pincode[donor.pincode, category], bonus + self.weights["locality"] * SAME_PINCODE
+                ))
+
+        heap = [(-(candidates[0].base + bonus), candidates[0].id, n, 0) for n, (candidates, bonus) in enumerate(lists)]
+        heapq.heapify(heap)
+        top, seen = [], set()
+        while heap and len(top) < self.limit:
+            _, pk, n, position = heapq.heappop(heap)
+            if pk not in seen:
+                seen.add(pk)
+                top.append((self.score(self.by_id[pk], donor), pk))
+            candidates, bonus = lists[n]
+            if position + 1 < len(candidates):
+                following = candidates[position + 1]
+                heapq.heappush(heap, (-(following.base + bonus), following.id, n, position + 1))
+        return top
+
+
+def get_donor_batch_size():
+    """Donors per write transaction: about BATCH_SIZE recommendation rows."""
+    return max(1, BATCH_SIZE // get_limit())
+
+
+def rebuild(index, donor_ids=None):
+    """
+    Replace the lists of `donor_ids` (every donor when None). Returns the donors rebuilt.
+
+    Each batch of donors is swapped in its own short transaction, so a
+    reader sees a donor's old list or new one and SQLite's write lock is
+    never held for more than one batch.
+    """
+    if donor_ids is None:
+        donor_ids = DonorProfile.objects.order_by("id").values_list("id", flat=True)
+    donor_ids = sorted(donor_ids)
+
+    rebuilt, size = 0, get_donor_batch_size()
+    for start in range(0, len(donor_ids), size):
+        batch = donor_ids[start:start + size]
+        # read (and score) outside the transaction, write inside it
+        rows = []
+        for donor in donor_features(batch):
+            rebuilt += 1
+            rows.extend(
+                Recommendation(donor_id=donor.id, requirement_id=requirement_id, score=score)
+                for score, requirement_id in index.top(donor)
+            )
+        with transaction.atomic():
+            Recommendation.objects.filter(donor_id__in=batch).delete()
+            Recommendation.objects.bulk_create(rows)
+    return rebuilt
+
+
+def donors_reached(index, requirement_ids):
+    """
+    Donors whose list holds one of `requirement_ids`, or that one of them
+    (if open) now scores above the bottom of.
+    """
+    donors = set(
+        Recommendation.objects.filter(requirement_id__in=requirement_ids).values_list("donor_id", flat=True)
+    )
+    changed = [index.by_id[pk] for pk in requirement_ids if pk in index.by_id]
+    if not changed:
+        return donors
+
+    # no donor can score a changed requirement above this
+    ceiling = max(c.base for c in changed) + index.weights["category"] + index.weights["locality"]
+    # short lists take anything (None), and so do donors with no rows yet
+    floors = {
+        donor_id: None if rows < index.limit else floor
+        for donor_id, floor, rows in (
+            Recommendation.objects.values("donor_id").order_by()
+            .annotate(floor=Min("score"), rows=Count("id"))
+            .filter(Q(rows__lt=index.limit) | Q(floor__lt=ceiling))
+            .values_list("donor_id", "floor", "rows")
+        )
+    }
+    floors.update(
+        (donor_id, None) for donor_id in DonorProfile.objects.exclude(
+            id__in=Recommendation.objects.values("donor_id")
+        ).values_list("id", flat=True)
+    )
+
+    # past a few thousand ids, reading every donor beats a huge IN list
+    for donor in donor_features(list(floors) if len(floors) <= get_max_donors() else None):
+        if donor.id not in floors:
+            continue
+        floor = floors[donor.id]
+        if floor is None or any(index.score(c, donor) > floor for c in changed):
+            donors.add(donor.id)
+    return donors
+
+
+def changed_since(since):
+    """(donors whose donations changed, requirements that changed) since the watermark."""
+    since = since - get_overlap()
+    donors = set(Donation.objects.filter(updated_at__gte=since).values_list("donor_id", flat=True))
+    requirements = set(
+        OrphanageRequirement.objects.filter(
+            Q(updated_at__gte=since) | Q(orphanage__updated_at__gte=since)
+        ).values_list("id", flat=True)
+    )
+    return donors, requirements
+
+
+def refresh(full=False):
+    """
+    Bring every donor's list up to date. Returns {"donors": lists rebuilt,
+    "full": whether every list was}.
+    """
+    started = timezone.now()
+    since = None if full else get_watermark(WATERMARK)
+    donor_ids = None
+    if since is not None:
+        donor_ids, requirement_ids = changed_since(since)
+        donor_ids |= set(StaleDonor.objects.values_list("donor_id", flat=True))
+        if not donor_ids and not requirement_ids:
+            set_watermark(WATERMARK, started)
+            return {"donors": 0, "full": False}
+
+    index = Index()
+    if donor_ids is not None and requirement_ids:
+        donor_ids |= donors_reached(index, list(requirement_ids))
+    if donor_ids is not None and len(donor_ids) > get_max_donors():
+        donor_ids = None
+
+    # one short transaction per batch of donors; a run that dies part way
+    # leaves the watermark alone and the next run redoes the rest
+    rebuilt = rebuild(index, None if donor_ids is None else list(donor_ids))
+    with transaction.atomic():
+        # rows queued while this ran stay for the next run
+        StaleDonor.objects.filter(queued_at__lt=started).delete()
+        set_watermark(WATERMARK, started)
+    return {"donors": rebuilt, "full": donor_ids is None}
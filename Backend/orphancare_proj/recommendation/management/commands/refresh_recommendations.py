@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from recommendation.engine import refresh
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the donor recommendation lists touched by changes since the last run. "
+        "Schedule it (e.g. every 5 minutes from cron) and add a nightly --full run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true",
+                            help="Rebuild every donor's list (also re-ages deadlines and drops deleted rows).")
+
+    def handle(self, *args, **options):
+        result = refresh(full=options["full"])
+        scope = "all donors" if result["full"] else "changed donors"
+        self.stdout.write(f"{result['donors']} lists rebuilt ({scope})")
+        self.stdout.write(self.style.SUCCESS("Recommendations up to date"))
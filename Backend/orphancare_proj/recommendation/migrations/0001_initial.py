@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('donor', '0002_donorprofile_latitude_donorprofile_longitude'),
+        ('requirement', '0004_orphanagerequirement_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaleDonor',
+            fields=[
+                ('donor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='donor.donorprofile')),
+                ('queued_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Recommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('donor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='donor.donorprofile')),
+                ('requirement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='requirement.orphanagerequirement')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['donor', '-score', 'id'], name='rec_donor_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('requirement', 'donor'), name='rec_requirement_donor_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:06
+
+from django.db import migrations, models
+
+
+def move_watermark(apps, schema_editor):
+    # the recommendations watermark used to be kept with the stats rollups'
+    RollupWatermark = apps.get_model("stats", "RollupWatermark")
+    RefreshWatermark = apps.get_model("recommendation", "RefreshWatermark")
+    for row in RollupWatermark.objects.filter(name="recommendations"):
+        RefreshWatermark.objects.create(name=row.name, value=row.value)
+        row.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendation', '0001_initial'),
+        ('stats', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RefreshWatermark',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(move_watermark, migrations.RunPython.noop),
+    ]
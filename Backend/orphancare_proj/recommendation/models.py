@@ -0,0 +1,46 @@
+"""
+Precomputed "recommended for you" requirement lists, one per donor, kept by
+`manage.py refresh_recommendations` (recommendation/engine.py).
+"""
+from django.db import models
+
+from donor.models import DonorProfile
+from requirement.models import OrphanageRequirement
+
+
+class Recommendation(models.Model):
+    """One of a donor's top RECOMMENDATION_LIMIT open requirements."""
+    donor = models.ForeignKey(DonorProfile, on_delete=models.CASCADE, related_name="+")
+    requirement = models.ForeignKey(OrphanageRequirement, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            # requirement first: also finds the lists holding a changed requirement
+            models.UniqueConstraint(fields=["requirement", "donor"], name="rec_requirement_donor_uniq"),
+        ]
+        indexes = [
+            # the feed: one donor's list, best first (keyset on -score, id)
+            models.Index(fields=["donor", "-score", "id"], name="rec_donor_rank_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.requirement_id} for donor {self.donor_id} ({self.score:.3f})"
+
+
+class RefreshWatermark(models.Model):
+    """Source rows with updated_at before `value` are already in the lists."""
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} @ {self.value}"
+
+
+class StaleDonor(models.Model):
+    """Donors whose list is rebuilt on the next refresh (new profile, moved city/pincode)."""
+    donor = models.OneToOneField(DonorProfile, on_delete=models.CASCADE, primary_key=True, related_name="+")
+    queued_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stale recommendations for donor {self.donor_id}"
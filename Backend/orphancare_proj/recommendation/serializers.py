@@ -0,0 +1,13 @@
+from rest_framework import serializers
+
+from orphancare_proj.instrumentation import TimedSerializerMixin
+from requirement.serializers import OrphanageRequirementSerializer
+from .models import Recommendation
+
+
+class RecommendationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    requirement = OrphanageRequirementSerializer(read_only=True)
+
+    class Meta:
+        model = Recommendation
+        fields = ["score", "requirement"]
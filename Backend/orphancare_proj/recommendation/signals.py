@@ -0,0 +1,24 @@
+# recommendation/signals.py
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from donor.models import DonorProfile
+from .models import StaleDonor
+
+# what a donor's list depends on besides their donations
+LOCALITY_FIELDS = ("city", "pincode")
+
+
+@receiver(pre_save, sender=DonorProfile)
+def remember_locality(sender, instance, **kwargs):
+    if instance._state.adding or instance.pk is None:
+        instance._recommendation_previous = None
+        return
+    instance._recommendation_previous = sender.objects.filter(pk=instance.pk).values_list(*LOCALITY_FIELDS).first()
+
+
+@receiver(post_save, sender=DonorProfile)
+def queue_donor(sender, instance, created, **kwargs):
+    current = tuple(getattr(instance, field) for field in LOCALITY_FIELDS)
+    if created or getattr(instance, "_recommendation_previous", None) != current:
+        StaleDonor.objects.update_or_create(donor_id=instance.pk)
@@ -0,0 +1,194 @@
+import random
+from datetime import date, timedelta
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from donation.models import Donation
+from orphancare_proj.testing import QueryPlanMixin, make_donor, make_orphanage
+from requirement.models import OrphanageRequirement
+from .engine import BATCH_SIZE, Index, donor_features, refresh
+from .models import Recommendation, StaleDonor
+
+
+def add_requirement(orphanage, category="food", needed=10, received=0, deadline=None, **fields):
+    return OrphanageRequirement.objects.create(
+        orphanage=orphanage, item_name=category.title(), category=category,
+        quantity_needed=needed, quantity_received=received, deadline=deadline, **fields
+    )
+
+
+class RecommendationTestCase(TestCase):
+    def setUp(self):
+        self.donor_user, self.donor = make_donor()
+        self.donor.city, self.donor.pincode = "Bengaluru", "560001"
+        self.donor.save()
+        _, self.local = make_orphanage()  # Bengaluru 560001
+        _, self.remote = make_orphanage("far@example.com", "Far")
+        self.remote.city, self.remote.pincode = "Chennai", "600001"
+        self.remote.save()
+
+    def ranked(self, donor=None):
+        return list(
+            Recommendation.objects.filter(donor=donor or self.donor)
+            .order_by("-score", "id").values_list("requirement_id", flat=True)
+        )
+
+
+class ScoringTests(RecommendationTestCase):
+    def test_locality_history_urgency_and_need_rank_requirements(self):
+        today = timezone.localdate()
+        past = add_requirement(self.remote, "clothing")
+        Donation.objects.create(donor=self.donor, orphanage=self.remote, requirement=past, item_name="Shirts")
+        Donation.objects.create(
+            donor=self.donor, orphanage=self.remote, requirement=past, item_name="Shirts", status="cancelled"
+        )
+        local = add_requirement(self.local, "food")
+        remote_clothing = add_requirement(self.remote, "clothing")
+        urgent = add_requirement(self.remote, "food", deadline=today + timedelta(days=1))
+        bigger = add_requirement(self.remote, "food", needed=100)
+        remote = add_requirement(self.remote, "food")
+        # closed or past: never recommended
+        add_requirement(self.local, "food", needed=5, received=5)
+        add_requirement(self.local, "food", is_fulfilled=True)
+        add_requirement(self.local, "food", deadline=today - timedelta(days=1))
+
+        refresh(full=True)
+        # same pincode .35, clothing history .3 (the cancelled donation doesn't
+        # count), a deadline tomorrow .19, 100 units left .15; 10 units left .08 each
+        self.assertEqual(self.ranked(), [local.id, past.id, remote_clothing.id, urgent.id, bigger.id, remote.id])
+        scores = dict(Recommendation.objects.values_list("requirement_id", "score"))
+        self.assertAlmostEqual(scores[local.id] - scores[remote.id], 0.35)
+        self.assertAlmostEqual(scores[remote_clothing.id] - scores[remote.id], 0.3)
+
+    @override_settings(RECOMMENDATION_LIMIT=7)
+    def test_top_matches_scoring_every_requirement(self):
+        rng = random.Random(7)
+        today = timezone.localdate()
+        homes = [self.local, self.remote]
+        for n in range(3):
+            _, home = make_orphanage(f"h{n}@example.com", f"H{n}")
+            home.city, home.pincode = rng.choice([("Bengaluru", "560002"), ("Mysuru", "570001")])
+            home.save()
+            homes.append(home)
+        categories = [value for value, _ in OrphanageRequirement.CATEGORY_CHOICES]
+        for _ in range(80):
+            add_requirement(
+                rng.choice(homes), rng.choice(categories), needed=rng.randint(1, 300),
+                deadline=rng.choice([None, today + timedelta(days=rng.randint(0, 60))]),
+            )
+        requirements = list(OrphanageRequirement.objects.all())
+        for _ in range(6):
+            Donation.objects.create(
+                donor=self.donor, orphanage=self.remote, requirement=rng.choice(requirements), item_name="x"
+            )
+
+        index = Index()
+        donor = next(donor_features([self.donor.id]))
+        brute = sorted(((index.score(c, donor), c.id) for c in index.by_id.values()), key=lambda s: (-s[0], s[1]))
+        self.assertEqual(index.top(donor), brute[:7])
+
+
+@override_settings(RECOMMENDATION_OVERLAP_SECONDS=0)
+class IncrementalRefreshTests(RecommendationTestCase):
+    def setUp(self):
+        super().setUp()
+        self.food = add_requirement(self.remote, "food")
+        refresh(full=True)
+
+    def test_nothing_changed_rebuilds_nothing(self):
+        self.assertEqual(refresh(), {"donors": 0, "full": False})
+
+    def test_new_local_requirement_enters_the_list(self):
+        local = add_requirement(self.local, "education")
+        self.assertEqual(refresh(), {"donors": 1, "full": False})
+        self.assertEqual(self.ranked(), [local.id, self.food.id])
+
+    def test_closed_requirement_leaves_the_list(self):
+        self.food.is_fulfilled = True
+        self.food.save()
+        refresh()
+        self.assertEqual(self.ranked(), [])
+
+    def test_donation_moves_category_affinity(self):
+        clothing = add_requirement(self.remote, "clothing", needed=1)
+        refresh()
+        self.assertEqual(self.ranked(), [self.food.id, clothing.id])
+        Donation.objects.create(donor=self.donor, orphanage=self.remote, requirement=clothing, item_name="x")
+        refresh()
+        self.assertEqual(self.ranked(), [clothing.id, self.food.id])
+
+    def test_moving_city_queues_the_donor(self):
+        _, other = make_donor("other@example.com")
+        refresh()
+        self.assertFalse(StaleDonor.objects.exists())
+
+        self.donor.city, self.donor.pincode = "Chennai", "600001"
+        self.donor.save()
+        local = add_requirement(self.local, "food")
+        self.assertTrue(StaleDonor.objects.filter(donor=self.donor).exists())
+        refresh()
+        self.assertFalse(StaleDonor.objects.exists())
+        # Chennai is local now
+        self.assertEqual(self.ranked(), [self.food.id, local.id])
+        # the new requirement reached the other donor's short list too
+        self.assertEqual(self.ranked(other), [self.food.id, local.id])
+
+
+    def test_lists_are_written_one_batch_of_donors_at_a_time(self):
+        others = [make_donor(f"d{n}@example.com")[1] for n in range(4)]
+        add_requirement(self.local, "education")
+        refresh(full=True)
+        expected = {donor.id: self.ranked(donor) for donor in [self.donor, *others]}
+
+        # one donor per batch: a transaction each, plus the watermark's
+        with override_settings(RECOMMENDATION_LIMIT=BATCH_SIZE), \
+                mock.patch("recommendation.engine.transaction", wraps=transaction) as engine_transaction:
+            self.assertEqual(refresh(full=True), {"donors": 5, "full": True})
+        self.assertEqual(engine_transaction.atomic.call_count, 6)
+        self.assertEqual({donor.id: self.ranked(donor) for donor in [self.donor, *others]}, expected)
+
+
+class RecommendationListTests(QueryPlanMixin, RecommendationTestCase):
+    def setUp(self):
+        super().setUp()
+        self.requirements = [add_requirement(self.local, "food", needed=n + 1) for n in range(5)]
+        refresh(full=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.donor_user)
+
+    def test_pages_through_the_list_best_first(self):
+        response = self.client.get(reverse("recommendation-list"), {"page_size": 3})
+        self.assertEqual(response.status_code, 200)
+        first = response.data["results"]
+        self.assertEqual([row["requirement"]["id"] for row in first], [r.id for r in self.requirements[::-1][:3]])
+        self.assertEqual(first[0]["requirement"]["orphanage_name"], "Home")
+        self.assertGreater(first[0]["score"], first[1]["score"])
+
+        second = self.client.get(response.data["next"]).data
+        self.assertEqual([row["requirement"]["id"] for row in second["results"]],
+                         [r.id for r in self.requirements[1::-1]])
+        self.assertIsNone(second["next"])
+
+    def test_skips_requirements_closed_since_the_refresh(self):
+        OrphanageRequirement.objects.filter(pk=self.requirements[4].pk).update(is_fulfilled=True)
+        OrphanageRequirement.objects.filter(pk=self.requirements[3].pk).update(deadline=date(2020, 1, 1))
+        response = self.client.get(reverse("recommendation-list"))
+        self.assertEqual([row["requirement"]["id"] for row in response.data["results"]],
+                         [r.id for r in self.requirements[2::-1]])
+
+    def test_constant_queries_and_indexed_plan(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("recommendation-list"))
+        # profile id (no JWT claim under force_authenticate) + the page
+        self.assertEqual(len(queries), 2)
+        self.assert_endpoint_is_indexed(self.client, reverse("recommendation-list"))
+
+    def test_only_for_donors(self):
+        self.client.force_authenticate(self.local.user)
+        self.assertEqual(self.client.get(reverse("recommendation-list")).status_code, 404)
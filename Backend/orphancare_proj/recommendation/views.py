@@ -0,0 +1,34 @@
+from django.db.models import Q
+from django.http import Http404
+from django.utils import timezone
+from rest_framework import generics, permissions
+
+from auth_app.authentication import get_profile_id
+from donor.models import DonorProfile
+from orphancare_proj.pagination import RecommendationPagination
+from .models import Recommendation
+from .serializers import RecommendationSerializer
+
+
+class RecommendationListView(generics.ListAPIView):
+    """
+    Open requirements recommended for the signed-in donor, best first, read
+    from the lists `manage.py refresh_recommendations` precomputes.
+    Requirements closed since the last refresh are left out.
+    """
+    serializer_class = RecommendationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = RecommendationPagination
+
+    def get_queryset(self):
+        try:
+            donor_id = get_profile_id(self.request, DonorProfile)
+        except DonorProfile.DoesNotExist:
+            raise Http404
+        return (
+            Recommendation.objects.filter(
+                donor_id=donor_id, requirement__is_fulfilled=False, requirement__is_expired=False
+            )
+            .filter(Q(requirement__deadline__isnull=True) | Q(requirement__deadline__gte=timezone.localdate()))
+            .select_related("requirement__orphanage")
+        )
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class RequirementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'requirement'
+
+    def ready(self):
+        from . import signals  # noqa: F401
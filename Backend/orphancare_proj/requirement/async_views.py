@@ -0,0 +1,60 @@
+# requirement/async_views.py
+"""Async versions of the public requirement feeds (see orphancare_proj.async_views)."""
+from asgiref.sync import sync_to_async
+from django.db.models import Max
+from rest_framework.response import Response
+
+from orphanage.models import OrphanageProfile
+from orphancare_proj.async_views import AsyncListView
+from .models import OrphanageRequirement
+from .views import OrphanageRequirementByOrphanageView, PublicRequirementListView
+
+
+async def afeed_validators(requirements, orphanages, open_requirements):
+    """feed_validators() with the async ORM."""
+    latest_requirement = await requirements.aaggregate(latest=Max("updated_at"))
+    latest_orphanage = await orphanages.aaggregate(latest=Max("updated_at"))
+    return [
+        (latest_requirement["latest"], (await open_requirements.acount(),)),
+        (latest_orphanage["latest"], ()),
+    ]
+
+
+class AsyncFeedView(AsyncListView):
+    """Serves pages from the versioned feed cache (CachedFeedMixin) when it can."""
+
+    async def build(self, view, request):
+        key, data = await sync_to_async(view.get_cached_page)(request)
+        if data is not None:
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = await super().build(view, request)
+        await sync_to_async(view.cache_page)(key, response.data)
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class AsyncPublicRequirementListView(AsyncFeedView):
+    view_class = PublicRequirementListView
+
+    async def aget_validators(self, view):
+        return await view.aget_cached_feed_validators(lambda: afeed_validators(
+            OrphanageRequirement.objects.all(),
+            OrphanageProfile.objects.all(),
+            OrphanageRequirement.objects.filter(is_fulfilled=False, is_expired=False),
+        ))
+
+
+class AsyncOrphanageRequirementByOrphanageView(AsyncFeedView):
+    view_class = OrphanageRequirementByOrphanageView
+
+    async def aget_validators(self, view):
+        orphanage_id = view.kwargs["orphanage_id"]
+        requirements = OrphanageRequirement.objects.filter(orphanage_id=orphanage_id)
+        return await view.aget_cached_feed_validators(lambda: afeed_validators(
+            requirements,
+            OrphanageProfile.objects.filter(pk=orphanage_id),
+            requirements.filter(is_fulfilled=False, is_expired=False),
+        ))
@@ -0,0 +1,145 @@
+# requirement/bulk.py
+"""
+Bulk create/update of one orphanage's requirements from a JSON array or a
+CSV upload.
+
+Every row is validated before anything is written; if any row is invalid
+nothing is saved and the errors come back keyed by row number (1-based, data
+rows only). Valid batches are written with bulk_create/bulk_update in one
+transaction, so the query count depends on the number of batches, not rows.
+
+Rows with an `id` update that requirement (only the given fields change);
+rows without one create a new requirement.
+"""
+import csv
+import io
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from dashboard.summary import reconcile as reconcile_dashboard
+from search import index as search_index
+from .cache import invalidate_requirement_feeds
+from .expiry import is_expired
+from .models import OrphanageRequirement
+from .serializers import RequirementBulkRowSerializer
+
+CSV_COLUMNS = ("id", "item_name", "category", "description", "quantity_needed", "deadline")
+
+
+class BulkError(Exception):
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def get_max_rows():
+    return getattr(settings, "REQUIREMENT_BULK_MAX_ROWS", 500)
+
+
+def parse_csv(upload):
+    """
+    Rows of a CSV upload as dicts. Unknown columns are ignored and empty
+    cells are left out, so they behave like missing JSON keys.
+    """
+    try:
+        text = upload.read().decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise BulkError({"file": ["CSV must be UTF-8 encoded."]})
+
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames:
+        raise BulkError({"file": ["CSV has no header row."]})
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+
+    return [
+        {key: value.strip() for key, value in row.items() if key in CSV_COLUMNS and value and value.strip()}
+        for row in reader
+    ]
+
+
+def validate(rows, orphanage_id):
+    """
+    Validate all rows. Returns (to_create, to_update, update_fields) or
+    raises BulkError with per-row errors.
+    """
+    if not isinstance(rows, list) or not rows:
+        raise BulkError({"detail": ["Expected a non-empty list of requirements."]})
+    if len(rows) > get_max_rows():
+        raise BulkError({"detail": [f"At most {get_max_rows()} requirements per request."]})
+
+    ids = [row.get("id") for row in rows if isinstance(row, dict) and row.get("id") not in (None, "")]
+    # one query for every row being updated, scoped to the caller's orphanage
+    existing = OrphanageRequirement.objects.filter(orphanage_id=orphanage_id).in_bulk(
+        [int(pk) for pk in ids if str(pk).isdigit()]
+    )
+
+    errors = []
+    to_create, to_update, update_fields, seen = [], [], set(), set()
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append({"row": number, "errors": {"non_field_errors": ["Expected an object."]}})
+            continue
+
+        updating = row.get("id") not in (None, "")
+        serializer = RequirementBulkRowSerializer(data=row, partial=updating)
+        if not serializer.is_valid():
+            errors.append({"row": number, "errors": serializer.errors})
+            continue
+
+        data = dict(serializer.validated_data)
+        pk = data.pop("id", None)
+        if pk is None:
+            to_create.append(OrphanageRequirement(orphanage_id=orphanage_id, **data))
+            continue
+
+        if pk in seen:
+            errors.append({"row": number, "errors": {"id": ["Duplicate id in this request."]}})
+            continue
+        seen.add(pk)
+        requirement = existing.get(pk)
+        if requirement is None:
+            errors.append({"row": number, "errors": {"id": ["Requirement not found."]}})
+            continue
+        for field, value in data.items():
+            setattr(requirement, field, value)
+        # recomputed in the database by save(); mirrored for the response
+        requirement.is_fulfilled = requirement.quantity_received >= requirement.quantity_needed
+        update_fields.update(data)
+        to_update.append(requirement)
+
+    if errors:
+        raise BulkError({"errors": errors})
+    return to_create, to_update, sorted(update_fields)
+
+
+def save(orphanage_id, to_create, to_update, update_fields):
+    """
+    Write a validated batch. Model signals don't fire for bulk writes, so the
+    feed cache, search index and dashboard summary are refreshed here.
+    """
+    with transaction.atomic():
+        # bulk writes skip the pre_save that derives is_expired
+        for requirement in to_create:
+            requirement.is_expired = is_expired(requirement)
+        if "deadline" in update_fields or "quantity_needed" in update_fields:
+            for requirement in to_update:
+                requirement.is_expired = is_expired(requirement)
+            update_fields = update_fields + ["is_expired"]
+        created = OrphanageRequirement.objects.bulk_create(to_create)
+        if to_update and update_fields:
+            # bulk_update doesn't apply auto_now
+            now = timezone.now()
+            for requirement in to_update:
+                requirement.updated_at = now
+            OrphanageRequirement.objects.bulk_update(to_update, update_fields + ["updated_at"])
+            if "quantity_needed" in update_fields:
+                OrphanageRequirement.objects.filter(id__in=[r.id for r in to_update]).update(
+                    is_fulfilled=Q(quantity_received__gte=F("quantity_needed"))
+                )
+        search_index.index_requirements([r.id for r in created + to_update])
+        reconcile_dashboard([orphanage_id], tables=("requirements",))
+        invalidate_requirement_feeds(orphanage_id)
+    return created, to_update
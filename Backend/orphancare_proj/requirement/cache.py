@@ -0,0 +1,172 @@
+# requirement/cache.py
+"""
+Versioned cache for the public requirement feeds.
+
+Each feed has a version number stored in the cache. Cached pages embed the
+version in their key, so invalidating a feed is a single `incr` on its
+version: old pages simply stop being looked up and age out via the timeout.
+
+    global feed      -> /api/requirement/public/
+    orphanage feed   -> /api/requirement/orphanage/<id>/
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from orphancare_proj.db_router import current_read_alias, get_sticky_seconds
+
+GLOBAL_FEED = "public"
+STATS_KEYS = ("requirement:feed:hits", "requirement:feed:misses")
+
+
+def get_cache():
+    return caches[getattr(settings, "REQUIREMENT_FEED_CACHE_ALIAS", "default")]
+
+
+def get_timeout():
+    return getattr(settings, "REQUIREMENT_FEED_CACHE_TIMEOUT", 300)
+
+
+def version_key(feed):
+    return f"requirement:feed:{feed}:version"
+
+
+def orphanage_feed(orphanage_id):
+    return f"orphanage:{orphanage_id}"
+
+
+def get_version(feed):
+    cache = get_cache()
+    key = version_key(feed)
+    version = cache.get(key)
+    if version is None:
+        # versions must outlive the pages that use them
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_version(feed):
+    cache = get_cache()
+    key = version_key(feed)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # key was never read (or evicted): any new value invalidates old pages
+        cache.set(key, 2, timeout=None)
+
+
+def invalidate_requirement_feeds(orphanage_id):
+    """
+    Invalidate the public feed and one orphanage's feed once the current
+    transaction commits, so a concurrent reader can't re-cache stale rows.
+    """
+    def bump():
+        bump_version(GLOBAL_FEED)
+        bump_version(orphanage_feed(orphanage_id))
+
+    transaction.on_commit(bump)
+
+
+def count(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            # another worker created it first
+            try:
+                cache.incr(key)
+            except ValueError:
+                pass
+
+
+def feed_cache_stats():
+    cache = get_cache()
+    hits, misses = (cache.get(key, 0) for key in STATS_KEYS)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else None,
+    }
+
+
+def reset_feed_cache_stats():
+    get_cache().delete_many(STATS_KEYS)
+
+
+class CachedFeedMixin:
+    """
+    Caches a ListAPIView's serialized page under the feed's current version.
+    Views implement `get_feed_name()`.
+    """
+
+    def get_feed_name(self):
+        raise NotImplementedError
+
+    def get_cache_timeout(self):
+        # a page read from a replica may predate the write that bumped the
+        # version; keep it no longer than the primary-pin window
+        if current_read_alias() is not None:
+            return min(get_timeout(), get_sticky_seconds())
+        return get_timeout()
+
+    def get_validators_cache_key(self):
+        feed = self.get_feed_name()
+        return "requirement:feed:{}:v{}:validators".format(feed, get_version(feed))
+
+    def get_cached_feed_validators(self, compute):
+        """
+        Conditional GET validators for the feed (see orphancare_proj.conditional),
+        computed once per feed version: every write that changes the feed bumps
+        the version, so revalidating a warm feed needs no queries.
+        """
+        cache = get_cache()
+        key = self.get_validators_cache_key()
+        validators = cache.get(key)
+        if validators is None:
+            validators = compute()
+            cache.set(key, validators, self.get_cache_timeout())
+        return validators
+
+    async def aget_cached_feed_validators(self, compute):
+        """get_cached_feed_validators() for async views; `compute` returns an awaitable."""
+        cache = get_cache()
+        key = await sync_to_async(self.get_validators_cache_key)()
+        validators = await cache.aget(key)
+        if validators is None:
+            validators = await compute()
+            await cache.aset(key, validators, self.get_cache_timeout())
+        return validators
+
+    def get_feed_cache_key(self, request):
+        feed = self.get_feed_name()
+        # host is part of the key because pagination links are absolute
+        return "requirement:feed:{}:v{}:{}:{}".format(
+            feed, get_version(feed), request.get_host(), request.GET.urlencode()
+        )
+
+    def get_cached_page(self, request):
+        """(cache key, cached page data or None), counting the hit or miss."""
+        key = self.get_feed_cache_key(request)
+        data = get_cache().get(key)
+        count(STATS_KEYS[0] if data is not None else STATS_KEYS[1])
+        return key, data
+
+    def cache_page(self, key, data):
+        get_cache().set(key, data, self.get_cache_timeout())
+
+    def list(self, request, *args, **kwargs):
+        key, data = self.get_cached_page(request)
+        if data is not None:
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = super().list(request, *args, **kwargs)
+        self.cache_page(key, response.data)
+        response["X-Cache"] = "MISS"
+        return response
@@ -0,0 +1,56 @@
+# requirement/expiry.py
+"""
+Requirements past their deadline leave the live set (is_expired), so the
+public feeds, search and the urgent queue only walk rows someone can still
+give to.
+
+`expire()` finds live rows with deadline < today through req_urgent_idx and
+flips them in batches of REQUIREMENT_EXPIRY_BATCH_SIZE, one short
+transaction each, so writers are never blocked for long. The update bumps
+updated_at like every other queryset write (stats rollups, recommendations
+and ETags see the change) and invalidates the affected feeds.
+
+Saving a requirement recomputes the flag (signals.py), so moving a deadline
+back into the future re-opens it straight away.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate_requirement_feeds
+from .models import OrphanageRequirement
+
+
+def get_batch_size():
+    return getattr(settings, "REQUIREMENT_EXPIRY_BATCH_SIZE", 500)
+
+
+def is_past(deadline, today=None):
+    return deadline is not None and deadline < (today or timezone.localdate())
+
+
+def is_expired(requirement, today=None):
+    """What `is_expired` should be for a requirement about to be saved."""
+    return not requirement.is_fulfilled and is_past(requirement.deadline, today)
+
+
+def expire(today=None, batch_size=None):
+    """Mark every live requirement whose deadline has passed. Returns the number expired."""
+    today = today or timezone.localdate()
+    batch_size = batch_size or get_batch_size()
+    due = OrphanageRequirement.objects.filter(
+        is_fulfilled=False, is_expired=False, deadline__isnull=False, deadline__lt=today
+    )
+    expired = 0
+    while True:
+        with transaction.atomic():
+            rows = list(due.order_by("deadline").values_list("id", "orphanage_id")[:batch_size])
+            if not rows:
+                return expired
+            OrphanageRequirement.objects.filter(id__in=[pk for pk, _ in rows]).update(
+                is_expired=True, updated_at=timezone.now()
+            )
+            # queryset updates don't fire model signals
+            for orphanage_id in {orphanage_id for _, orphanage_id in rows}:
+                invalidate_requirement_feeds(orphanage_id)
+        expired += len(rows)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from requirement.expiry import expire, get_batch_size
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark live requirements whose deadline has passed as expired, in batched updates. "
+        "Schedule it daily (e.g. just after midnight from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help=f"Rows per update transaction (default {get_batch_size()}).")
+
+    def handle(self, *args, **options):
+        expired = expire(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{expired} requirements expired"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('requirement', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='orphanagerequirement',
+            name='category',
+            field=models.CharField(choices=[('food', 'Food'), ('groceries', 'Groceries'), ('clothing', 'Clothing'), ('education', 'Education'), ('medical', 'Medical'), ('others', 'Others'), ('stationary', 'Stationary')], default='others', max_length=50),
+        ),
+    ]
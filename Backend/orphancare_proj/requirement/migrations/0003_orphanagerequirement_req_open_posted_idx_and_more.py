@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orphanage', '0002_orphanageprofile_established_on'),
+        ('requirement', '0002_alter_orphanagerequirement_category'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='orphanagerequirement',
+            index=models.Index(condition=models.Q(('is_fulfilled', False)), fields=['-posted_date', 'id'], name='req_open_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orphanagerequirement',
+            index=models.Index(fields=['orphanage', '-posted_date', 'id'], name='req_orph_posted_idx'),
+        ),
+    ]
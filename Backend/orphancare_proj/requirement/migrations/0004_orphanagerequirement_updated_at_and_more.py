@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orphanage', '0004_orphanageprofile_banner_renditions'),
+        ('requirement', '0003_orphanagerequirement_req_open_posted_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orphanagerequirement',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='orphanagerequirement',
+            index=models.Index(fields=['updated_at'], name='req_updated_idx'),
+        ),
+    ]
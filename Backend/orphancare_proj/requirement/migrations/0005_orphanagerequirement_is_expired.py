@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:10
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orphanage', '0005_orphanageprofile_updated_at_and_more'),
+        ('requirement', '0004_orphanagerequirement_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='orphanagerequirement',
+            name='req_open_posted_idx',
+        ),
+        migrations.AddField(
+            model_name='orphanagerequirement',
+            name='is_expired',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='orphanagerequirement',
+            index=models.Index(condition=models.Q(('is_expired', False), ('is_fulfilled', False)), fields=['-posted_date', 'id'], name='req_live_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orphanagerequirement',
+            index=models.Index(models.F('deadline'), models.OrderBy(django.db.models.expressions.CombinedExpression(models.F('quantity_needed'), '-', models.F('quantity_received')), descending=True), models.F('id'), condition=models.Q(('deadline__isnull', False), ('is_expired', False), ('is_fulfilled', False)), name='req_urgent_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F
 from orphanage.models import OrphanageProfile
 
 class OrphanageRequirement(models.Model):
@@ -23,6 +24,41 @@ class OrphanageRequirement(models.Model):
     posted_date = models.DateTimeField(auto_now_add=True)
     deadline = models.DateField(blank=True, null=True)
     is_fulfilled = models.BooleanField(default=False)
+    # open past its deadline: set by `manage.py expire_requirements` and
+    # recomputed on save, so the public feeds only walk live rows
+    is_expired = models.BooleanField(default=False)
+    # Bumped by every write, including queryset.update() paths (see stats.rollups
+    # and orphancare_proj.conditional)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # public feed: live needs, newest first (partial, so fulfilled and
+            # expired rows cost nothing)
+            models.Index(
+                fields=["-posted_date", "id"],
+                condition=models.Q(is_fulfilled=False, is_expired=False),
+                name="req_live_posted_idx",
+            ),
+            # urgent feed: soonest deadline, then most still needed; also finds
+            # the rows to expire
+            models.Index(
+                F("deadline"),
+                (F("quantity_needed") - F("quantity_received")).desc(),
+                F("id"),
+                condition=models.Q(is_fulfilled=False, is_expired=False, deadline__isnull=False),
+                name="req_urgent_idx",
+            ),
+            # per-orphanage lists, newest first; is_fulfilled is checked while
+            # walking the index (Django emits `NOT is_fulfilled`, which SQLite
+            # can't match against an index column, only a partial condition)
+            models.Index(
+                fields=["orphanage", "-posted_date", "id"],
+                name="req_orph_posted_idx",
+            ),
+            # stats rollups: changed-since-watermark scans
+            models.Index(fields=["updated_at"], name="req_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.item_name} ({self.orphanage.orphanage_name})"
@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from orphancare_proj.instrumentation import TimedSerializerMixin
 from .models import OrphanageRequirement
 
-class OrphanageRequirementSerializer(serializers.ModelSerializer):
+class OrphanageRequirementSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     orphanage_name = serializers.CharField(source="orphanage.orphanage_name", read_only=True)
 
     class Meta:
@@ -10,6 +11,15 @@ class OrphanageRequirementSerializer(serializers.ModelSerializer):
             "id", "orphanage", "orphanage_name",
             "item_name", "category", "description",
             "quantity_needed", "quantity_received",
-            "posted_date", "deadline", "is_fulfilled"
+            "posted_date", "deadline", "is_fulfilled", "is_expired"
         ]
-        read_only_fields = ["orphanage", "posted_date", "quantity_received", "is_fulfilled"]
+        read_only_fields = ["orphanage", "posted_date", "quantity_received", "is_fulfilled", "is_expired"]
+
+
+class RequirementBulkRowSerializer(serializers.ModelSerializer):
+    """One row of a bulk import; `id` selects an existing requirement to update."""
+    id = serializers.IntegerField(required=False, min_value=1)
+
+    class Meta:
+        model = OrphanageRequirement
+        fields = ["id", "item_name", "category", "description", "quantity_needed", "deadline"]
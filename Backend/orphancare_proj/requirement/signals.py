@@ -0,0 +1,26 @@
+# requirement/signals.py
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from orphanage.models import OrphanageProfile
+from .models import OrphanageRequirement
+from .cache import invalidate_requirement_feeds
+from .expiry import is_expired
+
+
+@receiver(pre_save, sender=OrphanageRequirement)
+def track_expiry(sender, instance, **kwargs):
+    # a deadline moved into the future re-opens the requirement
+    instance.is_expired = is_expired(instance)
+
+
+@receiver([post_save, post_delete], sender=OrphanageRequirement)
+def requirement_changed(sender, instance, **kwargs):
+    invalidate_requirement_feeds(instance.orphanage_id)
+
+
+@receiver(post_save, sender=OrphanageProfile)
+def orphanage_changed(sender, instance, created, **kwargs):
+    # feeds embed orphanage_name; a brand-new orphanage has no requirements yet
+    if not created:
+        invalidate_requirement_feeds(instance.id)
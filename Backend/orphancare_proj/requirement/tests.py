@@ -1,3 +1,436 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orphancare_proj.testing import QueryPlanMixin, make_donor, make_orphanage
+from .models import OrphanageRequirement
+from .cache import get_cache, feed_cache_stats
+from .expiry import expire
+
+
+class RequirementListQueryCountTests(TestCase):
+    """
+    Pins the number of queries per list endpoint so an N+1 can't sneak back in.
+    """
+    ROW_COUNTS = (10, 100, 1000)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.orphanage_user, self.orphanage = make_orphanage()
+        self.other_user, self.other = make_orphanage("other@example.com", "Other")
+
+    def seed(self, rows):
+        get_cache().clear()
+        OrphanageRequirement.objects.all().delete()
+        # Spread rows over two orphanages so the join actually has to resolve names
+        OrphanageRequirement.objects.bulk_create(
+            OrphanageRequirement(
+                orphanage=self.orphanage if i % 2 else self.other,
+                item_name=f"Item {i}",
+                quantity_needed=10,
+            )
+            for i in range(rows * 2)
+        )
+
+    def assert_list_queries(self, url, expected, rows_per_seed):
+        for rows in self.ROW_COUNTS:
+            with self.subTest(rows=rows):
+                self.seed(rows)
+                with self.assertNumQueries(expected):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    len(response.data["results"]), min(rows_per_seed(rows), settings.API_PAGE_SIZE)
+                )
+
+    def test_public_requirement_list(self):
+        # 3 conditional GET validator queries (cold feed) + the page
+        self.assert_list_queries(reverse("requirement-public"), 4, lambda rows: rows * 2)
+
+    def test_requirements_by_orphanage(self):
+        url = reverse("requirement-by-orphanage", args=[self.orphanage.id])
+        self.assert_list_queries(url, 4, lambda rows: rows)
+
+    def test_own_requirement_list(self):
+        self.client.force_authenticate(self.orphanage_user)
+        # profile lookup + requirements joined with orphanage
+        self.assert_list_queries(reverse("requirement-list"), 2, lambda rows: rows)
+
+    def test_orphanage_name_is_serialized(self):
+        self.seed(1)
+        response = self.client.get(reverse("requirement-public"))
+        names = {row["orphanage_name"] for row in response.data["results"]}
+        self.assertEqual(names, {"Home", "Other"})
+
+
+class RequirementKeysetPaginationTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        _, self.orphanage = make_orphanage()
+        # bulk_create gives many rows the same posted_date, exercising the id tie-break
+        OrphanageRequirement.objects.bulk_create(
+            OrphanageRequirement(orphanage=self.orphanage, item_name=f"Item {i}", quantity_needed=1)
+            for i in range(50)
+        )
+
+    def walk(self, page_size):
+        url, seen, pages = reverse("requirement-public"), [], 0
+        params = {"page_size": page_size}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(row["id"] for row in response.data["results"])
+            url, params, pages = response.data["next"], None, pages + 1
+        return seen, pages
+
+    def test_walks_every_row_once_in_order(self):
+        seen, pages = self.walk(page_size=7)
+
+        expected = list(
+            OrphanageRequirement.objects.order_by("-posted_date", "id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, 8)
+
+    def test_deep_page_costs_the_same_as_first_page(self):
+        first = self.client.get(reverse("requirement-public"), {"page_size": 5})
+        next_url = first.data["next"]
+        for _ in range(8):
+            next_url = self.client.get(next_url).data["next"]
+
+        with self.assertNumQueries(1) as ctx:
+            self.client.get(next_url)
+        self.assertNotIn("OFFSET", ctx.captured_queries[0]["sql"])
+
+    def test_page_size_is_capped(self):
+        with self.settings(API_MAX_PAGE_SIZE=10):
+            response = self.client.get(reverse("requirement-public"), {"page_size": 1000})
+        self.assertEqual(len(response.data["results"]), 10)
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get(reverse("requirement-public"), {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+
+class RequirementQueryPlanTests(QueryPlanMixin, TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        self.user, self.orphanage = make_orphanage()
+        OrphanageRequirement.objects.bulk_create(
+            OrphanageRequirement(
+                orphanage=self.orphanage, item_name=f"Item {i}", quantity_needed=1, is_fulfilled=i % 3 == 0
+            )
+            for i in range(30)
+        )
+
+    def test_public_feed_uses_index(self):
+        response = self.assert_endpoint_is_indexed(self.client, reverse("requirement-public"), page_size=5)
+        # the keyset "next page" query must be indexed too
+        self.assert_endpoint_is_indexed(self.client, response.data["next"])
+
+    def test_orphanage_feed_uses_index(self):
+        url = reverse("requirement-by-orphanage", args=[self.orphanage.id])
+        response = self.assert_endpoint_is_indexed(self.client, url, page_size=5)
+        self.assert_endpoint_is_indexed(self.client, response.data["next"])
+
+    def test_own_requirement_list_uses_index(self):
+        self.client.force_authenticate(self.user)
+        response = self.assert_endpoint_is_indexed(self.client, reverse("requirement-list"), page_size=5)
+        self.assert_endpoint_is_indexed(self.client, response.data["next"])
+
+
+class RequirementFeedCacheTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        _, self.orphanage = make_orphanage()
+        _, self.other = make_orphanage("other@example.com", "Other")
+        self.requirement = OrphanageRequirement.objects.create(
+            orphanage=self.orphanage, item_name="Rice", quantity_needed=10
+        )
+        OrphanageRequirement.objects.create(orphanage=self.other, item_name="Books", quantity_needed=5)
+        self.public_url = reverse("requirement-public")
+        self.orphanage_url = reverse("requirement-by-orphanage", args=[self.orphanage.id])
+        self.other_url = reverse("requirement-by-orphanage", args=[self.other.id])
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_second_request_is_served_from_cache(self):
+        self.assertEqual(self.get(self.public_url)["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            response = self.get(self.public_url)
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_cursor_and_page_size_are_cached_separately(self):
+        self.client.get(self.public_url, {"page_size": 1})
+        response = self.client.get(self.public_url, {"page_size": 2})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_requirement_change_invalidates_only_its_feeds(self):
+        for url in (self.public_url, self.orphanage_url, self.other_url):
+            self.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.requirement.item_name = "Wheat"
+            self.requirement.save()
+
+        public = self.get(self.public_url)
+        self.assertEqual(public["X-Cache"], "MISS")
+        self.assertIn("Wheat", [row["item_name"] for row in public.data["results"]])
+        self.assertEqual(self.get(self.orphanage_url)["X-Cache"], "MISS")
+        self.assertEqual(self.get(self.other_url)["X-Cache"], "HIT")
+
+    def test_delete_invalidates(self):
+        self.get(self.orphanage_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.requirement.delete()
+        self.assertEqual(self.get(self.orphanage_url).data["results"], [])
+
+    def test_orphanage_rename_invalidates(self):
+        self.get(self.public_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.orphanage.orphanage_name = "Renamed"
+            self.orphanage.save()
+        names = {row["orphanage_name"] for row in self.get(self.public_url).data["results"]}
+        self.assertIn("Renamed", names)
+
+    def test_stats_count_hits_and_misses(self):
+        self.get(self.public_url)
+        self.get(self.public_url)
+        self.get(self.public_url)
+        self.assertEqual(feed_cache_stats(), {"hits": 2, "misses": 1, "hit_ratio": 0.6667})
+
+    def test_works_without_a_real_cache(self):
+        dummy = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        with self.settings(CACHES=dummy):
+            self.assertEqual(self.get(self.public_url)["X-Cache"], "MISS")
+            self.assertEqual(self.get(self.public_url)["X-Cache"], "MISS")
+
+
+class RequirementBulkImportTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.user, self.orphanage = make_orphanage()
+        _, self.other = make_orphanage("other@example.com", "Other")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("requirement-bulk")
+
+    def rows(self, count):
+        return [
+            {"item_name": f"Item {i}", "category": "food", "quantity_needed": i + 1}
+            for i in range(count)
+        ]
+
+    def test_json_rows_are_created(self):
+        response = self.client.post(self.url, self.rows(3), format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(response.data["results"][0]["orphanage_name"], "Home")
+        self.assertEqual(OrphanageRequirement.objects.filter(orphanage=self.orphanage).count(), 3)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        counts = []
+        # both sizes fit in one bulk_create batch (SQLite caps it at 999 parameters)
+        for size in (5, 90):
+            existing = OrphanageRequirement.objects.bulk_create(
+                OrphanageRequirement(orphanage=self.orphanage, item_name="Old", quantity_needed=5)
+                for _ in range(size)
+            )
+            payload = self.rows(size) + [{"id": r.id, "quantity_needed": 9} for r in existing]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, {"requirements": payload}, format="json")
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual((response.data["created"], response.data["updated"]), (size, size))
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_profile_id_comes_from_the_token(self):
+        login = self.client.post(
+            reverse("auth_app:token_obtain_pair"), {"email": self.user.email, "password": "pass"}
+        )
+        self.client.force_authenticate(None)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access']}")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, [{"item_name": "No quantity"}], format="json")
+        self.assertEqual(response.status_code, 400)
+        # only the user fetch: no profile lookup before validation
+        self.assertEqual(len(queries), 1)
+
+    def test_donor_gets_403(self):
+        donor_user, _ = make_donor()
+        self.client.force_authenticate(donor_user)
+
+        response = self.client.post(self.url, self.rows(1), format="json")
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(OrphanageRequirement.objects.exists())
+
+    def test_csv_upload_creates_and_updates(self):
+        requirement = OrphanageRequirement.objects.create(
+            orphanage=self.orphanage, item_name="Rice", quantity_needed=10, quantity_received=6
+        )
+        csv = (
+            "id,item_name,category,quantity_needed,deadline\n"
+            f"{requirement.id},,,5,\n"
+            ",Notebooks,stationary,40,2030-01-31\n"
+        )
+        upload = SimpleUploadedFile("needs.csv", csv.encode(), content_type="text/csv")
+
+        response = self.client.post(self.url, {"file": upload}, format="multipart")
+
+        self.assertEqual(response.status_code, 201)
+        requirement.refresh_from_db()
+        self.assertEqual((requirement.item_name, requirement.quantity_needed), ("Rice", 5))
+        self.assertTrue(requirement.is_fulfilled)
+        notebooks = OrphanageRequirement.objects.get(item_name="Notebooks")
+        self.assertEqual(str(notebooks.deadline), "2030-01-31")
+
+    def test_any_invalid_row_rejects_the_batch(self):
+        foreign = OrphanageRequirement.objects.create(orphanage=self.other, item_name="X", quantity_needed=1)
+        rows = self.rows(2) + [
+            {"item_name": "No quantity"},
+            {"id": foreign.id, "quantity_needed": 3},
+            {"item_name": "Bad", "category": "toys", "quantity_needed": 1},
+        ]
+
+        response = self.client.post(self.url, rows, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        errors = {entry["row"]: entry["errors"] for entry in response.data["errors"]}
+        self.assertEqual(set(errors), {3, 4, 5})
+        self.assertIn("quantity_needed", errors[3])
+        self.assertIn("id", errors[4])
+        self.assertIn("category", errors[5])
+        self.assertFalse(OrphanageRequirement.objects.filter(orphanage=self.orphanage).exists())
+
+    def test_invalidates_feed_and_search(self):
+        public = reverse("requirement-public")
+        self.client.get(public)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, [{"item_name": "Blankets", "quantity_needed": 4}], format="json")
+
+        response = self.client.get(public)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["item_name"], "Blankets")
+        hits = self.client.get(reverse("search"), {"q": "blank"}).data["results"]
+        self.assertEqual([hit["type"] for hit in hits], ["requirement"])
+
+    def test_row_limit(self):
+        with self.settings(REQUIREMENT_BULK_MAX_ROWS=2):
+            response = self.client.post(self.url, self.rows(3), format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class RequirementExpiryTests(QueryPlanMixin, TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        self.user, self.orphanage = make_orphanage()
+        self.today = timezone.localdate()
+        self.stale = OrphanageRequirement.objects.bulk_create(
+            OrphanageRequirement(
+                orphanage=self.orphanage, item_name=f"Old {i}", quantity_needed=1,
+                deadline=self.today - timedelta(days=i + 1),
+            )
+            for i in range(5)
+        )
+        self.live = OrphanageRequirement.objects.create(
+            orphanage=self.orphanage, item_name="Rice", quantity_needed=10, deadline=self.today
+        )
+        self.fulfilled = OrphanageRequirement.objects.create(
+            orphanage=self.orphanage, item_name="Done", quantity_needed=1, is_fulfilled=True,
+            deadline=self.today - timedelta(days=1),
+        )
+
+    def public_ids(self, name="requirement-public", **params):
+        return [row["id"] for row in self.client.get(reverse(name), params).data["results"]]
+
+    def test_command_expires_in_batches_and_leaves_live_rows(self):
+        self.assertEqual(len(self.public_ids()), 6)
+        before = OrphanageRequirement.objects.get(pk=self.stale[0].pk).updated_at
+
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            call_command("expire_requirements", "--batch-size", "2", stdout=out)
+        self.assertIn("5 requirements expired", out.getvalue())
+        # 3 batches of select + update, then the empty select
+        self.assertEqual(sum(q["sql"].startswith("UPDATE") for q in queries.captured_queries), 3)
+
+        self.assertEqual(
+            set(OrphanageRequirement.objects.filter(is_expired=True).values_list("id", flat=True)),
+            {r.id for r in self.stale},
+        )
+        self.assertGreater(OrphanageRequirement.objects.get(pk=self.stale[0].pk).updated_at, before)
+        # the cached feed was invalidated
+        self.assertEqual(self.public_ids(), [self.live.id])
+        url = reverse("requirement-by-orphanage", args=[self.orphanage.id])
+        self.assertEqual([row["id"] for row in self.client.get(url).data["results"]], [self.live.id])
+        call_command("expire_requirements", stdout=StringIO())
+        self.assertEqual(OrphanageRequirement.objects.filter(is_expired=True).count(), 5)
+
+    def test_saving_a_later_deadline_reopens(self):
+        expire()
+        requirement = OrphanageRequirement.objects.get(pk=self.stale[0].pk)
+        requirement.deadline = self.today + timedelta(days=3)
+        requirement.save()
+        self.assertFalse(OrphanageRequirement.objects.get(pk=requirement.pk).is_expired)
+        self.assertIn(requirement.id, self.public_ids())
+
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            reverse("requirement-bulk"),
+            [{"id": requirement.id, "item_name": "Old", "quantity_needed": 1, "deadline": "2020-01-01"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["results"][0]["is_expired"])
+
+    def test_urgent_orders_by_deadline_then_remaining_need(self):
+        soon_small = OrphanageRequirement.objects.create(
+            orphanage=self.orphanage, item_name="A", quantity_needed=5, deadline=self.today + timedelta(days=2)
+        )
+        soon_big = OrphanageRequirement.objects.create(
+            orphanage=self.orphanage, item_name="B", quantity_needed=50, quantity_received=30,
+            deadline=self.today + timedelta(days=2),
+        )
+        later = OrphanageRequirement.objects.create(
+            orphanage=self.orphanage, item_name="C", quantity_needed=500, deadline=self.today + timedelta(days=20)
+        )
+        OrphanageRequirement.objects.create(orphanage=self.orphanage, item_name="No deadline", quantity_needed=9)
+
+        # expired rows are never urgent, even before the command has run
+        self.assertEqual(self.public_ids("requirement-urgent"), [self.live.id, soon_big.id, soon_small.id, later.id])
+        self.assertEqual(self.public_ids("requirement-urgent", days=7), [self.live.id, soon_big.id, soon_small.id])
+
+        response = self.client.get(reverse("requirement-urgent"), {"page_size": 2})
+        following = self.client.get(response.data["next"]).data
+        self.assertEqual([row["id"] for row in following["results"]], [soon_small.id, later.id])
 
-# Create your tests here.
+    def test_urgent_and_expiry_queries_use_index(self):
+        OrphanageRequirement.objects.create(
+            orphanage=self.orphanage, item_name="Soap", quantity_needed=3, deadline=self.today + timedelta(days=1)
+        )
+        response = self.assert_endpoint_is_indexed(self.client, reverse("requirement-urgent"), page_size=1)
+        self.assert_endpoint_is_indexed(self.client, response.data["next"])
+        plan = self.explain(*OrphanageRequirement.objects.filter(
+            is_fulfilled=False, is_expired=False, deadline__isnull=False, deadline__lt=self.today
+        ).order_by("deadline").values_list("id", "orphanage_id")[:500].query.sql_with_params())
+        self.assertTrue(any("req_urgent_idx" in line for line in plan), plan)
@@ -1,20 +1,26 @@
 from django.urls import path
+from orphancare_proj.async_views import public_view
+from .async_views import AsyncOrphanageRequirementByOrphanageView, AsyncPublicRequirementListView
 from .views import (
     OrphanageRequirementCreateView,
+    OrphanageRequirementBulkView,
     OrphanageRequirementListView,
     OrphanageRequirementUpdateView,
     OrphanageRequirementDeleteView,
-    PublicRequirementListView,
-    OrphanageRequirementByOrphanageView
+    RequirementFeedCacheStatsView,
+    UrgentRequirementListView,
 )
 
 urlpatterns = [
     path("create/", OrphanageRequirementCreateView.as_view(), name="requirement-create"),
+    path("bulk/", OrphanageRequirementBulkView.as_view(), name="requirement-bulk"),
     path("mine/", OrphanageRequirementListView.as_view(), name="requirement-list"),
     path("<int:pk>/update/", OrphanageRequirementUpdateView.as_view(), name="requirement-update"),
     path("<int:pk>/delete/", OrphanageRequirementDeleteView.as_view(), name="requirement-delete"),
-    path("public/", PublicRequirementListView.as_view(), name="requirement-public"),
-    path("orphanage/<int:orphanage_id>/",OrphanageRequirementByOrphanageView.as_view(),name="requirement-by-orphanage",
-)
+    path("public/", public_view(AsyncPublicRequirementListView), name="requirement-public"),
+    path("orphanage/<int:orphanage_id>/",public_view(AsyncOrphanageRequirementByOrphanageView),name="requirement-by-orphanage",
+),
+    path("urgent/", UrgentRequirementListView.as_view(), name="requirement-urgent"),
+    path("cache-stats/", RequirementFeedCacheStatsView.as_view(), name="requirement-cache-stats"),
 
 ]
@@ -1,7 +1,25 @@
-from rest_framework import generics, permissions
+from datetime import timedelta
+
+from django.db.models import ExpressionWrapper, F, IntegerField, Max
+from django.utils import timezone
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import OrphanageRequirement
 from .serializers import OrphanageRequirementSerializer
+from . import bulk
+from .cache import CachedFeedMixin, GLOBAL_FEED, orphanage_feed, feed_cache_stats
+from auth_app.authentication import get_profile_id
 from orphanage.models import OrphanageProfile
+from orphancare_proj.conditional import ConditionalGetMixin
+from orphancare_proj.db_router import ReplicaReadMixin
+from orphancare_proj.params import bounded
+from orphancare_proj.pagination import RequirementPagination, UrgentRequirementPagination
+
+URGENT_DEFAULT_DAYS = 30
+URGENT_MAX_DAYS = 365
 
 # ------------------ ORPHANAGE VIEWS ------------------
 
@@ -10,17 +28,67 @@ class OrphanageRequirementCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
-        orphanage_profile = OrphanageProfile.objects.get(user=self.request.user)
-        serializer.save(orphanage=orphanage_profile)
+        serializer.save(orphanage_id=get_profile_id(self.request, OrphanageProfile))
+
+
+class OrphanageRequirementBulkView(APIView):
+    """
+    Create/update many requirements at once.
+
+    Body is either a JSON array of requirements (or {"requirements": [...]})
+    or a multipart upload with a CSV in `file` (columns: id, item_name,
+    category, description, quantity_needed, deadline). Rows with an id update
+    that requirement. All rows are validated first; any error rejects the
+    whole batch with per-row errors.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [JSONParser, MultiPartParser]
+
+    def get_rows(self, request):
+        if "file" in request.FILES:
+            return bulk.parse_csv(request.FILES["file"])
+        data = request.data
+        if isinstance(data, dict):
+            data = data.get("requirements")
+        return data
+
+    def post(self, request):
+        try:
+            orphanage_id = get_profile_id(request, OrphanageProfile)
+        except OrphanageProfile.DoesNotExist:
+            raise PermissionDenied("Only orphanages can import requirements.")
+        try:
+            rows = self.get_rows(request)
+            to_create, to_update, update_fields = bulk.validate(rows, orphanage_id)
+        except bulk.BulkError as e:
+            return Response(e.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        created, updated = bulk.save(orphanage_id, to_create, to_update, update_fields)
+        # one lookup for the orphanage_name every row of the response repeats
+        orphanage = OrphanageProfile.objects.only("id", "orphanage_name").get(pk=orphanage_id)
+        for requirement in created + updated:
+            requirement.orphanage = orphanage
+        return Response(
+            {
+                "created": len(created),
+                "updated": len(updated),
+                "results": OrphanageRequirementSerializer(created + updated, many=True).data,
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
 
 
 class OrphanageRequirementListView(generics.ListAPIView):
     serializer_class = OrphanageRequirementSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = RequirementPagination
 
     def get_queryset(self):
-        orphanage_profile = OrphanageProfile.objects.get(user=self.request.user)
-        return OrphanageRequirement.objects.filter(orphanage=orphanage_profile).order_by("-posted_date")
+        return (
+            OrphanageRequirement.objects.filter(orphanage_id=get_profile_id(self.request, OrphanageProfile))
+            .select_related("orphanage")
+            .order_by("-posted_date")
+        )
 
 
 class OrphanageRequirementUpdateView(generics.UpdateAPIView):
@@ -29,9 +97,8 @@ class OrphanageRequirementUpdateView(generics.UpdateAPIView):
     queryset = OrphanageRequirement.objects.all()
 
     def perform_update(self, serializer):
-        orphanage_profile = OrphanageProfile.objects.get(user=self.request.user)
         requirement = self.get_object()
-        if requirement.orphanage != orphanage_profile:
+        if requirement.orphanage_id != get_profile_id(self.request, OrphanageProfile):
             raise PermissionError("You are not authorized to update this requirement.")
         serializer.save()
 
@@ -41,31 +108,108 @@ class OrphanageRequirementDeleteView(generics.DestroyAPIView):
     queryset = OrphanageRequirement.objects.all()
 
     def perform_destroy(self, instance):
-        orphanage_profile = OrphanageProfile.objects.get(user=self.request.user)
-        if instance.orphanage != orphanage_profile:
+        if instance.orphanage_id != get_profile_id(self.request, OrphanageProfile):
             raise PermissionError("You are not authorized to delete this requirement.")
         instance.delete()
 
 
 # ------------------ DONOR VIEW ------------------
 
-class PublicRequirementListView(generics.ListAPIView):
+def feed_validators(requirements, orphanages, open_requirements):
+    """
+    Requirement rows embed the orphanage name, so a feed changes with either
+    table. The open count catches rows leaving the feed (fulfilled/deleted).
+    """
+    return [
+        (requirements.aggregate(latest=Max("updated_at"))["latest"], (open_requirements.count(),)),
+        (orphanages.aggregate(latest=Max("updated_at"))["latest"], ()),
+    ]
+
+
+class PublicRequirementListView(ReplicaReadMixin, ConditionalGetMixin, CachedFeedMixin, generics.ListAPIView):
     """Donors can view all active / unfulfilled requirements."""
     serializer_class = OrphanageRequirementSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = RequirementPagination
+    throttle_scope = "public"
+
+    def get_feed_name(self):
+        return GLOBAL_FEED
+
+    def get_validators(self):
+        # bare MAX()es over indexed columns are single index probes
+        return self.get_cached_feed_validators(lambda: feed_validators(
+            OrphanageRequirement.objects.all(),
+            OrphanageProfile.objects.all(),
+            OrphanageRequirement.objects.filter(is_fulfilled=False, is_expired=False),
+        ))
 
     def get_queryset(self):
-        return OrphanageRequirement.objects.filter(is_fulfilled=False).order_by("-posted_date")
+        return (
+            OrphanageRequirement.objects.filter(is_fulfilled=False, is_expired=False)
+            .select_related("orphanage")
+            .order_by("-posted_date")
+        )
 
 
 # requirements/views.py
-class OrphanageRequirementByOrphanageView(generics.ListAPIView):
+class OrphanageRequirementByOrphanageView(ReplicaReadMixin, ConditionalGetMixin, CachedFeedMixin, generics.ListAPIView):
     serializer_class = OrphanageRequirementSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = RequirementPagination
+    throttle_scope = "public"
+
+    def get_feed_name(self):
+        return orphanage_feed(self.kwargs["orphanage_id"])
+
+    def get_validators(self):
+        orphanage_id = self.kwargs["orphanage_id"]
+        requirements = OrphanageRequirement.objects.filter(orphanage_id=orphanage_id)
+        return self.get_cached_feed_validators(lambda: feed_validators(
+            requirements,
+            OrphanageProfile.objects.filter(pk=orphanage_id),
+            requirements.filter(is_fulfilled=False, is_expired=False),
+        ))
 
     def get_queryset(self):
         orphanage_id = self.kwargs["orphanage_id"]
         return OrphanageRequirement.objects.filter(
             orphanage_id=orphanage_id,
-            is_fulfilled=False
-        ).order_by("-posted_date")
+            is_fulfilled=False,
+            is_expired=False,
+        ).select_related("orphanage").order_by("-posted_date")
+
+
+class UrgentRequirementListView(ReplicaReadMixin, generics.ListAPIView):
+    """
+    Live requirements with a deadline in the next ?days= (default 30), the
+    soonest deadline first and then the most still needed. Walks
+    req_urgent_idx in order, so a page costs the same however many rows match.
+    """
+    serializer_class = OrphanageRequirementSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = UrgentRequirementPagination
+    throttle_scope = "public"
+
+    def get_queryset(self):
+        today = timezone.localdate()
+        days = bounded(self.request.query_params.get("days"), URGENT_DEFAULT_DAYS, URGENT_MAX_DAYS)
+        return (
+            OrphanageRequirement.objects.filter(
+                is_fulfilled=False, is_expired=False, deadline__isnull=False,
+                deadline__gte=today, deadline__lte=today + timedelta(days=days),
+            )
+            # same expression as the index, so SQLite can match it
+            .annotate(remaining=ExpressionWrapper(
+                F("quantity_needed") - F("quantity_received"), output_field=IntegerField()
+            ))
+            .select_related("orphanage")
+        )
+
+
+class RequirementFeedCacheStatsView(APIView):
+    """Hit/miss counters for the cached requirement feeds (admins only)."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(feed_cache_stats())
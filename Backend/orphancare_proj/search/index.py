@@ -0,0 +1,215 @@
+# search/index.py
+"""
+SQLite FTS5 index over orphanages and requirements.
+
+One virtual table holds both kinds of document. rowids are derived from the
+source row (orphanage id * 2, requirement id * 2 + 1), so a document can be
+replaced or removed without a lookup, and results join straight back to
+their rows.
+
+Columns (bm25 weights in RANK_WEIGHTS):
+    kind, object_id   unindexed, identify the source row
+    title             orphanage_name / item_name
+    body              description
+    category          requirement category
+    location          city + state (a requirement uses its orphanage's)
+
+On other database backends the index is a no-op and `search()` falls back
+to icontains scans.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from orphanage.models import OrphanageProfile
+from requirement.models import OrphanageRequirement
+
+TABLE = "search_document"
+KINDS = ("orphanage", "requirement")
+
+# bm25() weights, in column order: kind, object_id, title, body, category, location
+RANK_WEIGHTS = (0.0, 0.0, 10.0, 1.0, 4.0, 3.0)
+
+CREATE_SQL = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5(
+    kind UNINDEXED,
+    object_id UNINDEXED,
+    title,
+    body,
+    category,
+    location,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+DROP_SQL = f"DROP TABLE IF EXISTS {TABLE}"
+
+ORPHANAGE_TABLE = OrphanageProfile._meta.db_table
+REQUIREMENT_TABLE = OrphanageRequirement._meta.db_table
+
+# INSERT ... SELECT bodies; append a WHERE clause to index a subset
+INSERT_ORPHANAGES_SQL = f"""
+INSERT INTO {TABLE} (rowid, kind, object_id, title, body, category, location)
+SELECT o.id * 2, 'orphanage', o.id, o.orphanage_name, COALESCE(o.description, ''), '',
+       o.city || ' ' || o.state
+FROM {ORPHANAGE_TABLE} o
+"""
+INSERT_REQUIREMENTS_SQL = f"""
+INSERT INTO {TABLE} (rowid, kind, object_id, title, body, category, location)
+SELECT r.id * 2 + 1, 'requirement', r.id, r.item_name, COALESCE(r.description, ''), r.category,
+       o.city || ' ' || o.state
+FROM {REQUIREMENT_TABLE} r
+JOIN {ORPHANAGE_TABLE} o ON o.id = r.orphanage_id
+"""
+
+
+def is_enabled():
+    return connection.vendor == "sqlite"
+
+
+def orphanage_rowid(pk):
+    return pk * 2
+
+
+def requirement_rowid(pk):
+    return pk * 2 + 1
+
+
+def rebuild():
+    """
+    Drop and repopulate the whole index. Returns the number of documents.
+    """
+    if not is_enabled():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(DROP_SQL)
+        cursor.execute(CREATE_SQL)
+        cursor.execute(INSERT_ORPHANAGES_SQL)
+        cursor.execute(INSERT_REQUIREMENTS_SQL)
+        # merge the b-tree segments written by the bulk load
+        cursor.execute(f"INSERT INTO {TABLE}({TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLE}")
+        return cursor.fetchone()[0]
+
+
+def index_orphanage(pk, with_requirements=False):
+    """
+    (Re)index one orphanage; with_requirements also refreshes its
+    requirements, whose location column is copied from the orphanage.
+    """
+    if not is_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [orphanage_rowid(pk)])
+        cursor.execute(INSERT_ORPHANAGES_SQL + " WHERE o.id = %s", [pk])
+        if with_requirements:
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE rowid IN "
+                f"(SELECT id * 2 + 1 FROM {REQUIREMENT_TABLE} WHERE orphanage_id = %s)",
+                [pk],
+            )
+            cursor.execute(INSERT_REQUIREMENTS_SQL + " WHERE r.orphanage_id = %s", [pk])
+
+
+def index_requirements(pks):
+    if not is_enabled() or not pks:
+        return
+    pks = list(pks)
+    placeholders = ", ".join(["%s"] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {TABLE} WHERE rowid IN ({placeholders})",
+            [requirement_rowid(pk) for pk in pks],
+        )
+        cursor.execute(INSERT_REQUIREMENTS_SQL + f" WHERE r.id IN ({placeholders})", pks)
+
+
+def remove(kind, pk):
+    if not is_enabled():
+        return
+    rowid = orphanage_rowid(pk) if kind == "orphanage" else requirement_rowid(pk)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [rowid])
+
+
+# ---------- querying ----------
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match(query):
+    """
+    Turn free text into an FTS5 MATCH expression: every word must match, the
+    last one as a prefix (search-as-you-type). Returns None for empty input.
+    FTS5 operators in user input are neutralised by quoting each token.
+    """
+    tokens = TOKEN_RE.findall(query.lower())[:10]
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search(query, kind=None, limit=20, offset=0):
+    """
+    Ranked (kind, object_id, rank) tuples; best match first. Fulfilled
+    requirements are skipped (fulfilment updates bypass model signals, so
+    the live row is the source of truth).
+    """
+    match = build_match(query)
+    if match is None:
+        return []
+    if not is_enabled():
+        return icontains_search(query, kind, limit, offset)
+
+    kind_filter = f"AND {TABLE}.kind = %s" if kind else ""
+    weights = ", ".join(str(w) for w in RANK_WEIGHTS)
+    sql = f"""
+        SELECT {TABLE}.kind, {TABLE}.object_id, bm25({TABLE}, {weights}) AS rank
+        FROM {TABLE}
+        LEFT JOIN {REQUIREMENT_TABLE} r
+            ON {TABLE}.kind = 'requirement' AND r.id = {TABLE}.object_id
+        WHERE {TABLE} MATCH %s {kind_filter}
+          AND ({TABLE}.kind = 'orphanage' OR (r.is_fulfilled = 0 AND r.is_expired = 0))
+        ORDER BY rank, {TABLE}.rowid
+        LIMIT %s OFFSET %s
+    """
+    params = [match] + ([kind] if kind else []) + [limit, offset]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(row[0], int(row[1]), row[2]) for row in cursor.fetchall()]
+
+
+def icontains_search(query, kind=None, limit=20, offset=0):
+    """
+    Unranked fallback (and benchmark baseline): every word must appear in
+    one of the searchable columns.
+    """
+    tokens = TOKEN_RE.findall(query)[:10]
+    results = []
+    if kind in (None, "orphanage"):
+        qs = OrphanageProfile.objects.all()
+        for token in tokens:
+            qs = qs.filter(
+                Q(orphanage_name__icontains=token)
+                | Q(description__icontains=token)
+                | Q(city__icontains=token)
+                | Q(state__icontains=token)
+            )
+        pks = qs.order_by("id").values_list("id", flat=True)[:offset + limit]
+        results += [("orphanage", pk, 0.0) for pk in pks]
+    if kind in (None, "requirement"):
+        qs = OrphanageRequirement.objects.filter(is_fulfilled=False, is_expired=False)
+        for token in tokens:
+            qs = qs.filter(
+                Q(item_name__icontains=token)
+                | Q(description__icontains=token)
+                | Q(category__icontains=token)
+                | Q(orphanage__city__icontains=token)
+                | Q(orphanage__state__icontains=token)
+            )
+        pks = qs.order_by("id").values_list("id", flat=True)[:offset + limit]
+        results += [("requirement", pk, 0.0) for pk in pks]
+    return results[offset:offset + limit]
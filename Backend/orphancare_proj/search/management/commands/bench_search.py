@@ -0,0 +1,146 @@
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from auth_app.models import User
+from orphanage.models import OrphanageProfile
+from requirement.models import OrphanageRequirement
+from search import index
+
+NOUNS = [
+    "rice", "wheat", "dal", "oil", "milk", "notebooks", "bags", "pencils", "blankets", "jackets",
+    "uniforms", "shoes", "soap", "toothpaste", "pads", "paracetamol", "bandages", "nets", "bedsheets",
+    "textbooks", "sweaters", "socks", "geometry", "crayons", "atlas", "dictionary", "biscuits", "sugar",
+    "salt", "tea", "lentils", "chairs", "fans", "bulbs", "mattresses", "pillows", "towels", "buckets",
+    "plates", "tumblers", "inhalers", "vitamins", "syrup", "thermometer", "gloves", "masks", "rulers",
+]
+MODIFIERS = [
+    "basmati", "organic", "woollen", "cotton", "steel", "plastic", "kannada", "english", "hindi",
+    "tamil", "kids", "teen", "winter", "monsoon", "exam", "primary", "secondary", "sterile",
+    "children", "adult", "large", "small", "refill", "spare", "ruled", "unruled", "fortified",
+]
+CITIES = [
+    ("Bengaluru", "Karnataka"), ("Mysuru", "Karnataka"), ("Mangaluru", "Karnataka"), ("Hubballi", "Karnataka"),
+    ("Chennai", "Tamil Nadu"), ("Madurai", "Tamil Nadu"), ("Coimbatore", "Tamil Nadu"),
+    ("Hyderabad", "Telangana"), ("Warangal", "Telangana"), ("Pune", "Maharashtra"), ("Mumbai", "Maharashtra"),
+    ("Nagpur", "Maharashtra"), ("Kochi", "Kerala"), ("Thrissur", "Kerala"), ("Jaipur", "Rajasthan"),
+    ("Udaipur", "Rajasthan"), ("Lucknow", "Uttar Pradesh"), ("Varanasi", "Uttar Pradesh"),
+    ("Patna", "Bihar"), ("Bhopal", "Madhya Pradesh"), ("Indore", "Madhya Pradesh"), ("Kolkata", "West Bengal"),
+]
+SYLLABLES = "ka ra ma na sa ta va la pa da ya ha ja ga ba shi ri ni vi ku ru mu su tu".split()
+
+
+def make_vocabulary(rng, size):
+    """Pseudo-words so text has a realistic long tail instead of 20 repeated words."""
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return sorted(words)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark FTS5 search against icontains scans on synthetic data. "
+        "Runs inside a transaction that is rolled back, so no rows are kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requirements", type=int, default=100_000)
+        parser.add_argument("--orphanages", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per query.")
+        parser.add_argument("--vocabulary", type=int, default=5000, help="Distinct description words.")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        if not index.is_enabled():
+            raise CommandError("FTS5 benchmark needs the sqlite3 backend")
+        rng = random.Random(options["seed"])
+
+        vocabulary = make_vocabulary(rng, options["vocabulary"])
+        queries = {
+            # a specific item, optionally narrowed to a city
+            "selective": [
+                f"{rng.choice(MODIFIERS)} {rng.choice(NOUNS)}" for _ in range(10)
+            ] + [
+                f"{rng.choice(NOUNS)} {rng.choice(CITIES)[0]}" for _ in range(10)
+            ],
+            # one common word, thousands of matches to rank
+            "broad": [rng.choice(NOUNS) for _ in range(5)] + [c[1] for c in rng.sample(CITIES, 5)],
+        }
+
+        with transaction.atomic():
+            self.seed(rng, vocabulary, options["orphanages"], options["requirements"])
+            started = time.perf_counter()
+            index.rebuild()
+            self.stdout.write(f"index rebuilt in {time.perf_counter() - started:.2f}s")
+
+            self.stdout.write(f"{'':>22} {'p50 ms':>10} {'p95 ms':>10} {'mean ms':>10}")
+            for label, batch in queries.items():
+                fts = self.measure(lambda q: index.search(q, limit=20), batch, options["repeat"])
+                scan = self.measure(lambda q: index.icontains_search(q, limit=20), batch, options["repeat"])
+                self.stdout.write(f"{label + ' fts5':>22} {self.report(fts)}")
+                self.stdout.write(f"{label + ' icontains':>22} {self.report(scan)}")
+                speedup = statistics.mean(scan) / statistics.mean(fts)
+                self.stdout.write(self.style.SUCCESS(f"{label}: FTS5 {speedup:.1f}x vs icontains (mean)"))
+
+            transaction.set_rollback(True)
+
+    def seed(self, rng, vocabulary, orphanages, requirements):
+        started = time.perf_counter()
+        users = User.objects.bulk_create(
+            User(email=f"bench-{uuid.uuid4().hex}@example.com", password="!", role="orphanage")
+            for _ in range(orphanages)
+        )
+        profiles = []
+        for user in users:
+            city, state = rng.choice(CITIES)
+            profiles.append(OrphanageProfile(
+                user=user,
+                orphanage_name=" ".join(rng.sample(vocabulary, 3)).title(),
+                description=" ".join(rng.choices(vocabulary, k=25)),
+                address="-",
+                city=city,
+                state=state,
+                pincode="000000",
+                phone_number="0",
+                email=user.email,
+            ))
+        profiles = OrphanageProfile.objects.bulk_create(profiles, batch_size=2000)
+
+        categories = [choice for choice, _ in OrphanageRequirement.CATEGORY_CHOICES]
+        OrphanageRequirement.objects.bulk_create(
+            (
+                OrphanageRequirement(
+                    orphanage=rng.choice(profiles),
+                    item_name=f"{rng.choice(MODIFIERS)} {rng.choice(NOUNS)}",
+                    category=rng.choice(categories),
+                    description=" ".join(rng.choices(vocabulary, k=15)),
+                    quantity_needed=rng.randint(1, 100),
+                )
+                for _ in range(requirements)
+            ),
+            batch_size=5000,
+        )
+        self.stdout.write(
+            f"seeded {orphanages} orphanages / {requirements} requirements "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+    def measure(self, run, queries, repeat):
+        samples = []
+        for query in queries:
+            for _ in range(repeat):
+                started = time.perf_counter()
+                run(query)
+                samples.append((time.perf_counter() - started) * 1000)
+        return samples
+
+    def report(self, samples):
+        samples = sorted(samples)
+        p50 = samples[len(samples) // 2]
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        return f"{p50:>10.2f} {p95:>10.2f} {statistics.mean(samples):>10.2f}"
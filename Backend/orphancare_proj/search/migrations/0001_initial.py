@@ -0,0 +1,61 @@
+from django.db import migrations
+
+# SQL is inlined (not imported from search.index) so this migration keeps
+# working if the live index definition changes later.
+CREATE_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search_document USING fts5(
+    kind UNINDEXED,
+    object_id UNINDEXED,
+    title,
+    body,
+    category,
+    location,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+POPULATE_SQL = [
+    """
+    INSERT INTO search_document (rowid, kind, object_id, title, body, category, location)
+    SELECT o.id * 2, 'orphanage', o.id, o.orphanage_name, COALESCE(o.description, ''), '',
+           o.city || ' ' || o.state
+    FROM orphanage_orphanageprofile o
+    """,
+    """
+    INSERT INTO search_document (rowid, kind, object_id, title, body, category, location)
+    SELECT r.id * 2 + 1, 'requirement', r.id, r.item_name, COALESCE(r.description, ''), r.category,
+           o.city || ' ' || o.state
+    FROM requirement_orphanagerequirement r
+    JOIN orphanage_orphanageprofile o ON o.id = r.orphanage_id
+    """,
+]
+
+
+def create_index(apps, schema_editor):
+    # FTS5 is SQLite-only; other backends fall back to icontains search
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(CREATE_SQL)
+    for sql in POPULATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS search_document")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('orphanage', '0002_orphanageprofile_established_on'),
+        ('requirement', '0003_orphanagerequirement_req_open_posted_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,28 @@
+# search/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from orphanage.models import OrphanageProfile
+from requirement.models import OrphanageRequirement
+from . import index
+
+
+@receiver(post_save, sender=OrphanageProfile)
+def orphanage_saved(sender, instance, created, **kwargs):
+    # requirements copy the orphanage's city/state into their location column
+    index.index_orphanage(instance.id, with_requirements=not created)
+
+
+@receiver(post_delete, sender=OrphanageProfile)
+def orphanage_deleted(sender, instance, **kwargs):
+    index.remove("orphanage", instance.id)
+
+
+@receiver(post_save, sender=OrphanageRequirement)
+def requirement_saved(sender, instance, **kwargs):
+    index.index_requirements([instance.id])
+
+
+@receiver(post_delete, sender=OrphanageRequirement)
+def requirement_deleted(sender, instance, **kwargs):
+    index.remove("requirement", instance.id)
@@ -0,0 +1,102 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orphancare_proj.testing import make_orphanage
+from requirement.models import OrphanageRequirement
+from . import index
+
+
+def make_home(email, name, city="Bengaluru", description=""):
+    return make_orphanage(email, name, city=city, description=description)[1]
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.sunrise = make_home("a@example.com", "Sunrise Children Home", description="We teach music")
+        self.hope = make_home("b@example.com", "Hope Shelter", city="Mysuru",
+                                   description="Girls home near the Sunrise lake")
+        self.blankets = OrphanageRequirement.objects.create(
+            orphanage=self.hope, item_name="Woollen blankets", category="clothing", quantity_needed=20
+        )
+        self.rice = OrphanageRequirement.objects.create(
+            orphanage=self.sunrise, item_name="Rice", category="food",
+            description="Basmati preferred", quantity_needed=50,
+        )
+
+    def search(self, **params):
+        response = self.client.get(reverse("search"), params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def hits(self, q, **params):
+        return [(r["type"], r[r["type"]]["id"]) for r in self.search(q=q, **params).data["results"]]
+
+    def test_finds_orphanages_and_requirements(self):
+        self.assertEqual(self.hits("blankets"), [("requirement", self.blankets.id)])
+        self.assertEqual(self.hits("basmati"), [("requirement", self.rice.id)])
+        self.assertIn(("orphanage", self.hope.id), self.hits("mysuru"))
+
+    def test_title_match_outranks_description_match(self):
+        hits = self.hits("sunrise", type="orphanage")
+        self.assertEqual(hits, [("orphanage", self.sunrise.id), ("orphanage", self.hope.id)])
+
+    def test_requirement_matches_orphanage_city(self):
+        self.assertEqual(self.hits("blankets mysuru"), [("requirement", self.blankets.id)])
+
+    def test_last_word_is_a_prefix(self):
+        self.assertEqual(self.hits("woollen blan"), [("requirement", self.blankets.id)])
+
+    def test_type_filter(self):
+        self.assertEqual(self.hits("mysuru", type="requirement"), [("requirement", self.blankets.id)])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.rice.item_name = "Wheat flour"
+        self.rice.save()
+        self.assertEqual(self.hits("rice"), [])
+        self.assertEqual(self.hits("wheat"), [("requirement", self.rice.id)])
+
+        self.rice.delete()
+        self.assertEqual(self.hits("wheat"), [])
+
+    def test_orphanage_city_change_reindexes_its_requirements(self):
+        self.hope.city = "Hubballi"
+        self.hope.save()
+        self.assertEqual(self.hits("blankets mysuru"), [])
+        self.assertEqual(self.hits("blankets hubballi"), [("requirement", self.blankets.id)])
+
+    def test_fulfilled_requirements_are_hidden(self):
+        # fulfilment uses queryset.update(), which skips signals
+        OrphanageRequirement.objects.filter(id=self.blankets.id).update(is_fulfilled=True)
+        self.assertEqual(self.hits("blankets"), [])
+
+    def test_fts_syntax_in_input_is_harmless(self):
+        for q in ['"', "rice OR", "NEAR(rice", "rice*)", "-rice", "^", "title:rice"]:
+            self.search(q=q)
+        self.assertEqual(self.search(q="   ").data["results"], [])
+
+    def test_paginates(self):
+        OrphanageRequirement.objects.bulk_create(
+            OrphanageRequirement(orphanage=self.sunrise, item_name=f"Rice pack {i}", quantity_needed=1)
+            for i in range(5)
+        )
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        first = self.search(q="rice", page_size=4)
+        self.assertEqual(len(first.data["results"]), 4)
+        second = self.client.get(first.data["next"])
+        self.assertEqual(len(second.data["results"]), 2)
+        self.assertIsNone(second.data["next"])
+        ids = {r["requirement"]["id"] for r in first.data["results"] + second.data["results"]}
+        self.assertEqual(len(ids), 6)
+
+    def test_rebuild_command_matches_incremental_index(self):
+        before = index.search("home", limit=100)
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("Indexed 4 documents", out.getvalue())
+        self.assertEqual(index.search("home", limit=100), before)
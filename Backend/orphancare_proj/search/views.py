@@ -0,0 +1,59 @@
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from orphanage.models import OrphanageProfile
+from orphanage.serializers import OrphanageListSerializer
+from requirement.models import OrphanageRequirement
+from requirement.serializers import OrphanageRequirementSerializer
+from orphancare_proj.pagination import KeysetPagination
+from . import index
+
+
+class SearchView(APIView):
+    """
+    Full-text search over orphanages and open requirements, ranked by BM25.
+
+    GET ?q=<text>[&type=orphanage|requirement][&page=N][&page_size=N]
+    """
+    permission_classes = [permissions.AllowAny]
+    throttle_scope = "public"
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        kind = request.query_params.get("type")
+        if kind not in index.KINDS:
+            kind = None
+
+        page_size = KeysetPagination().get_page_size(request)
+        try:
+            page = max(int(request.query_params.get("page", 1)), 1)
+        except ValueError:
+            page = 1
+
+        # rank ordering can't be keyset-paginated: FTS5 ranks every match
+        # anyway, so OFFSET only skips already-sorted rowids
+        hits = index.search(query, kind=kind, limit=page_size + 1, offset=(page - 1) * page_size)
+        has_next = len(hits) > page_size
+        hits = hits[:page_size]
+
+        orphanage_ids = [pk for hit_kind, pk, _ in hits if hit_kind == "orphanage"]
+        requirement_ids = [pk for hit_kind, pk, _ in hits if hit_kind == "requirement"]
+        orphanages = OrphanageProfile.objects.in_bulk(orphanage_ids)
+        requirements = OrphanageRequirement.objects.select_related("orphanage").in_bulk(requirement_ids)
+
+        results = []
+        for hit_kind, pk, rank in hits:
+            if hit_kind == "orphanage" and pk in orphanages:
+                data = OrphanageListSerializer(orphanages[pk], context={"request": request}).data
+            elif hit_kind == "requirement" and pk in requirements:
+                data = OrphanageRequirementSerializer(requirements[pk]).data
+            else:
+                continue  # deleted between the index read and the fetch
+            results.append({"type": hit_kind, "rank": rank, hit_kind: data})
+
+        next_link = None
+        if has_next:
+            next_link = replace_query_param(request.build_absolute_uri(), "page", page + 1)
+        return Response({"next": next_link, "results": results})
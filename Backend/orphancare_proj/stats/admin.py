@@ -0,0 +1,33 @@
+from django.contrib import admin
+from .models import CategoryRollup, CityNeedRollup, DonorRollup, MonthlyDonationRollup, RollupWatermark, StaleCity
+
+
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    list_display = ("name", "value")
+
+
+@admin.register(MonthlyDonationRollup)
+class MonthlyDonationRollupAdmin(admin.ModelAdmin):
+    list_display = ("period", "status", "donations", "units")
+    list_filter = ("status",)
+
+
+@admin.register(DonorRollup)
+class DonorRollupAdmin(admin.ModelAdmin):
+    list_display = ("period", "donor", "donations", "units")
+
+
+@admin.register(CategoryRollup)
+class CategoryRollupAdmin(admin.ModelAdmin):
+    list_display = ("period", "category", "requirements", "units_needed")
+
+
+@admin.register(CityNeedRollup)
+class CityNeedRollupAdmin(admin.ModelAdmin):
+    list_display = ("city", "state", "open_requirements", "units_outstanding")
+
+
+@admin.register(StaleCity)
+class StaleCityAdmin(admin.ModelAdmin):
+    list_display = ("city", "state", "queued_at")
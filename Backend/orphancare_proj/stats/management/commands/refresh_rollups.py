@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from stats.rollups import refresh
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the platform stats rollups from rows changed since the last run. "
+        "Schedule it (e.g. every 10 minutes from cron) and add a nightly --full run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true",
+                            help="Rebuild every rollup from scratch (also corrects deleted rows).")
+
+    def handle(self, *args, **options):
+        result = refresh(full=options["full"])
+        for source, touched in result.items():
+            self.stdout.write(f"{source}: " + ("rebuilt" if touched is None else f"{touched} buckets refreshed"))
+        self.stdout.write(self.style.SUCCESS("Rollups up to date"))
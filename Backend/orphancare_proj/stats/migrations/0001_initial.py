@@ -0,0 +1,77 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('donor', '0002_donorprofile_latitude_donorprofile_longitude'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CategoryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=7)),
+                ('category', models.CharField(choices=[('food', 'Food'), ('groceries', 'Groceries'), ('clothing', 'Clothing'), ('education', 'Education'), ('medical', 'Medical'), ('others', 'Others'), ('stationary', 'Stationary')], max_length=50)),
+                ('requirements', models.PositiveIntegerField(default=0)),
+                ('units_needed', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('period', 'category'), name='rollup_category_period_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CityNeedRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('city', models.CharField(max_length=100)),
+                ('state', models.CharField(max_length=100)),
+                ('open_requirements', models.PositiveIntegerField(default=0)),
+                ('units_outstanding', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-units_outstanding', '-open_requirements'], name='rollup_city_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('city', 'state'), name='rollup_city_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlyDonationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=7)),
+                ('status', models.CharField(max_length=20)),
+                ('donations', models.PositiveIntegerField(default=0)),
+                ('units', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('period', 'status'), name='rollup_month_status_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DonorRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=7)),
+                ('donations', models.PositiveIntegerField(default=0)),
+                ('units', models.PositiveBigIntegerField(default=0)),
+                ('donor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='donor.donorprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', '-units', '-donations', 'donor'], name='rollup_donor_rank_idx'), models.Index(fields=['donor', 'period'], name='rollup_donor_idx')],
+                'constraints': [models.UniqueConstraint(fields=('period', 'donor'), name='rollup_donor_period_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,93 @@
+"""
+Materialized platform-wide aggregates, refreshed by `manage.py refresh_rollups`.
+
+`period` is a month bucket ("2026-10") or ALL_TIME ("all").
+"""
+from django.db import models
+
+from donor.models import DonorProfile
+from requirement.models import OrphanageRequirement
+
+ALL_TIME = "all"
+
+
+class RollupWatermark(models.Model):
+    """Source rows with updated_at before `value` are already rolled up."""
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} @ {self.value}"
+
+
+class StaleCity(models.Model):
+    """Cities recomputed on the next refresh because an orphanage moved in or out."""
+    city = models.CharField(max_length=100)
+    state = models.CharField(max_length=100)
+    queued_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["city", "state"], name="rollup_stale_city_uniq"),
+        ]
+
+    def __str__(self):
+        return f"Stale city need for {self.city}, {self.state}"
+
+
+class MonthlyDonationRollup(models.Model):
+    period = models.CharField(max_length=7)
+    status = models.CharField(max_length=20)
+    donations = models.PositiveIntegerField(default=0)
+    units = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["period", "status"], name="rollup_month_status_uniq"),
+        ]
+
+
+class DonorRollup(models.Model):
+    period = models.CharField(max_length=7)
+    donor = models.ForeignKey(DonorProfile, on_delete=models.CASCADE, related_name="+")
+    donations = models.PositiveIntegerField(default=0)
+    # quantity of completed donations
+    units = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["period", "donor"], name="rollup_donor_period_uniq"),
+        ]
+        indexes = [
+            # leaderboard: top donors of one period
+            models.Index(fields=["period", "-units", "-donations", "donor"], name="rollup_donor_rank_idx"),
+            models.Index(fields=["donor", "period"], name="rollup_donor_idx"),
+        ]
+
+
+class CategoryRollup(models.Model):
+    period = models.CharField(max_length=7)
+    category = models.CharField(max_length=50, choices=OrphanageRequirement.CATEGORY_CHOICES)
+    requirements = models.PositiveIntegerField(default=0)
+    units_needed = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["period", "category"], name="rollup_category_period_uniq"),
+        ]
+
+
+class CityNeedRollup(models.Model):
+    """Current unmet need (open requirements) per city."""
+    city = models.CharField(max_length=100)
+    state = models.CharField(max_length=100)
+    open_requirements = models.PositiveIntegerField(default=0)
+    units_outstanding = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["city", "state"], name="rollup_city_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["-units_outstanding", "-open_requirements"], name="rollup_city_rank_idx"),
+        ]
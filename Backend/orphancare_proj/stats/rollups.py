@@ -0,0 +1,272 @@
+# stats/rollups.py
+"""
+Incremental refresh of the stats rollup tables.
+
+Each source table has a watermark. A refresh reads the rows whose
+`updated_at` is at or after the watermark (minus an overlap, see below),
+works out which buckets they touch, and recomputes only those buckets from
+the source with one GROUP BY each:
+
+    donations     -> MonthlyDonationRollup for the touched months
+                     DonorRollup for the touched (donor, month) pairs, and
+                     the touched donors' all-time rows
+    requirements  -> CategoryRollup for the touched posting months (+ all time)
+                     CityNeedRollup for the touched cities, and the cities
+                     queued in StaleCity (an orphanage moved out or in)
+
+Recomputing a bucket is idempotent, so the watermark is moved to the time
+the run *started* and every run re-reads an overlap window behind it; that
+catches rows whose transaction committed after a previous run had already
+looked. Deleted rows leave no updated_at behind, so run with full=True
+(e.g. nightly) to rebuild everything.
+
+Each step reads its GROUP BY first and only then opens a short transaction
+for the delete + insert, so the write lock is never held across the source
+scans. The watermarks move last; a run that fails half way leaves them
+where they were and the next run redoes the same buckets.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest, TruncMonth
+from django.utils import timezone
+
+from donation.models import Donation
+from requirement.models import OrphanageRequirement
+from .models import (
+    ALL_TIME,
+    CategoryRollup,
+    CityNeedRollup,
+    DonorRollup,
+    MonthlyDonationRollup,
+    RollupWatermark,
+    StaleCity,
+)
+
+# donations whose quantity counts as given (same rule as donation.fulfilment)
+COUNTED_STATUSES = ("completed",)
+
+
+def get_overlap():
+    return timedelta(seconds=getattr(settings, "STATS_ROLLUP_OVERLAP_SECONDS", 300))
+
+
+def get_max_keys():
+    """Above this many touched donors/cities a full recompute is cheaper."""
+    return getattr(settings, "STATS_ROLLUP_MAX_INCREMENTAL_KEYS", 5000)
+
+
+def period_of(value):
+    value = value.astimezone(dt_timezone.utc)
+    return f"{value.year:04d}-{value.month:02d}"
+
+
+def period_bounds(period):
+    year, month = map(int, period.split("-"))
+    start = datetime(year, month, 1, tzinfo=dt_timezone.utc)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=dt_timezone.utc)
+    return start, end
+
+
+def in_periods(field, periods):
+    condition = Q()
+    for period in periods:
+        start, end = period_bounds(period)
+        condition |= Q(**{f"{field}__gte": start, f"{field}__lt": end})
+    return condition
+
+
+def get_watermark(name):
+    return RollupWatermark.objects.filter(name=name).values_list("value", flat=True).first()
+
+
+def set_watermark(name, value):
+    RollupWatermark.objects.update_or_create(name=name, defaults={"value": value})
+
+
+# ---------- donations ----------
+
+def refresh_monthly_donations(periods=None):
+    rows = Donation.objects.all()
+    stale = MonthlyDonationRollup.objects.all()
+    if periods is not None:
+        rows = rows.filter(in_periods("donation_date", periods))
+        stale = stale.filter(period__in=periods)
+
+    grouped = [
+        MonthlyDonationRollup(
+            period=period_of(row["month"]), status=row["status"],
+            donations=row["donations"], units=row["units"] or 0,
+        )
+        for row in rows.annotate(month=TruncMonth("donation_date", tzinfo=dt_timezone.utc))
+        .values("month", "status")
+        .order_by()
+        .annotate(donations=Count("id"), units=Sum("quantity"))
+    ]
+    with transaction.atomic():
+        stale.delete()
+        MonthlyDonationRollup.objects.bulk_create(grouped)
+
+
+def refresh_donors(pairs=None):
+    """
+    Recompute the monthly rows for the given (donor_id, period) pairs (all
+    when None), then the all-time rows of those donors from the monthly rows.
+    """
+    rows = Donation.objects.all()
+    stale = DonorRollup.objects.all()
+    if pairs is not None:
+        donors = {donor for donor, _ in pairs}
+        periods = {period for _, period in pairs}
+        rows = rows.filter(in_periods("donation_date", periods), donor_id__in=donors)
+        # a few extra (donor, month) cells may be recomputed; that's harmless
+        stale = stale.filter(donor_id__in=donors, period__in=periods | {ALL_TIME})
+
+    grouped = [
+        DonorRollup(
+            period=period_of(row["month"]), donor_id=row["donor_id"],
+            donations=row["donations"], units=row["units"],
+        )
+        for row in rows.annotate(month=TruncMonth("donation_date", tzinfo=dt_timezone.utc))
+        .values("donor_id", "month")
+        .order_by()
+        .annotate(donations=Count("id"), units=Sum("quantity", filter=Q(status__in=COUNTED_STATUSES), default=0))
+    ]
+    monthly = DonorRollup.objects.exclude(period=ALL_TIME)
+    if pairs is not None:
+        monthly = monthly.filter(donor_id__in=donors)
+    with transaction.atomic():
+        stale.delete()
+        DonorRollup.objects.bulk_create(grouped, batch_size=5000)
+        # summing the rollup rows just written is cheap next to the scan above
+        DonorRollup.objects.bulk_create(
+            (
+                DonorRollup(period=ALL_TIME, donor_id=row["donor_id"], donations=row["d"], units=row["u"])
+                for row in monthly.values("donor_id").order_by().annotate(d=Sum("donations"), u=Sum("units"))
+            ),
+            batch_size=5000,
+        )
+
+
+def refresh_donations(since):
+    """Returns the number of changed source rows looked at (None = full)."""
+    if since is None:
+        refresh_monthly_donations()
+        refresh_donors()
+        return None
+
+    changed = Donation.objects.filter(updated_at__gte=since - get_overlap()).values_list("donor_id", "donation_date")
+    pairs = {(donor_id, period_of(date)) for donor_id, date in changed.iterator()}
+    if not pairs:
+        return 0
+    refresh_monthly_donations({period for _, period in pairs})
+    if len({donor for donor, _ in pairs}) > get_max_keys():
+        refresh_donors()
+    else:
+        refresh_donors(pairs)
+    return len(pairs)
+
+
+# ---------- requirements ----------
+
+def refresh_categories(periods=None):
+    rows = OrphanageRequirement.objects.all()
+    stale = CategoryRollup.objects.exclude(period=ALL_TIME)
+    if periods is not None:
+        rows = rows.filter(in_periods("posted_date", periods))
+        stale = stale.filter(period__in=periods)
+
+    grouped = [
+        CategoryRollup(
+            period=period_of(row["month"]), category=row["category"],
+            requirements=row["requirements"], units_needed=row["units_needed"] or 0,
+        )
+        for row in rows.annotate(month=TruncMonth("posted_date", tzinfo=dt_timezone.utc))
+        .values("month", "category")
+        .order_by()
+        .annotate(requirements=Count("id"), units_needed=Sum("quantity_needed"))
+    ]
+    with transaction.atomic():
+        stale.delete()
+        CategoryRollup.objects.bulk_create(grouped)
+
+        # all time = sum of the monthly rows (a handful of rows per category)
+        CategoryRollup.objects.filter(period=ALL_TIME).delete()
+        CategoryRollup.objects.bulk_create(
+            CategoryRollup(period=ALL_TIME, category=row["category"], requirements=row["r"], units_needed=row["u"])
+            for row in CategoryRollup.objects.values("category").order_by().annotate(
+                r=Sum("requirements"), u=Sum("units_needed")
+            )
+        )
+
+
+def refresh_cities(cities=None):
+    rows = OrphanageRequirement.objects.filter(is_fulfilled=False, is_expired=False)
+    stale = CityNeedRollup.objects.all()
+    if cities is not None:
+        stale_condition, row_condition = Q(), Q()
+        for city, state in cities:
+            stale_condition |= Q(city=city, state=state)
+            row_condition |= Q(orphanage__city=city, orphanage__state=state)
+        stale = stale.filter(stale_condition)
+        rows = rows.filter(row_condition)
+
+    grouped = [
+        CityNeedRollup(
+            city=row["city"], state=row["state"],
+            open_requirements=row["open_requirements"], units_outstanding=row["units_outstanding"] or 0,
+        )
+        for row in rows.values(city=F("orphanage__city"), state=F("orphanage__state"))
+        .order_by()
+        .annotate(
+            open_requirements=Count("id"),
+            units_outstanding=Sum(Greatest(F("quantity_needed") - F("quantity_received"), 0)),
+        )
+    ]
+    with transaction.atomic():
+        stale.delete()
+        CityNeedRollup.objects.bulk_create(grouped)
+
+
+def refresh_requirements(since):
+    if since is None:
+        refresh_categories()
+        refresh_cities()
+        return None
+
+    changed = OrphanageRequirement.objects.filter(updated_at__gte=since - get_overlap()).values_list(
+        "posted_date", "orphanage__city", "orphanage__state"
+    )
+    periods, cities = set(), set(StaleCity.objects.values_list("city", "state"))
+    for posted_date, city, state in changed.iterator():
+        periods.add(period_of(posted_date))
+        cities.add((city, state))
+    if not periods and not cities:
+        return 0
+    if periods:
+        refresh_categories(periods)
+    refresh_cities(None if len(cities) > get_max_keys() else cities)
+    return len(periods) + len(cities)
+
+
+def refresh(full=False):
+    """
+    Bring every rollup up to date. Returns {source: touched buckets}, with
+    None for sources that were rebuilt in full.
+    """
+    started = timezone.now()
+    donations_since = None if full else get_watermark("donations")
+    requirements_since = None if full else get_watermark("requirements")
+    # every refresh_* step commits on its own
+    result = {
+        "donations": refresh_donations(donations_since),
+        "requirements": refresh_requirements(requirements_since),
+    }
+    with transaction.atomic():
+        # cities queued while this ran stay for the next run
+        StaleCity.objects.filter(queued_at__lt=started).delete()
+        set_watermark("donations", started)
+        set_watermark("requirements", started)
+    return result
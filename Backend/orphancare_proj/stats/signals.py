@@ -0,0 +1,28 @@
+# stats/signals.py
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from orphanage.models import OrphanageProfile
+from .models import StaleCity
+
+LOCATION_FIELDS = ("city", "state")
+
+
+@receiver(pre_save, sender=OrphanageProfile)
+def remember_location(sender, instance, **kwargs):
+    if instance._state.adding or instance.pk is None:
+        instance._rollup_previous = None
+        return
+    instance._rollup_previous = sender.objects.filter(pk=instance.pk).values_list(*LOCATION_FIELDS).first()
+
+
+@receiver(post_save, sender=OrphanageProfile)
+def queue_cities(sender, instance, created, **kwargs):
+    # the requirements don't change when their orphanage moves, so neither
+    # city would otherwise be picked up by an incremental refresh
+    previous = getattr(instance, "_rollup_previous", None)
+    current = tuple(getattr(instance, field) for field in LOCATION_FIELDS)
+    if created or previous is None or previous == current:
+        return
+    for city, state in (previous, current):
+        StaleCity.objects.update_or_create(city=city, state=state)
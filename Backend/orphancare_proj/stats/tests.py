@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from donation.models import Donation
+from orphancare_proj.testing import make_donor, make_orphanage
+from requirement.models import OrphanageRequirement
+from .models import (
+    ALL_TIME, CategoryRollup, CityNeedRollup, DonorRollup, MonthlyDonationRollup, RollupWatermark, StaleCity,
+)
+from .rollups import period_of, refresh
+
+OLD = datetime(2025, 1, 15, 12, tzinfo=dt_timezone.utc)
+
+
+class RollupRefreshTests(TestCase):
+    def setUp(self):
+        _, self.donor = make_donor()
+        _, self.other_donor = make_donor("other@example.com")
+        _, self.orphanage = make_orphanage()
+        self.requirement = OrphanageRequirement.objects.create(
+            orphanage=self.orphanage, item_name="Rice", category="food", quantity_needed=10
+        )
+        self.old = self.donate(self.donor, 5, "completed", when=OLD)
+        self.donate(self.other_donor, 3, "pending", when=OLD)
+        self.now_period = period_of(timezone.now())
+
+    def donate(self, donor, quantity, status, when=None):
+        donation = Donation.objects.create(
+            donor=donor, orphanage=self.orphanage, item_name="Rice", quantity=quantity, status=status
+        )
+        if when is not None:
+            # an old row that was last written well before any watermark
+            Donation.objects.filter(pk=donation.pk).update(donation_date=when, updated_at=when)
+        return donation
+
+    def month(self, period, status):
+        return MonthlyDonationRollup.objects.filter(period=period, status=status).values_list("donations", "units").first()
+
+    def donor_row(self, donor, period):
+        return DonorRollup.objects.filter(donor=donor, period=period).values_list("donations", "units").first()
+
+    def test_full_refresh_builds_every_rollup(self):
+        self.assertEqual(refresh(full=True), {"donations": None, "requirements": None})
+
+        self.assertEqual(self.month("2025-01", "completed"), (1, 5))
+        self.assertEqual(self.month("2025-01", "pending"), (1, 3))
+        self.assertEqual(self.donor_row(self.donor, ALL_TIME), (1, 5))
+        # pending donations count as donations but not as units given
+        self.assertEqual(self.donor_row(self.other_donor, ALL_TIME), (1, 0))
+        self.assertEqual(
+            CategoryRollup.objects.filter(period=ALL_TIME).values_list("category", "requirements", "units_needed").get(),
+            ("food", 1, 10),
+        )
+        self.assertEqual(
+            CityNeedRollup.objects.values_list("city", "open_requirements", "units_outstanding").get(),
+            ("Bengaluru", 1, 10),
+        )
+        self.assertEqual(RollupWatermark.objects.count(), 2)
+
+    def test_incremental_refresh_only_touches_changed_buckets(self):
+        refresh(full=True)
+        # a deliberately wrong value in an untouched bucket survives
+        MonthlyDonationRollup.objects.filter(period="2025-01", status="completed").update(donations=99)
+        RollupWatermark.objects.update(value=timezone.now() - timedelta(hours=1))
+        Donation.objects.all().update(updated_at=timezone.now() - timedelta(days=1))
+        OrphanageRequirement.objects.all().update(updated_at=timezone.now() - timedelta(days=1))
+
+        self.donate(self.donor, 7, "completed")
+        self.assertEqual(refresh(), {"donations": 1, "requirements": 0})
+
+        self.assertEqual(self.month(self.now_period, "completed"), (1, 7))
+        self.assertEqual(self.month("2025-01", "completed"), (99, 5))
+        self.assertEqual(self.donor_row(self.donor, self.now_period), (1, 7))
+        self.assertEqual(self.donor_row(self.donor, ALL_TIME), (2, 12))
+        self.assertEqual(self.donor_row(self.other_donor, ALL_TIME), (1, 0))
+
+    def test_watermark_advances(self):
+        before = timezone.now()
+        refresh(full=True)
+        self.assertGreaterEqual(RollupWatermark.objects.get(name="donations").value, before)
+
+        # nothing changed since, apart from the overlap window
+        Donation.objects.all().update(updated_at=timezone.now() - timedelta(days=1))
+        OrphanageRequirement.objects.all().update(updated_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(refresh(), {"donations": 0, "requirements": 0})
+
+    def test_each_step_writes_in_its_own_transaction(self):
+        with mock.patch("stats.rollups.transaction", wraps=transaction) as wrapped:
+            refresh(full=True)
+        # monthly donations, donors, categories, cities, then the watermarks
+        self.assertEqual(wrapped.atomic.call_count, 5)
+
+    def test_failed_run_leaves_the_watermarks_alone(self):
+        with mock.patch("stats.rollups.refresh_cities", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                refresh(full=True)
+        # the donation steps already committed; the next run redoes them
+        self.assertEqual(self.month("2025-01", "completed"), (1, 5))
+        self.assertFalse(RollupWatermark.objects.exists())
+
+    def test_requirement_changes_refresh_city_need(self):
+        refresh(full=True)
+        self.requirement.quantity_received = 4
+        self.requirement.save()
+        refresh()
+        self.assertEqual(CityNeedRollup.objects.values_list("units_outstanding", flat=True).get(), 6)
+
+    def test_moving_an_orphanage_refreshes_both_cities(self):
+        refresh(full=True)
+        self.orphanage.city = "Mysuru"
+        self.orphanage.save()
+        self.assertEqual(StaleCity.objects.count(), 2)
+        OrphanageRequirement.objects.all().update(updated_at=timezone.now() - timedelta(days=1))
+
+        self.assertEqual(refresh()["requirements"], 2)
+        self.assertEqual(
+            list(CityNeedRollup.objects.values_list("city", "open_requirements")), [("Mysuru", 1)]
+        )
+        self.assertFalse(StaleCity.objects.exists())
+
+    def test_full_refresh_corrects_deletes(self):
+        refresh(full=True)
+        self.old.delete()
+        refresh()
+        self.assertEqual(self.month("2025-01", "completed"), (1, 5))
+
+        out = StringIO()
+        call_command("refresh_rollups", "--full", stdout=out)
+        self.assertIn("donations: rebuilt", out.getvalue())
+        self.assertIsNone(self.month("2025-01", "completed"))
+        self.assertIsNone(self.donor_row(self.donor, ALL_TIME))
+
+
+class StatsEndpointTests(TestCase):
+    def setUp(self):
+        _, self.donor = make_donor()
+        _, self.other_donor = make_donor("other@example.com")
+        _, orphanage = make_orphanage()
+        OrphanageRequirement.objects.create(orphanage=orphanage, item_name="Rice", category="food", quantity_needed=10)
+        OrphanageRequirement.objects.create(orphanage=orphanage, item_name="Pens", category="stationary", quantity_needed=4)
+        OrphanageRequirement.objects.create(orphanage=orphanage, item_name="Soap", category="food", quantity_needed=2)
+        for donor, quantity in ((self.donor, 2), (self.other_donor, 9)):
+            Donation.objects.create(donor=donor, orphanage=orphanage, item_name="Rice", quantity=quantity, status="completed")
+        refresh(full=True)
+        self.client = APIClient()
+
+    def get(self, name, queries, **params):
+        with self.assertNumQueries(queries):
+            response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.data["refreshed_at"])
+        return response.data["results"]
+
+    def test_monthly_donations(self):
+        results = self.get("stats-donations-monthly", 3, months=12)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["donations"], 2)
+        self.assertEqual(results[0]["units"], 11)
+        self.assertEqual(results[0]["by_status"]["completed"], {"donations": 2, "units": 11})
+
+    def test_top_donors(self):
+        results = self.get("stats-top-donors", 2)
+        self.assertEqual([row["donor"] for row in results], [self.other_donor.pk, self.donor.pk])
+        self.assertEqual(results[0]["units"], 9)
+        self.assertEqual(self.get("stats-top-donors", 2, limit=1, period=period_of(timezone.now()))[0]["units"], 9)
+
+    def test_top_donors_rejects_bad_period(self):
+        response = self.client.get(reverse("stats-top-donors"), {"period": "last-year"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_categories_and_cities(self):
+        results = self.get("stats-categories", 2)
+        self.assertEqual(results[0], {"category": "food", "requirements": 2, "units_needed": 12})
+        cities = self.get("stats-cities", 2)
+        self.assertEqual(cities, [{"city": "Bengaluru", "state": "Karnataka", "open_requirements": 3, "units_outstanding": 16}])
@@ -0,0 +1,9 @@
+from django.urls import path
+from .views import CategoryStatsView, CityNeedStatsView, MonthlyDonationStatsView, TopDonorStatsView
+
+urlpatterns = [
+    path("donations/monthly/", MonthlyDonationStatsView.as_view(), name="stats-donations-monthly"),
+    path("donors/top/", TopDonorStatsView.as_view(), name="stats-top-donors"),
+    path("categories/", CategoryStatsView.as_view(), name="stats-categories"),
+    path("cities/", CityNeedStatsView.as_view(), name="stats-cities"),
+]
@@ -0,0 +1,110 @@
+import re
+
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from orphancare_proj.db_router import ReplicaReadMixin
+from orphancare_proj.params import bounded
+from .models import ALL_TIME, CategoryRollup, CityNeedRollup, DonorRollup, MonthlyDonationRollup
+from .rollups import get_watermark
+
+DEFAULT_MONTHS = 12
+MAX_MONTHS = 60
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+PERIOD_RE = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+
+class RollupView(ReplicaReadMixin, APIView):
+    """
+    Read-only platform statistics served from the rollup tables, which
+    `manage.py refresh_rollups` keeps current. `refreshed_at` says how fresh.
+    """
+    permission_classes = [permissions.AllowAny]
+    throttle_scope = "public"
+    watermark = None
+
+    def respond(self, results):
+        return Response({"refreshed_at": get_watermark(self.watermark), "results": results})
+
+    def get_period(self, request):
+        period = request.query_params.get("period", ALL_TIME)
+        if period != ALL_TIME and not PERIOD_RE.match(period):
+            return None
+        return period
+
+    def bad_period(self):
+        return Response(
+            {"detail": f'period must be "{ALL_TIME}" or a month like "2026-10".'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class MonthlyDonationStatsView(RollupView):
+    """GET ?months=12 -> donations and units per month and status, newest first."""
+    watermark = "donations"
+
+    def get(self, request):
+        months = bounded(request.query_params.get("months"), DEFAULT_MONTHS, MAX_MONTHS)
+        periods = list(
+            MonthlyDonationRollup.objects.values_list("period", flat=True)
+            .distinct().order_by("-period")[:months]
+        )
+        by_period = {period: {"period": period, "donations": 0, "units": 0, "by_status": {}} for period in periods}
+        for row in MonthlyDonationRollup.objects.filter(period__in=periods).values("period", "status", "donations", "units"):
+            month = by_period[row["period"]]
+            month["donations"] += row["donations"]
+            month["units"] += row["units"]
+            month["by_status"][row["status"]] = {"donations": row["donations"], "units": row["units"]}
+        return self.respond(list(by_period.values()))
+
+
+class TopDonorStatsView(RollupView):
+    """GET ?period=all|YYYY-MM&limit=10 -> donors ranked by units of completed donations."""
+    watermark = "donations"
+
+    def get(self, request):
+        period = self.get_period(request)
+        if period is None:
+            return self.bad_period()
+        limit = bounded(request.query_params.get("limit"), DEFAULT_LIMIT, MAX_LIMIT)
+        rows = (
+            DonorRollup.objects.filter(period=period)
+            .order_by("-units", "-donations", "donor_id")
+            .values("donor_id", "donor__full_name", "donations", "units")[:limit]
+        )
+        return self.respond([
+            {"donor": row["donor_id"], "full_name": row["donor__full_name"],
+             "donations": row["donations"], "units": row["units"]}
+            for row in rows
+        ])
+
+
+class CategoryStatsView(RollupView):
+    """GET ?period=all|YYYY-MM -> requirement categories, most requested first."""
+    watermark = "requirements"
+
+    def get(self, request):
+        period = self.get_period(request)
+        if period is None:
+            return self.bad_period()
+        rows = (
+            CategoryRollup.objects.filter(period=period)
+            .order_by("-requirements", "-units_needed", "category")
+            .values("category", "requirements", "units_needed")
+        )
+        return self.respond(list(rows))
+
+
+class CityNeedStatsView(RollupView):
+    """GET ?limit=10 -> cities with the most unmet need (open requirement units)."""
+    watermark = "requirements"
+
+    def get(self, request):
+        limit = bounded(request.query_params.get("limit"), DEFAULT_LIMIT, MAX_LIMIT)
+        rows = (
+            CityNeedRollup.objects.order_by("-units_outstanding", "-open_requirements", "city")
+            .values("city", "state", "open_requirements", "units_outstanding")[:limit]
+        )
+        return self.respond(list(rows))
@@ -2,6 +2,7 @@ import React, { useEffect, useState } from "react";
 import { useParams, useNavigate } from "react-router-dom";
 import Header from "../components/Header";
 import styles from "../styles/DonationPage.module.css";
+import { fetchAllPages } from "../utils/pagination";
 
 interface Requirement {
   id: number;
@@ -26,8 +27,7 @@ const DonationPage: React.FC = () => {
   // 🔹 Fetch requirements
   useEffect(() => {
 
-    fetch(`http://172.16.20.43:8000/api/requirement/orphanage/${orphanageId}`)
-      .then(res => res.json())
+    fetchAllPages<Requirement>(`http://172.16.20.43:8000/api/requirement/orphanage/${orphanageId}/`)
       .then(data => {
         const filtered = data.filter(
           (req: Requirement) => req.orphanage === Number(orphanageId)
@@ -4,6 +4,7 @@ import { MapPin, Phone, Edit, Heart, Calendar, User, ChevronRight } from 'lucide
 import Header from '../components/Header';
 import styles from '../styles/DonorDashboard.module.css';
 import axios from "axios";
+import { authHeaders, fetchAllPages } from "../utils/pagination";
 
 const DonorDashboard: React.FC = () => {
 
@@ -49,15 +50,16 @@ const [orphanages, setOrphanages] = useState<any[]>([]);
 
   Promise.all([
     api.get("/donor/me"),
-    api.get("/donation/my-donations/"),
-    api.get("/orphanage/list"),
+    // every page: pending counts and the pincode match need all rows
+    fetchAllPages("http://172.16.20.43:8000/api/donation/my-donations/", { headers: authHeaders() }),
+    fetchAllPages("http://172.16.20.43:8000/api/orphanage/list/"),
   ])
-    .then(([profileRes, donationRes, orphanageRes]) => {
+    .then(([profileRes, donationRows, orphanageRows]) => {
       setProfile(profileRes.data);
-      setDonations(donationRes.data);
+      setDonations(donationRows);
 
       // nearby orphanages (frontend limit)
-      const nearby = orphanageRes.data.filter(
+      const nearby = orphanageRows.filter(
         (o: any) => o.pincode === profileRes.data.pincode
       );
       setOrphanages(nearby.slice(0, 2));
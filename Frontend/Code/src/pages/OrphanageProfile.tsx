@@ -3,6 +3,7 @@ import { useParams, Link } from "react-router-dom";
 import { MapPin, Phone, Mail, Users, User } from "lucide-react";
 import Header from "../components/Header";
 import styles from "../styles/OrphanageProfile.module.css";
+import { fetchAllPages } from "../utils/pagination";
 
 const OrphanageProfile: React.FC = () => {
   const { id } = useParams();
@@ -13,13 +14,12 @@ const [loading, setLoading] = React.useState(true);
   React.useEffect(() => {
   const fetchData = async () => {
     try {
-      const [profileRes, reqRes] = await Promise.all([
+      const [profileRes, reqData] = await Promise.all([
         fetch(`http://172.16.20.43:8000/api/orphanage/${id}/`),
-        fetch(`http://172.16.20.43:8000/api/requirement/orphanage/${id}/`)
+        fetchAllPages(`http://172.16.20.43:8000/api/requirement/orphanage/${id}/`)
       ]);
 
       const profileData = await profileRes.json();
-      const reqData = await reqRes.json();
 
       setOrphanage(profileData);
       setRequirements(reqData);
@@ -3,6 +3,7 @@ import { MapPin, Phone, ChevronRight, Map } from "lucide-react";
 import { Link } from "react-router-dom";
 import styles from "../styles/Orphanages.module.css";
 import Header from "../components/Header";
+import { fetchAllPages } from "../utils/pagination";
 
 interface Orphanage {
   id: number;
@@ -50,9 +51,8 @@ const displayedOrphanages =
   useEffect(() => {
     const fetchOrphanages = async () => {
       try {
-        const response = await fetch("http://172.16.20.43:8000/api/orphanage/list/");
-        const data = await response.json();
-        setOrphanages(data);
+        // the nearby tab sorts the whole list, so fetch every page
+        setOrphanages(await fetchAllPages<Orphanage>("http://172.16.20.43:8000/api/orphanage/list/"));
       } catch (error) {
         console.error("Failed to fetch orphanages", error);
       } finally {
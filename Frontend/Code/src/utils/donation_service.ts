@@ -1,4 +1,5 @@
 import { apiClient } from "../utils/api";
+import { authHeaders, fetchAllPages } from "./pagination";
 
 export const updateDonationStatus = async (
   id: string,
@@ -39,19 +40,12 @@ export const updateDonationStatus = async (
 
 export const getMyDonationRequests = async () => {
     try{
-
-    
-    const token = localStorage.getItem("sessionToken");
-    const res = await fetch("http://172.16.20.43:8000/api/donation/received/", {
-        method: "GET",
-        headers: {
-          "Content-Type": "application/json",
-          "Authorization": `Bearer ${token}`
-        },
+      // every page, not just the newest 20
+      const data = await fetchAllPages("http://172.16.20.43:8000/api/donation/received/", {
+        headers: authHeaders(),
       });
-      const data = await res.json()
-       return {
-      success: res.ok,
+      return {
+      success: true,
       data,
     };
   } catch (err) {
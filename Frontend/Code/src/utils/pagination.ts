@@ -0,0 +1,49 @@
+// src/utils/pagination.ts
+// List endpoints return one page at a time as { next, results }, where `next`
+// is the URL of the following page (or null). fetchAllPages follows `next`
+// so callers get every row, not just the first page.
+
+export interface Page<T> {
+  next: string | null;
+  results: T[];
+}
+
+// the API's largest page (API_MAX_PAGE_SIZE): fewest round trips
+const MAX_PAGE_SIZE = 100;
+
+const withPageSize = (url: string, size: number): string => {
+  const parsed = new URL(url);
+  if (!parsed.searchParams.has("page_size")) {
+    parsed.searchParams.set("page_size", String(size));
+  }
+  return parsed.toString();
+};
+
+export async function fetchAllPages<T = any>(
+  url: string,
+  init: RequestInit = {},
+  pageSize: number = MAX_PAGE_SIZE
+): Promise<T[]> {
+  const rows: T[] = [];
+  let next: string | null = withPageSize(url, pageSize);
+
+  while (next) {
+    const res: Response = await fetch(next, init);
+    if (!res.ok) {
+      throw new Error(`Request failed (${res.status}): ${next}`);
+    }
+    const data: Page<T> | T[] = await res.json();
+    if (Array.isArray(data)) {
+      // endpoint without pagination
+      return rows.concat(data);
+    }
+    rows.push(...data.results);
+    next = data.next;
+  }
+  return rows;
+}
+
+export const authHeaders = (): HeadersInit => {
+  const token = localStorage.getItem("sessionToken");
+  return token ? { Authorization: `Bearer ${token}` } : {};
+};